@@ -0,0 +1 @@
+"""Benchmarks for application_settings; run with `python -m benchmarks`."""
@@ -0,0 +1,75 @@
+"""Run the benchmarks of application_settings.
+
+From the root of the repository:
+
+    python -m benchmarks                  # run all benchmarks and print the results
+    python -m benchmarks -k load          # only run benchmarks with 'load' in their name
+    python -m benchmarks --save           # store the results as baseline
+    python -m benchmarks --compare        # compare with the baseline, exit 1 on regression
+
+Baselines are machine specific and are therefore not under version control; store one
+on the main branch and compare with it on your feature branch.
+"""
+
+import importlib
+import pkgutil
+import sys
+import tempfile
+from argparse import ArgumentParser
+from pathlib import Path
+
+from loguru import logger
+
+from application_settings import LOGGER_NAME
+
+from .runner import (
+    BENCHMARKS,
+    format_result,
+    load_baseline,
+    regressions,
+    run,
+    save_baseline,
+)
+
+DEFAULT_BASELINE = Path(__file__).parent / "results" / "baseline.json"
+
+
+def main() -> int:
+    """Parse the arguments, run the benchmarks and report"""
+    parser = ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("-k", "--keyword", default="", help="only run matching names")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="nr of repeats")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="store as baseline")
+    parser.add_argument("--compare", action="store_true", help="compare to baseline")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="allowed fraction of slowdown"
+    )
+    args = parser.parse_args()
+
+    for module in pkgutil.iter_modules([str(Path(__file__).parent)]):
+        if module.name.startswith("bench_"):
+            importlib.import_module(f"{__package__}.{module.name}")
+    logger.disable(LOGGER_NAME)
+    logger.disable(__package__)
+
+    baseline = load_baseline(args.baseline) if args.compare else {}
+    results = {}
+    for the_benchmark in BENCHMARKS:
+        if args.keyword not in the_benchmark.name:
+            continue
+        with tempfile.TemporaryDirectory() as folder:
+            res = run(the_benchmark, Path(folder), args.repeat)
+        results[the_benchmark.name] = res
+        print(format_result(the_benchmark.name, res, baseline.get(the_benchmark.name)))
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Baseline stored in {args.baseline}")
+    if args.compare and (found := regressions(results, baseline, args.tolerance)):
+        print("Regressions found:", *found, sep="\n  ")
+        return 1
+    return 0
+
+
+sys.exit(main())
@@ -0,0 +1,49 @@
+"""Benchmarks of the overhead of log statements while logging is disabled (the default)."""
+
+from pathlib import Path
+
+from loguru import logger
+
+from application_settings import SettingsBase
+from application_settings._private.file_operations import load, save
+from application_settings.parameter_kind import ParameterKind
+
+from .bench_operations import _container
+from .containers import SHAPES
+from .runner import Operation, benchmark
+
+
+@benchmark("logging_disabled/load_missing_file")
+def _load_missing_file(folder: Path) -> Operation:
+    # logs a warning that the path is not a file and that defaults will be used
+    path = folder / "missing.json"
+    return lambda: load(ParameterKind.SETTINGS, path, False)
+
+
+@benchmark("logging_disabled/save_unknown_format")
+def _save_unknown_format(folder: Path) -> Operation:
+    # logs an error about the unknown file format
+    path = folder / "settings.ini"
+    return lambda: save(path, {})
+
+
+@benchmark("logging_disabled/get_without_load")
+def _get_without_load(_: Path) -> Operation:
+    # formats the filepath of the container into the warning when logging is enabled
+    settings_class, _ = _container(SettingsBase, SHAPES[0])
+    return settings_class.get_without_load
+
+
+@benchmark("logging_disabled/reference_eager_fstring")
+def _eager_fstring(_: Path) -> Operation:
+    # reference: the same warning with eager formatting, as before lazy logging
+    settings_class, _ = _container(SettingsBase, SHAPES[0])
+
+    def operation() -> None:
+        logger.warning(
+            f"{settings_class.kind_string()} {settings_class.__name__} accessed before "
+            f"data has been loaded; will try implicit loading with "
+            f"{settings_class.filepath()}."
+        )
+
+    return operation
@@ -0,0 +1,226 @@
+"""Benchmarks of loading, getting, updating and saving containers of varying shapes."""
+
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from functools import cache
+from itertools import count
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from application_settings import (
+    ConfigBase,
+    SettingsBase,
+    StorageMode,
+    config_filepath_from_cli,
+)
+from application_settings._private.file_operations import _load_with_includes
+from application_settings._private.toml_file_operations import load_toml
+from application_settings.container_base import ContainerBase
+from application_settings.container_section_base import (
+    ContainerSectionBase,
+    _update_section,
+)
+
+from .containers import (
+    SHAPES,
+    TreeShape,
+    make_container,
+    update_changes,
+    write_file,
+    write_included_files,
+)
+from .runner import Operation, benchmark
+
+
+class _JournaledSettings(SettingsBase):
+    """Base for settings that are updated via a journal"""
+
+    @classmethod
+    def storage_mode(cls) -> StorageMode:
+        return StorageMode.JOURNAL
+
+
+@cache
+def _container(
+    base: type[ContainerBase], shape: TreeShape
+) -> tuple[type[ContainerBase], dict[str, Any]]:
+    return make_container(
+        base, shape, "Journaled" if base is _JournaledSettings else ""
+    )
+
+
+def _prepared(
+    base: type[ContainerBase], shape: TreeShape, folder: Path
+) -> type[ContainerBase]:
+    """Return the container class for shape with a parameter file in folder"""
+    the_class, data = _container(base, shape)
+    the_class.set_filepath(
+        write_file(folder / the_class.default_filename(), data), load=True
+    )
+    return the_class
+
+
+def _register_for_shape(shape: TreeShape) -> None:
+    @benchmark(f"load/config/{shape.name}")
+    def _load_config(folder: Path) -> Operation:
+        return _prepared(ConfigBase, shape, folder).load
+
+    @benchmark(f"load/settings/{shape.name}")
+    def _load_settings(folder: Path) -> Operation:
+        return _prepared(SettingsBase, shape, folder).load
+
+    @benchmark(f"load/settings_via_dict/{shape.name}")
+    def _load_settings_via_dict(folder: Path) -> Operation:
+        # reference for load/settings: parse to a dict first, then validate the dict
+        settings_class = _prepared(SettingsBase, shape, folder)
+        # pylint: disable-next=protected-access
+        return lambda: settings_class.set(settings_class._get_saved_data())
+
+    @benchmark(f"get/container/{shape.name}")
+    def _get_container(folder: Path) -> Operation:
+        return _prepared(ConfigBase, shape, folder).get
+
+    @benchmark(f"get/deepest_section/{shape.name}")
+    def _get_section(folder: Path) -> Operation:
+        section: ContainerSectionBase = _prepared(ConfigBase, shape, folder).get()
+        for attr in shape.deepest_path:
+            section = getattr(section, attr)
+        return type(section).get
+
+    @benchmark(f"lookup/deepest_parameter/{shape.name}")
+    def _lookup(folder: Path) -> Operation:
+        config_class = _prepared(ConfigBase, shape, folder)
+        path = ".".join([*shape.deepest_path, "param0"])
+        return lambda: config_class.lookup(path)
+
+    @benchmark(f"lookup/deepest_parameter_via_getattr/{shape.name}")
+    def _lookup_via_getattr(folder: Path) -> Operation:
+        # reference for lookup: split the path and follow it with getattr
+        config_class = _prepared(ConfigBase, shape, folder)
+        path = ".".join([*shape.deepest_path, "param0"])
+
+        def operation() -> Any:
+            value = config_class.get()
+            for name in path.split("."):
+                value = getattr(value, name)
+            return value
+
+        return operation
+
+    @benchmark(f"update/settings/{shape.name}")
+    def _update(folder: Path) -> Operation:
+        return _updating(_prepared(SettingsBase, shape, folder))
+
+    @benchmark(f"update/settings_journal/{shape.name}")
+    def _update_journal(folder: Path) -> Operation:
+        return _updating(_prepared(_JournaledSettings, shape, folder))
+
+    def _updating(settings_class: Any) -> Operation:
+        values = count()
+
+        def operation() -> Any:
+            changes = update_changes(shape)
+            deepest = changes
+            while "param0" not in deepest:
+                deepest = next(iter(deepest.values()))
+            deepest["param0"] = next(values)
+            return settings_class.update(changes)
+
+        return operation
+
+    @benchmark(f"update/validate_changes/{shape.name}")
+    def _validate_changes(folder: Path) -> Operation:
+        # the in-memory part of update, without saving to file
+        instance = _prepared(SettingsBase, shape, folder).get()
+        changes = update_changes(shape)
+        return lambda: _update_section(instance, changes)
+
+    @benchmark(f"export/to_json_after_update/{shape.name}")
+    def _export(folder: Path) -> Operation:
+        # a fresh instance each time, so only the cached subsections are reused
+        instance = _prepared(SettingsBase, shape, folder).get()
+        instance.to_json()
+        changes = update_changes(shape)
+        return lambda: _update_section(instance, changes).to_json()
+
+    @benchmark(f"save/settings/{shape.name}")
+    def _save(folder: Path) -> Operation:
+        # pylint: disable-next=protected-access
+        return _prepared(SettingsBase, shape, folder).get()._save
+
+    @benchmark(f"config_filepath_from_cli/{shape.name}")
+    def _from_cli(folder: Path) -> Operation:
+        path = _prepared(ConfigBase, shape, folder).filepath()
+
+        def operation() -> Any:
+            argv, sys.argv = sys.argv, ["benchmark", "-c", str(path)]
+            try:
+                return config_filepath_from_cli(parser=ArgumentParser(), load=True)
+            finally:
+                sys.argv = argv
+
+        return operation
+
+
+for _shape in SHAPES:
+    _register_for_shape(_shape)
+
+
+def _register_for_includes(nr_of_files: int) -> None:
+    @benchmark(f"load_with_includes/large/{nr_of_files}_files")
+    def _load_with_includes_files(folder: Path) -> Operation:
+        _, data = _container(ConfigBase, SHAPES[-1])
+        path = write_included_files(folder, data, nr_of_files)
+        return lambda: _load_with_includes(path, True, load_toml)
+
+
+for _nr_of_files in (1, 4, 16):
+    _register_for_includes(_nr_of_files)
+
+
+_NR_OF_THREADS = 8
+_UPDATES_PER_THREAD = 4
+
+
+def _register_for_concurrent_update(extension: str) -> None:
+    @benchmark(
+        f"concurrent_update/{extension}/large/"
+        f"{_NR_OF_THREADS}x{_UPDATES_PER_THREAD}_updates"
+    )
+    def _concurrent_update(folder: Path) -> Operation:
+        settings_class: Any = _prepared(SettingsBase, SHAPES[-1], folder)
+        _, data = _container(SettingsBase, SHAPES[-1])
+        settings_class.set_filepath(
+            write_file(folder / f"settings.{extension}", data), load=True
+        )
+
+        # concurrent rewrites of a json file corrupt it, so these have to be serialized;
+        # sqlite serializes the writes of single rows itself
+        lock: AbstractContextManager[Any] = (
+            Lock() if extension == "json" else nullcontext()
+        )
+
+        def update_param(index: int) -> None:
+            # each thread updates a different parameter
+            changes = update_changes(SHAPES[-1])
+            deepest = changes
+            while "param0" not in deepest:
+                deepest = next(iter(deepest.values()))
+            del deepest["param0"]
+            for value in range(_UPDATES_PER_THREAD):
+                deepest[f"param{4 * index}"] = -value
+                with lock:
+                    settings_class.update(changes)
+
+        def operation() -> None:
+            with ThreadPoolExecutor(_NR_OF_THREADS) as executor:
+                list(executor.map(update_param, range(_NR_OF_THREADS)))
+
+        return operation
+
+
+for _extension in ("json", "sqlite"):
+    _register_for_concurrent_update(_extension)
@@ -0,0 +1,130 @@
+"""Generators for container classes and parameter files of varying shape and size."""
+
+import json
+import sys
+from dataclasses import dataclass as std_dataclass
+from pathlib import Path
+from typing import Any
+
+import tomlkit
+
+from application_settings import (
+    ConfigBase,
+    ConfigSectionBase,
+    SettingsSectionBase,
+    dataclass,
+)
+from application_settings._private.sqlite_file_operations import save_sqlite
+from application_settings.container_base import ContainerBase
+
+
+@std_dataclass(frozen=True)
+class TreeShape:
+    """Shape of a generated container: every section holds `width` parameters and
+    `branching` subsections, down to `depth` levels of sections"""
+
+    name: str
+    depth: int
+    branching: int
+    width: int
+
+    @property
+    def nr_of_sections(self) -> int:
+        """Total number of sections, excluding the container itself"""
+        return sum(self.branching**level for level in range(1, self.depth + 1))
+
+    @property
+    def deepest_path(self) -> list[str]:
+        """Attribute names to get from the container to a section at the deepest level"""
+        return ["sec0"] * self.depth
+
+
+SHAPES = [
+    TreeShape("small", depth=1, branching=2, width=5),
+    TreeShape("flat", depth=1, branching=4, width=100),
+    TreeShape("deep", depth=8, branching=1, width=10),
+    TreeShape("bushy", depth=3, branching=4, width=10),
+    TreeShape("large", depth=3, branching=4, width=40),
+]
+
+
+def _default_value(index: int) -> Any:
+    return (index, f"value {index}", index + 0.5, index % 2 == 0)[index % 4]
+
+
+def _stored_value(index: int) -> Any:
+    return (-index, f"stored {index}", index + 0.25, index % 2 == 1)[index % 4]
+
+
+def _make_class(
+    name: str, bases: tuple[type, ...], section_base: type, shape: TreeShape, level: int
+) -> tuple[type, dict[str, Any]]:
+    """Recursively define a (container or section) class with nested section classes and
+    return it with data for a parameter file"""
+    annotations: dict[str, Any] = {}
+    namespace: dict[str, Any] = {"__annotations__": annotations, "__module__": __name__}
+    data: dict[str, Any] = {}
+    for i in range(shape.width):
+        annotations[f"param{i}"] = type(_default_value(i))
+        namespace[f"param{i}"] = _default_value(i)
+        data[f"param{i}"] = _stored_value(i)
+    if level < shape.depth:
+        for j in range(shape.branching):
+            sub_cls, data[f"sec{j}"] = _make_class(
+                f"{name}S{j}", (section_base,), section_base, shape, level + 1
+            )
+            annotations[f"sec{j}"] = sub_cls
+            namespace[f"sec{j}"] = sub_cls()
+    return dataclass(frozen=True)(type(name, bases, namespace)), data
+
+
+def make_container(
+    base: type[ContainerBase], shape: TreeShape, variant: str = ""
+) -> tuple[type[ContainerBase], dict[str, Any]]:
+    """Define a container class with the given shape, importable from this module, and
+    return it together with data for a parameter file; variant distinguishes the names
+    of classes with the same shape but a different base"""
+    section_base = (
+        ConfigSectionBase if issubclass(base, ConfigBase) else SettingsSectionBase
+    )
+    name = f"{shape.name.capitalize()}{variant}{base.kind_string()}"
+    the_class, data = _make_class(name, (base,), section_base, shape, 0)
+    # make the class importable via its qualified name, for loading from the cli
+    setattr(sys.modules[__name__], name, the_class)
+    data[f"__{base.kind_string()}_container_class__"] = f"{__name__}.{name}"
+    return the_class, data
+
+
+def write_file(path: Path, data: dict[str, Any]) -> Path:
+    """Write data to path in the format given by its extension and return path"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".sqlite":
+        path.touch()
+        save_sqlite(path, data)
+        return path
+    with path.open(mode="w", encoding="utf-8") as fptr:
+        if path.suffix == ".toml":
+            tomlkit.dump(data, fptr)
+        else:
+            json.dump(data, fptr)
+    return path
+
+
+def write_included_files(folder: Path, data: dict[str, Any], nr_of_files: int) -> Path:
+    """Spread the top level items of data over a chain of nr_of_files toml files that
+    include each other and return the path of the main file"""
+    items = list(data.items())
+    for i in range(nr_of_files):
+        part = dict(items[i::nr_of_files])
+        if i + 1 < nr_of_files:
+            part["__include__"] = f"./config{i + 1}.toml"
+        write_file(folder / f"config{i}.toml", part)
+    return folder / "config0.toml"
+
+
+def update_changes(shape: TreeShape) -> dict[str, Any]:
+    """Return a change of a single parameter in a section at the deepest level"""
+    changes: dict[str, Any] = {"param0": 17}
+    for attr in reversed(shape.deepest_path):
+        changes = {attr: changes}
+    return changes
@@ -0,0 +1,125 @@
+"""Registry, timing and baseline handling for the benchmarks."""
+
+import gc
+import json
+import platform
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+Operation = Callable[[], Any]
+Setup = Callable[[Path], Operation]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A benchmark: setup prepares files in a folder and returns the operation to time"""
+
+    name: str
+    setup: Setup
+
+
+@dataclass(frozen=True)
+class Result:
+    """Best time per call over the repeats and the peak memory of a single call"""
+
+    seconds: float
+    peak_bytes: int
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the result as a json-serializable dict"""
+        return {"seconds": self.seconds, "peak_bytes": self.peak_bytes}
+
+
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """Decorator that registers a setup function as benchmark"""
+
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS.append(Benchmark(name, setup))
+        return setup
+
+    return register
+
+
+def run(the_benchmark: Benchmark, folder: Path, repeat: int) -> Result:
+    """Run the benchmark and return the result"""
+    operation = the_benchmark.setup(folder)
+    timer = timeit.Timer(operation)
+    # autorange also warms up, e.g. imports and caches that are filled once per process
+    number, _ = timer.autorange()
+    gc.collect()
+    seconds = min(timer.repeat(number=number, repeat=repeat)) / number
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(seconds, peak_bytes)
+
+
+def save_baseline(path: Path, results: dict[str, Result]) -> None:
+    """Store the results as baseline in path"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open(mode="w", encoding="utf-8") as fptr:
+        json.dump(
+            {
+                "machine": platform.node(),
+                "python": platform.python_version(),
+                "results": {name: res.to_dict() for name, res in results.items()},
+            },
+            fptr,
+            indent=2,
+        )
+
+
+def load_baseline(path: Path) -> dict[str, Result]:
+    """Return the results stored as baseline in path"""
+    with path.open(mode="r", encoding="utf-8") as fptr:
+        stored = json.load(fptr)
+    return {name: Result(**res) for name, res in stored["results"].items()}
+
+
+def regressions(
+    results: dict[str, Result], baseline: dict[str, Result], tolerance: float
+) -> list[str]:
+    """Return a description of every result that is worse than baseline by more than
+    the tolerance (a fraction)"""
+    found = []
+    for name, res in results.items():
+        if not (base := baseline.get(name)):
+            continue
+        if res.seconds > base.seconds * (1.0 + tolerance):
+            found.append(
+                f"{name}: {_format_seconds(res.seconds)} vs "
+                f"{_format_seconds(base.seconds)} in baseline"
+            )
+        if res.peak_bytes > base.peak_bytes * (1.0 + tolerance):
+            found.append(
+                f"{name}: peak memory {res.peak_bytes} B vs "
+                f"{base.peak_bytes} B in baseline"
+            )
+    return found
+
+
+def format_result(  # pylint: disable=consider-alternative-union-syntax
+    name: str, res: Result, base: Optional[Result] = None
+) -> str:
+    """Return a line for the report"""
+    line = f"{name:<55} {_format_seconds(res.seconds):>12} {res.peak_bytes / 1024:>10.1f} KiB"
+    if base:
+        line += f" {res.seconds / base.seconds:>7.2f}x"
+    return line
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, factor in (("s", 1.0), ("ms", 1e3), ("us", 1e6)):
+        if seconds * factor >= 1.0:
+            return f"{seconds * factor:.3f} {unit}"
+    return f"{seconds * 1e9:.1f} ns"
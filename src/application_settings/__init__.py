@@ -7,11 +7,26 @@ from loguru import logger
 from pydantic import ValidationError
 from pydantic.dataclasses import dataclass
 
+from application_settings._private.file_operations import StorageMode
+from application_settings._private.instrumentation import (
+    OperationReport,
+    Phase,
+    WriteCounts,
+    add_observer,
+    log_report,
+    remove_observer,
+    write_counts,
+)
+from application_settings._private.settings_server import SettingsServer
 from application_settings.configuring_base import ConfigBase, ConfigSectionBase, ConfigT
+from application_settings.container_section_base import changed_paths
 from application_settings.convenience import (
     config_filepath_from_cli,
+    get_many,
+    load_all,
     parameters_folderpath_from_cli,
     settings_filepath_from_cli,
+    update_many,
     use_standard_logging,
 )
 from application_settings.parameter_kind import ParameterKind, ParameterKindStr
@@ -22,7 +37,7 @@ from application_settings.settings_base import (
 )
 from application_settings.type_notation_helper import PathOpt, PathOrStr
 
-LOGGER_NAME = "application-settings"
+LOGGER_NAME = "application_settings"
 logger.disable(LOGGER_NAME)
 
 __version__ = version("application-settings")
@@ -32,18 +47,31 @@ __all__ = [
     "ConfigSectionBase",
     "ConfigBase",
     "ConfigT",
+    "OperationReport",
     "ParameterKind",
     "PathOpt",
     "PathOrStr",
+    "Phase",
     "ParameterKindStr",
     "SettingsSectionBase",
     "SettingsBase",
+    "SettingsServer",
     "SettingsT",
+    "StorageMode",
     "ValidationError",
+    "WriteCounts",
+    "add_observer",
     "attributes_doc",
+    "changed_paths",
     "config_filepath_from_cli",
     "dataclass",
+    "get_many",
+    "load_all",
+    "log_report",
+    "remove_observer",
     "settings_filepath_from_cli",
+    "update_many",
     "parameters_folderpath_from_cli",
     "use_standard_logging",
+    "write_counts",
 ]
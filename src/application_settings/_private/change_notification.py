@@ -0,0 +1,109 @@
+"""Notification of changes of a parameter file to other processes on the same host.
+
+A process that changed a parameter file appends a line with the changed paths to a
+sentinel file next to it. The state of the sentinel file (inode and size) serves as
+version: other processes compare it with the state they saw when they last loaded the
+parameter file, which only costs a stat.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from application_settings._private.file_operations_utils import _BINARY
+
+_MAX_SIZE = 64 * 1024
+"""Size of the sentinel file above which it is replaced by a new one"""
+
+SentinelState = tuple[int, int]
+"""Inode and size of a sentinel file, (0, 0) if it does not exist"""
+
+_SEEN: dict[Path, SentinelState] = {}
+"""Per parameter file: the state of its sentinel file when it was last loaded"""
+
+
+def sentinel_path(path: Path) -> Path:
+    """Return the path of the sentinel file of the parameter file path"""
+    return path.with_name(f"{path.name}.changes")
+
+
+def mark_loading(path: Path) -> None:
+    """Remember the state of the sentinel file; to be called before loading path"""
+    _SEEN[path] = _state(sentinel_path(path))
+
+
+def forget(path: Path) -> None:
+    """Forget the state of the sentinel file, e.g., when path is no longer loaded"""
+    _SEEN.pop(path, None)
+
+
+def is_behind(path: Path) -> bool:
+    """Return whether another process changed the parameter file path since this process
+    loaded it; logs the paths of the parameters that were changed"""
+    if (seen := _SEEN.get(path)) is None or (
+        current := _state(the_sentinel_path := sentinel_path(path))
+    ) == seen:
+        return False
+    logger.opt(lazy=True).info(
+        "{} changed by another process: {}",
+        lambda: path,
+        lambda: _changes_since(the_sentinel_path, seen, current),
+    )
+    return True
+
+
+def publish(path: Path, changed_paths: list[str]) -> None:
+    """Publish to other processes that the parameters changed_paths in the parameter file
+    path have been changed by this process"""
+    line = (json.dumps(changed_paths, separators=(",", ":")) + "\n").encode("utf-8")
+    the_sentinel_path = sentinel_path(path)
+    before = _state(the_sentinel_path)
+    if before[1] > _MAX_SIZE:
+        # a new file, so its state differs from all states seen of the old one
+        temporary_path = the_sentinel_path.with_name(
+            f"{the_sentinel_path.name}.{os.getpid()}"
+        )
+        temporary_path.write_bytes(line)
+        os.replace(temporary_path, the_sentinel_path)
+        after = _state(the_sentinel_path)
+        expected = after
+    else:
+        fd = os.open(
+            the_sentinel_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | _BINARY, 0o666
+        )
+        try:
+            os.write(fd, line)
+            file_stat = os.fstat(fd)
+            after = (file_stat.st_ino, file_stat.st_size)
+        finally:
+            os.close(fd)
+        expected = (after[0], before[1] + len(line))
+    if _SEEN.get(path) == before and after == expected:
+        # no change of another process has been missed
+        _SEEN[path] = after
+
+
+def _state(the_sentinel_path: Path) -> SentinelState:
+    try:
+        file_stat = os.stat(the_sentinel_path)
+    except OSError:
+        return 0, 0
+    return file_stat.st_ino, file_stat.st_size
+
+
+def _changes_since(
+    the_sentinel_path: Path, seen: SentinelState, current: SentinelState
+) -> Optional[list[str]]:  # pylint: disable=consider-alternative-union-syntax
+    """Return the changed paths published since seen; None if these are not known"""
+    if current[0] != seen[0] or current[1] < seen[1]:
+        return None
+    try:
+        with the_sentinel_path.open("rb") as sentinel:
+            sentinel.seek(seen[1])
+            lines = sentinel.read(current[1] - seen[1]).splitlines()
+    except OSError:
+        return None
+    return sorted({name for line in lines for name in json.loads(line)})
@@ -0,0 +1,126 @@
+"""Functions for transparently reading and writing compressed parameter files."""
+
+import gzip
+import importlib
+from enum import Enum, unique
+from io import BytesIO, TextIOWrapper
+from pathlib import Path
+from typing import IO, Any, Optional, cast
+
+ENCODING = "utf-8"
+
+
+@unique
+class Compression(Enum):
+    """Compression formats that are supported by application_settings"""
+
+    GZIP = "gz"
+    ZSTD = "zst"
+    LZ4 = "lz4"
+
+
+_MAGIC_BYTES: dict[Compression, bytes] = {
+    Compression.GZIP: b"\x1f\x8b",
+    Compression.ZSTD: b"\x28\xb5\x2f\xfd",
+    Compression.LZ4: b"\x04\x22\x4d\x18",
+}
+
+_OPTIONAL_PACKAGES: dict[Compression, str] = {
+    Compression.ZSTD: "zstandard",
+    Compression.LZ4: "lz4.frame",
+}
+
+
+def compression_from_suffix(
+    path: Path,
+) -> Optional[Compression]:  # pylint: disable=consider-alternative-union-syntax
+    """Return the compression indicated by the last suffix of path, if any"""
+    try:
+        return Compression(path.suffix[1:].lower())
+    except ValueError:
+        return None
+
+
+def compression_from_magic_bytes(
+    head: bytes,
+) -> Optional[Compression]:  # pylint: disable=consider-alternative-union-syntax
+    """Return the compression indicated by the first bytes of a file, if any"""
+    for compression, magic in _MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def format_suffix(path: Path) -> str:
+    """Return the suffix that indicates the file format, i.e. skip a compression suffix"""
+    if compression_from_suffix(path) and len(suffixes := path.suffixes) > 1:
+        return suffixes[-2][1:].lower()
+    return path.suffix[1:].lower()
+
+
+def text_reader(raw: bytes, path: Path) -> IO[str]:
+    """Return a text stream over the content raw of the file path, decompressing on the fly
+    if the magic bytes of raw indicate compression.
+
+    Raises:
+        ModuleNotFoundError: if the optional package for the compression is not installed
+    """
+    return TextIOWrapper(_binary_reader(raw, path), encoding=ENCODING)
+
+
+def decompress(raw: bytes, path: Path) -> bytes:
+    """Return the content raw of the file path, decompressed if its magic bytes indicate
+    compression.
+
+    Raises:
+        ModuleNotFoundError: if the optional package for the compression is not installed
+    """
+    if compression_from_magic_bytes(raw[:4]) is None:
+        return raw
+    with _binary_reader(raw, path) as stream:
+        return cast(bytes, stream.read())
+
+
+def _binary_reader(raw: bytes, path: Path) -> Any:
+    stream: Any = BytesIO(raw)
+    if compression := compression_from_magic_bytes(raw[:4]):
+        if compression == Compression.GZIP:
+            stream = gzip.GzipFile(fileobj=stream, mode="rb")
+        elif compression == Compression.ZSTD:
+            stream = (
+                _import_optional(compression, path)
+                .ZstdDecompressor()
+                .stream_reader(stream)
+            )
+        else:
+            stream = _import_optional(compression, path).LZ4FrameFile(stream, mode="r")
+    return stream
+
+
+def encode(text: str, path: Path) -> bytes:
+    """Encode text for storage in the file path, compressed if its suffix indicates so.
+
+    Raises:
+        ModuleNotFoundError: if the optional package for the compression is not installed
+    """
+    raw = text.encode(ENCODING)
+    if (compression := compression_from_suffix(path)) is None:
+        return raw
+    if compression == Compression.GZIP:
+        return gzip.compress(raw)
+    if compression == Compression.ZSTD:
+        return cast(
+            bytes, _import_optional(compression, path).ZstdCompressor().compress(raw)
+        )
+    return cast(bytes, _import_optional(compression, path).compress(raw))
+
+
+def _import_optional(compression: Compression, path: Path) -> Any:
+    package = _OPTIONAL_PACKAGES[compression]
+    try:
+        return importlib.import_module(package)
+    except ModuleNotFoundError as exc:
+        raise ModuleNotFoundError(
+            f"Package '{package.split('.', maxsplit=1)[0]}' is needed for handling "
+            f"{compression.name} compressed file {path}; please install it."
+        ) from exc
@@ -0,0 +1,62 @@
+"""Validation of single fields of pydantic dataclasses, for updating only what changed."""
+
+from operator import getitem
+from typing import Annotated, Any
+
+from pydantic import TypeAdapter
+
+
+def validates_per_field(cls: type) -> bool:
+    """Return whether instances of cls can be updated by validating only changed fields
+
+    This is the case for a pydantic dataclass without validators, __post_init__ or
+    custom configuration, because then validating a field does not depend on the other
+    fields.
+    """
+    if (cls_id := id(cls)) not in _VALIDATES_PER_FIELD:
+        decorators = cls.__dict__.get("__pydantic_decorators__")
+        _VALIDATES_PER_FIELD[cls_id] = (
+            decorators is not None
+            and not (
+                decorators.validators
+                or decorators.field_validators
+                or decorators.root_validators
+                or decorators.model_validators
+            )
+            and not getattr(cls, "__pydantic_config__", None)
+            and not hasattr(cls, "__post_init__")
+        )
+    return _VALIDATES_PER_FIELD[cls_id]
+
+
+def validate_field(cls: type, name: str, value: Any) -> Any:
+    """Validate value against the type and constraints of field name of cls
+
+    Raises:
+        ValidationError: if value cannot be coerced into the type of the field
+    """
+    if (key := (id(cls), name)) not in _FIELD_ADAPTERS:
+        field_info = cls.__pydantic_fields__[name]  # type: ignore[attr-defined]
+        annotation: Any = field_info.annotation
+        if field_info.metadata:
+            # constraints such as Field(gt=0) are kept in the metadata
+            annotation = getitem(Annotated, (annotation, *field_info.metadata))
+        _FIELD_ADAPTERS[key] = TypeAdapter(annotation)
+    return _FIELD_ADAPTERS[key].validate_python(value)
+
+
+def is_field(cls: type, name: str) -> bool:
+    """Return whether name is a field of the pydantic dataclass cls"""
+    return name in cls.__pydantic_fields__  # type: ignore[attr-defined]
+
+
+def copy_with(instance: Any, values: dict[str, Any]) -> Any:
+    """Return a copy of the frozen dataclass instance with the validated values"""
+    the_copy = object.__new__(type(instance))
+    the_copy.__dict__.update(instance.__dict__)
+    the_copy.__dict__.update(values)
+    return the_copy
+
+
+_VALIDATES_PER_FIELD: dict[int, bool] = {}
+_FIELD_ADAPTERS: dict[tuple[int, str], TypeAdapter[Any]] = {}
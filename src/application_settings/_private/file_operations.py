@@ -1,14 +1,43 @@
 """Functions for storing dicts to and loading dicts from file."""
 
-from collections.abc import Callable
+import json
+import os
+from collections.abc import Callable, Collection, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
 from enum import Enum, unique
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, cast
+from threading import Lock
+from typing import Any, Optional, TypeVar, cast
 
 from loguru import logger
 from pathvalidate import is_valid_filepath
 
-from application_settings._private.json_file_operations import load_json, save_json
+from application_settings._private import journal
+from application_settings._private.compression import (
+    compression_from_suffix,
+    format_suffix,
+)
+from application_settings._private.file_operations_utils import (
+    deep_update,
+    forget_states,
+)
+from application_settings._private.instrumentation import (
+    Phase,
+    count_cache_hit,
+    measure,
+)
+from application_settings._private.json_file_operations import (
+    load_json,
+    read_json,
+    save_json,
+)
+from application_settings._private.sqlite_file_operations import (
+    load_sqlite,
+    save_sqlite,
+)
 from application_settings._private.toml_file_operations import load_toml, save_toml
 from application_settings.parameter_kind import ParameterKind
 from application_settings.type_notation_helper import LoaderOpt, PathOpt, SaverOpt
@@ -20,40 +49,124 @@ class FileFormat(Enum):
 
     TOML = "toml"
     JSON = "json"
+    SQLITE = "sqlite"
 
 
-def _check_filepath(
-    path: PathOpt,
-    throw_if_invalid_path: bool,
-    throw_if_file_not_found: bool,
-    create_file_if_not_found: bool,
-) -> bool:
-    """Log an error and/or throw if path cannot be loaded and return a bool whether it can"""
+@unique
+class StorageMode(Enum):
+    """Ways in which updates of settings are stored"""
+
+    FILE = "file"
+    """Each update rewrites the settings file"""
+    JOURNAL = "journal"
+    """Each update is appended to a journal next to the settings file, which is folded
+    into the settings file when it grows too large"""
+    SHARDED = "sharded"
+    """Each top-level section is stored in its own file, a shard, in a folder next to
+    the settings file; an update only rewrites the shards of the sections that changed"""
+
+
+_ParsedT = TypeVar("_ParsedT")
+_ParsedFiles = dict[Path, "Future[dict[str, Any]]"]
+_PARSED_FRAGMENTS: dict[Path, tuple[tuple[int, int, int], dict[str, Any]]] = {}
+"""Per fragment file: the state of the file when it was parsed and the parsed data"""
+_PARSED_FILES: ContextVar[
+    Optional[_ParsedFiles]  # pylint: disable=consider-alternative-union-syntax
+] = ContextVar("_PARSED_FILES", default=None)
+_PARSED_FILES_LOCK = Lock()
+
+
+def _check_filepath(path: PathOpt, throw_if_invalid_path: bool) -> bool:
+    """Log an error and/or throw if path cannot be used and return a bool whether it can
+
+    Only the path itself is checked, the file system is not accessed; whether the file
+    exists follows from opening it.
+    """
     if not path:
-        err_mess = f"Path {str(path)} not valid."
         if throw_if_invalid_path:
-            raise FileNotFoundError(err_mess)
-        logger.error(err_mess)
+            raise FileNotFoundError(f"Path {str(path)} not valid.")
+        logger.error("Path {} not valid.", path)
         return False
-    ext = path.suffix[1:].lower()
+    ext = format_suffix(path)
     try:
-        FileFormat(ext)
+        file_format = FileFormat(ext)
     except ValueError:
-        logger.error(f"Unknown file format {ext} given in {path}.")
+        logger.error("Unknown file format {} given in {}.", ext, path)
         return False
-    if not path.is_file():
-        mess = f"Path {str(path)} is not a file."
-        if create_file_if_not_found:
-            path.touch()
-            if not path.is_file():
-                logger.error(f"Creation of file {str(path)} failed.")
-                return False
-            logger.info(f"File {str(path)} created.")
-            return True
+    if file_format == FileFormat.SQLITE and (
+        compression := compression_from_suffix(path)
+    ):
+        # sqlite opens the file itself, so it cannot be decompressed on the fly
+        raise ValueError(
+            f"Path {str(path)}: {compression.value} compression is not supported for "
+            "sqlite files."
+        )
+    return True
+
+
+def _load_file(
+    path: Path, throw_if_file_not_found: bool, loader: Callable[[Path], dict[str, Any]]
+) -> Optional[dict[str, Any]]:  # pylint: disable=consider-alternative-union-syntax
+    """Load the file; return None (or throw) if it is not found"""
+    try:
+        if (parsed_files := _PARSED_FILES.get()) is None:
+            return loader(path)
+        return _load_file_once(path, parsed_files, loader)
+    except FileNotFoundError:
         if throw_if_file_not_found:
-            raise FileNotFoundError(mess)
-        logger.warning(mess)
+            raise
+        logger.warning("Path {} is not a file.", path)
+        return None
+
+
+def _load_file_once(
+    path: Path, parsed_files: _ParsedFiles, loader: Callable[[Path], dict[str, Any]]
+) -> dict[str, Any]:
+    """Load the file, unless it has been parsed in this context already; threads that
+    load it meanwhile wait for and receive the result (or the exception) of this parse
+    """
+    with _PARSED_FILES_LOCK:
+        if (in_flight := parsed_files.get(path)) is None:
+            future: Future[dict[str, Any]] = Future()
+            parsed_files[path] = future
+    if in_flight is not None:
+        count_cache_hit()
+        return in_flight.result()
+    try:
+        data_stored = loader(path)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    future.set_result(data_stored)
+    return data_stored
+
+
+@contextmanager
+def parse_files_once() -> Iterator[None]:
+    """Context in which each file is parsed only once, also when it is loaded repeatedly.
+
+    Meant for bootstrapping, e.g. reading the container class from a file and then
+    loading the container from it. The parsed data is shared, so it should not be
+    modified. Files saved within the context are parsed again when loaded.
+    """
+    if _PARSED_FILES.get() is not None:
+        yield
+        return
+    token = _PARSED_FILES.set({})
+    try:
+        yield
+    finally:
+        _PARSED_FILES.reset(token)
+
+
+def _create_file(path: Path) -> bool:
+    """Create the file and its folder if needed and return whether that succeeded"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    if not path.is_file():
+        logger.error("Creation of file {} failed.", path)
         return False
+    logger.info("File {} created.", path)
     return True
 
 
@@ -65,15 +178,12 @@ def get_container_from_file(
     kind: ParameterKind, path: PathOpt, throw_if_file_not_found: bool
 ) -> str:
     """Load data from the file given in path; log error or throw if not possible"""
-    if _check_filepath(
-        path,
-        throw_if_invalid_path=throw_if_file_not_found,
-        throw_if_file_not_found=throw_if_file_not_found,
-        create_file_if_not_found=False,
-    ):
+    if _check_filepath(path, throw_if_invalid_path=throw_if_file_not_found):
         real_path = cast(Path, path)
-        if loader := _get_loader(path=real_path):
-            return cast(str, loader(real_path).get(_container_class_key(kind), ""))
+        if (loader := _get_loader(path=real_path)) and (
+            data_stored := _load_file(real_path, throw_if_file_not_found, loader)
+        ) is not None:
+            return cast(str, data_stored.get(_container_class_key(kind), ""))
     return ""
 
 
@@ -81,85 +191,312 @@ def load(
     kind: ParameterKind, path: PathOpt, throw_if_file_not_found: bool
 ) -> dict[str, Any]:
     """Load data from the file given in path; log error or throw if not possible"""
-    if _check_filepath(
-        path,
-        throw_if_invalid_path=throw_if_file_not_found,
-        throw_if_file_not_found=throw_if_file_not_found,
-        create_file_if_not_found=False,
-    ):
+    if _check_filepath(path, throw_if_invalid_path=throw_if_file_not_found):
         real_path = cast(Path, path)
         if loader := _get_loader(path=real_path):
             if kind == ParameterKind.CONFIG:
-                return _load_with_includes(real_path, throw_if_file_not_found, loader)
-            return loader(real_path)
+                data_stored = _load_with_includes(
+                    real_path, throw_if_file_not_found, loader
+                )
+            else:
+                data_stored = _load_file(real_path, throw_if_file_not_found, loader)
+            if data_stored is not None:
+                return data_stored
     logger.warning(
         "Trying with default values, as loading from file is impossible. This may fail."
     )
     return {}
 
 
-def save(path: Path, data: dict[str, Any]) -> None:
-    """Save data to the file given in path; log error or throw if not possible"""
-    if _check_filepath(
-        path,
-        throw_if_invalid_path=True,
-        throw_if_file_not_found=False,
-        create_file_if_not_found=True,
+def load_fragments(folder: Path) -> dict[str, Any]:
+    """Return the data of the files in folder, merged in lexical order of their names.
+
+    Files of an unknown format are skipped. The files are parsed concurrently, and only
+    if they changed since they were last parsed.
+    """
+    try:
+        with os.scandir(folder) as entries:
+            states = {
+                Path(entry.path): (
+                    (entry_stat := entry.stat()).st_mtime_ns,
+                    entry_stat.st_size,
+                    entry_stat.st_ino,
+                )
+                for entry in sorted(entries, key=lambda entry: entry.name)
+                if entry.is_file() and _get_loader(Path(entry.path))
+            }
+    except FileNotFoundError:
+        logger.warning("Folder {} with fragments does not exist.", folder)
+        states = {}
+    # forget the fragments that have been deleted
+    for path in [
+        path
+        for path in _PARSED_FRAGMENTS
+        if path.parent == folder and path not in states
+    ]:
+        del _PARSED_FRAGMENTS[path]
+    if not states:
+        return {}
+    if changed := [
+        path
+        for path, state in states.items()
+        if (parsed := _PARSED_FRAGMENTS.get(path)) is None or parsed[0] != state
+    ]:
+        for path, data in zip(changed, _parse_in_parallel(changed, _load_fragment)):
+            _PARSED_FRAGMENTS[path] = (states[path], data)
+    with measure(Phase.MERGE):
+        return deep_update({}, *(_PARSED_FRAGMENTS[path][1] for path in states))
+
+
+def _load_fragment(path: Path) -> dict[str, Any]:
+    """Load a fragment, of which the format is known"""
+    return cast(Callable[[Path], dict[str, Any]], _get_loader(path))(path)
+
+
+def _parse_in_parallel(
+    paths: list[Path], parse: Callable[[Path], _ParsedT]
+) -> list[_ParsedT]:
+    """Return the results of parse for each of paths, parsed concurrently"""
+    with ThreadPoolExecutor(min(len(paths), 8)) as executor:
+        # each task runs in a copy of this context, to count in the active report
+        return list(
+            executor.map(
+                lambda context, path: context.run(parse, path),
+                [copy_context() for _ in paths],
+                paths,
+            )
+        )
+
+
+def load_unparsed_json(
+    kind: ParameterKind,
+    path: PathOpt,
+    throw_if_file_not_found: bool,
+    references: bool = False,
+) -> Optional[bytes]:  # pylint: disable=consider-alternative-union-syntax
+    """Return the content of the json file given in path if it can be validated as is
+
+    None is returned if the file is not a json file, has already been parsed, includes
+    other files or, if references are resolved, references other values, is empty or does
+    not exist; use load() in those cases.
+    """
+    if (
+        not path
+        or format_suffix(path) != FileFormat.JSON.value
+        or ((parsed_files := _PARSED_FILES.get()) is not None and path in parsed_files)
     ):
-        if saver := _get_saver(path=path):
-            return saver(path, data)
-    return None
+        return None
+    try:
+        raw = read_json(path)
+    except FileNotFoundError:
+        if throw_if_file_not_found:
+            raise
+        return None
+    if not raw:
+        return None
+    if kind == ParameterKind.CONFIG and (
+        b'"__include__"' in raw or (references and b"${" in raw)
+    ):
+        if parsed_files is not None:
+            # the file is loaded next, without reading and parsing it again
+            future: Future[dict[str, Any]] = Future()
+            with measure(Phase.PARSE):
+                future.set_result(json.loads(raw))
+            with _PARSED_FILES_LOCK:
+                parsed_files.setdefault(path, future)
+        return None
+    return raw
+
+
+def save(
+    path: Path,
+    data: dict[str, Any],
+    sections: Optional[  # pylint: disable=consider-alternative-union-syntax
+        dict[str, Any]
+    ] = None,
+) -> None:
+    """Save data to the file given in path; log error or throw if not possible
+
+    The file, and the folder that holds it, are created if they do not exist. sections
+    holds the names of the sections in data, each with those of its own sections; formats
+    that store each parameter separately need these to tell sections from parameters
+    that hold a dict.
+    """
+    if _check_filepath(path, throw_if_invalid_path=True) and (
+        saver := _get_saver(path=path, sections=sections)
+    ):
+        if (parsed_files := _PARSED_FILES.get()) is not None:
+            with _PARSED_FILES_LOCK:
+                parsed_files.pop(path, None)
+        try:
+            saver(path, data)
+        except FileNotFoundError:
+            if _create_file(path):
+                saver(path, data)
+
+
+def shard_path(path: Path, name: str) -> Path:
+    """Return the path of the shard that holds the section name of the file path"""
+    return path.with_name(f"{path.name}.shards") / f"{name}.{format_suffix(path)}"
+
+
+def load_shards(path: Path, names: Collection[str]) -> dict[str, Any]:
+    """Return per name the data in its shard of the file given in path; shards that do
+    not exist are left out. The shards are loaded concurrently."""
+    if not names:
+        return {}
+    all_data = _parse_in_parallel(
+        [shard_path(path, name) for name in names], _load_shard
+    )
+    return {name: data for name, data in zip(names, all_data) if data is not None}
+
+
+def save_shards(
+    path: Path,
+    data: dict[str, Any],
+    sections: dict[str, Any],
+    changed: Optional[  # pylint: disable=consider-alternative-union-syntax
+        Collection[str]
+    ] = None,
+) -> None:
+    """Save the values in data of the sections each to their shard, and the other values
+    to the file given in path; if changed is given, only the shards of the names in
+    changed are saved, and path only if changed holds other names or path does not exist
+    yet. sections is as for save()."""
+    for name, subsections in sections.items():
+        if name in data and (changed is None or name in changed):
+            save(shard_path(path, name), data[name], subsections)
+    if (
+        changed is None
+        or any(name not in sections for name in changed)
+        or not path.is_file()
+    ):
+        save(
+            path,
+            {name: value for name, value in data.items() if name not in sections},
+            {},
+        )
+
+
+def _load_shard(
+    the_shard_path: Path,
+) -> Optional[dict[str, Any]]:  # pylint: disable=consider-alternative-union-syntax
+    """Load a shard; None if it does not exist, as for a section that was never saved"""
+    if (loader := _get_loader(the_shard_path)) is None:
+        return None
+    try:
+        return _load_file(the_shard_path, True, loader)
+    except FileNotFoundError:
+        return None
+
+
+def replay_journal(path: PathOpt, data: dict[str, Any]) -> dict[str, Any]:
+    """Return data updated with the records in the journal of the file given in path"""
+    if not path:
+        return data
+    return journal.replay(path, data)
+
+
+def append_to_journal(
+    path: Path,
+    changes: dict[str, Any],
+    max_records: int,
+    max_bytes: int,
+    sections: Optional[  # pylint: disable=consider-alternative-union-syntax
+        dict[str, Any]
+    ] = None,
+) -> None:
+    """Append changes to the journal of the file given in path; fold the journal into
+    the file if it holds more than max_records records or max_bytes bytes. sections is
+    as for save()."""
+    nr_of_records, nr_of_bytes = journal.append(path, changes)
+    if nr_of_records > max_records or nr_of_bytes > max_bytes:
+        journal.compact(path, partial(save, sections=sections))
+
+
+def forget(path: Path, names: Collection[str] = ()) -> None:
+    """Forget what is kept about the file given in path, its journal and its shards of
+    the sections names; to be called when its parameters are no longer kept in memory"""
+    forget_states(
+        path, journal.journal_path(path), *(shard_path(path, name) for name in names)
+    )
+    journal.forget(path)
+
+
+def stores_parameters_separately(path: Path) -> bool:
+    """Return whether the format of path stores each parameter separately (sqlite), such
+    that saving only the changed parameters suffices"""
+    return format_suffix(path) == FileFormat.SQLITE.value
 
 
 def _get_loader(path: Path) -> LoaderOpt:
     """Return the loader to be used for the file extension ext and the kind (Config or Settings)"""
     # TODO: enable with_includes for all all kinds
-    ext = path.suffix[1:].lower()
+    ext = format_suffix(path)
     if ext == FileFormat.JSON.value:
         return load_json
     if ext == FileFormat.TOML.value:
         return load_toml
+    if ext == FileFormat.SQLITE.value:
+        return load_sqlite
     return None
 
 
 def _load_with_includes(
     path: Path, throw_if_file_not_found: bool, loader: Callable[[Path], dict[str, Any]]
-) -> dict[str, Any]:
-    data_stored = loader(path)
+) -> Optional[dict[str, Any]]:  # pylint: disable=consider-alternative-union-syntax
+    if (data_stored := _load_file(path, throw_if_file_not_found, loader)) is None:
+        return None
     if included_files := data_stored.get("__include__"):
         if not isinstance(included_files, list):
             included_files = [included_files]
         for included_file in included_files:
-            if is_valid_filepath(included_file, platform="auto"):
-                included_file_path = Path(included_file)
-                if not included_file_path.is_absolute():
-                    included_file_path = path.parents[0] / included_file_path
-                included_file_path.resolve()
-                if _check_filepath(
-                    included_file_path,
-                    throw_if_invalid_path=throw_if_file_not_found,
-                    throw_if_file_not_found=throw_if_file_not_found,
-                    create_file_if_not_found=False,
-                ):
-                    data_stored = (
-                        _load_with_includes(
-                            included_file_path, throw_if_file_not_found, loader
-                        )
-                        | data_stored
-                    )
-            else:
+            if not _is_valid_include(included_file):
                 raise ValueError(
                     f"Given path: '{included_file}' is not a valid path for this OS"
                 )
+            included_file_path = Path(included_file)
+            if not included_file_path.is_absolute():
+                included_file_path = path.parents[0] / included_file_path
+            if (
+                _check_filepath(
+                    included_file_path, throw_if_invalid_path=throw_if_file_not_found
+                )
+                and (
+                    included_data := _load_with_includes(
+                        included_file_path, throw_if_file_not_found, loader
+                    )
+                )
+                is not None
+            ):
+                with measure(Phase.MERGE):
+                    data_stored = included_data | data_stored
     return data_stored
 
 
-def _get_saver(path: Path) -> SaverOpt:
+def _is_valid_include(included_file: Any) -> bool:
+    return isinstance(included_file, str) and _is_valid_filepath(included_file)
+
+
+@lru_cache(maxsize=256)
+def _is_valid_filepath(file_path: str) -> bool:
+    """Validate once per path string rather than on every load"""
+    return is_valid_filepath(file_path, platform="auto")
+
+
+def _get_saver(
+    path: Path,
+    sections: Optional[  # pylint: disable=consider-alternative-union-syntax
+        dict[str, Any]
+    ] = None,
+) -> SaverOpt:
     """Return the loader to be used for the file extension ext and the kind (Config or Settings)"""
     # TODO: enable with_includes for all kinds
-    ext = path.suffix[1:].lower()
+    ext = format_suffix(path)
     if ext == FileFormat.JSON.value:
         return save_json
     if ext == FileFormat.TOML.value:
         return save_toml
+    if ext == FileFormat.SQLITE.value:
+        return partial(save_sqlite, sections=sections)
     return None
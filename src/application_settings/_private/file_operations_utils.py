@@ -1,6 +1,27 @@
 """Utilities for file operations"""
 
-from typing import Any
+import os
+import stat
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Any, Optional
+
+from loguru import logger
+
+from application_settings._private.compression import decompress, encode, text_reader
+from application_settings._private.instrumentation import (
+    Phase,
+    count_read,
+    count_written,
+    measure,
+)
+
+_BINARY = getattr(os, "O_BINARY", 0)  # no newline translation on Windows
+
+Parser = Callable[[IO[str]], Any]
+Dumper = Callable[[dict[str, Any]], str]
+FileState = tuple[int, int, int]
+"""Modification time in ns, size and inode of a file; differs after the file changed"""
 
 
 def deep_update(
@@ -19,3 +40,112 @@ def deep_update(
             else:
                 updated_mapping[k] = v
     return updated_mapping
+
+
+def parse_file(path: Path, parse: Parser) -> dict[str, Any]:
+    """Parse the (possibly compressed) file given by path and return the data as dict.
+
+    The file is opened once and its size is taken from the open file.
+
+    Raises:
+        FileNotFoundError: if path does not exist or is not a regular file
+    """
+    return _parse(_read_file(path), path, parse)
+
+
+def read_file(path: Path) -> bytes:
+    """Return the content of the (possibly compressed) file given by path, decompressed.
+
+    Raises:
+        FileNotFoundError: if path does not exist or is not a regular file
+    """
+    if raw := decompress(_read_file(path), path):
+        count_read(len(raw))
+    return raw
+
+
+def update_file(path: Path, data: dict[str, Any], parse: Parser, dump: Dumper) -> None:
+    """Update the (possibly compressed) file given by path with data.
+
+    The file is opened once for reading the old data and writing the updated data.
+
+    Raises:
+        FileNotFoundError: if path does not exist or is not a regular file
+    """
+    fd = os.open(path, os.O_RDWR | _BINARY)
+    try:
+        updated_data = deep_update(
+            _parse(_read_regular_file(fd, path), path, parse), data
+        )
+        raw = encode(dump(updated_data), path)
+        os.lseek(fd, 0, os.SEEK_SET)
+        view = memoryview(raw)
+        while view:
+            view = view[os.write(fd, view) :]
+        os.ftruncate(fd, len(raw))
+        _FILE_STATES[path] = _file_state(os.fstat(fd))
+    finally:
+        os.close(fd)
+    count_written(len(raw))
+
+
+def last_known_state(
+    path: Path,
+) -> Optional[FileState]:  # pylint: disable=consider-alternative-union-syntax
+    """Return the state of the file given by path when it was last read or written"""
+    return _FILE_STATES.get(path)
+
+
+def forget_states(*paths: Path) -> None:
+    """Forget the states of the files given by paths, e.g., when they are no longer used"""
+    for path in paths:
+        _FILE_STATES.pop(path, None)
+
+
+def current_state(
+    path: Path,
+) -> Optional[FileState]:  # pylint: disable=consider-alternative-union-syntax
+    """Return the state of the file given by path, None if it does not exist"""
+    try:
+        return _file_state(os.stat(path))
+    except OSError:
+        return None
+
+
+def _read_file(path: Path) -> bytes:
+    fd = os.open(path, os.O_RDONLY | _BINARY)
+    try:
+        return _read_regular_file(fd, path)
+    finally:
+        os.close(fd)
+
+
+def _read_regular_file(fd: int, path: Path) -> bytes:
+    file_stat = os.fstat(fd)
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise FileNotFoundError(f"Path {str(path)} is not a file.")
+    _FILE_STATES[path] = _file_state(file_stat)
+    chunks = []
+    remaining = file_stat.st_size
+    while remaining > 0 and (chunk := os.read(fd, remaining)):
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _file_state(file_stat: os.stat_result) -> FileState:
+    return file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino
+
+
+def _parse(raw: bytes, path: Path, parse: Parser) -> dict[str, Any]:
+    data_stored: dict[str, Any] = {}
+    if raw:
+        with measure(Phase.PARSE), text_reader(raw, path) as fptr:
+            data_stored = parse(fptr)
+        count_read(len(raw))
+    else:
+        logger.warning("File {} does not exist or is empty.", path)
+    return data_stored
+
+
+_FILE_STATES: dict[Path, FileState] = {}
@@ -0,0 +1,178 @@
+"""Fetching parameter files from a url into a local file that serves as cache.
+
+Requests are conditional (ETag / Last-Modified), so an unchanged document is not sent
+again, and use persistent connections that are kept per host.
+"""
+
+import http.client
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+from threading import Lock, get_ident
+from typing import Any, Optional, Union
+from urllib.parse import urlsplit
+
+from application_settings._private.file_operations_utils import forget_states
+from application_settings._private.instrumentation import count_read
+
+_Connection = Union[  # pylint: disable=consider-alternative-union-syntax
+    http.client.HTTPConnection, http.client.HTTPSConnection
+]
+_HostKey = tuple[str, str]
+
+FETCH_ERRORS = (OSError, http.client.HTTPException)
+"""Exceptions that fetch() raises if the url cannot be fetched"""
+
+
+def metadata_path(path: Path) -> Path:
+    """Return the path of the file with the validators of the cached document path"""
+    return path.with_name(f"{path.name}.http")
+
+
+def fetch(
+    url: str,
+    path: Path,
+    wait: float = 0.0,
+    timeout: float = 30.0,
+    check: Optional[  # pylint: disable=consider-alternative-union-syntax
+        Callable[[Path], None]
+    ] = None,
+) -> bool:
+    """Store the document at url in path, if it differs from the one stored there;
+    return whether it has been stored.
+
+    If wait > 0, the server is asked to hold the response for at most wait seconds
+    until the document changes (long poll, with the header 'Prefer: wait=...').
+    If check is given, it is called with a file next to path that holds the fetched
+    document; the document is only stored if check does not raise.
+
+    Raises:
+        OSError, HTTPException: if the document cannot be fetched
+        Exception: whatever check raises; path and its validators are then unchanged
+    """
+    parts = urlsplit(url)
+    metadata = _load_metadata(path)
+    headers = {"Accept-Encoding": "identity"}
+    if metadata.get("url") == url and path.is_file():
+        if etag := metadata.get("etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := metadata.get("last_modified"):
+            headers["If-Modified-Since"] = last_modified
+    if wait > 0.0:
+        headers["Prefer"] = f"wait={int(wait)}"
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    status, reason, response_headers, body = _get(
+        (parts.scheme, parts.netloc), target, headers, timeout + wait
+    )
+    if status == http.client.NOT_MODIFIED:
+        return False
+    if status != http.client.OK:
+        raise http.client.HTTPException(f"GET {url} returned {status} {reason}")
+    count_read(len(body))
+    _store_checked(path, body, check)
+    _write_atomically(
+        metadata_path(path),
+        json.dumps(
+            {
+                "url": url,
+                "etag": response_headers.get("ETag"),
+                "last_modified": response_headers.get("Last-Modified"),
+            }
+        ).encode("utf-8"),
+    )
+    return True
+
+
+def _store_checked(
+    path: Path,
+    content: bytes,
+    check: Optional[  # pylint: disable=consider-alternative-union-syntax
+        Callable[[Path], None]
+    ],
+) -> None:
+    """Write content to path like _write_atomically(), if check accepts it"""
+    # the same name, behind a prefix, such that the format is known from the suffixes
+    staged_path = path.with_name(f".{os.getpid()}.{get_ident()}.{path.name}")
+    try:
+        _write(staged_path, content)
+        if check is not None:
+            check(staged_path)
+        os.replace(staged_path, path)
+    finally:
+        staged_path.unlink(missing_ok=True)
+        forget_states(staged_path)
+
+
+def _get(
+    host_key: _HostKey, target: str, headers: dict[str, str], timeout: float
+) -> tuple[int, str, dict[str, str], bytes]:
+    """Send a GET request over a pooled connection; retry once on a new connection if a
+    pooled one turns out to be closed"""
+    while True:
+        connection, pooled = _acquire(host_key, timeout)
+        try:
+            connection.request("GET", target, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+        except FETCH_ERRORS as exc:
+            connection.close()
+            if pooled and isinstance(exc, (ConnectionError, http.client.BadStatusLine)):
+                continue
+            raise
+        if response.will_close:
+            connection.close()
+        else:
+            _release(host_key, connection)
+        return response.status, response.reason, dict(response.headers), body
+
+
+def _acquire(host_key: _HostKey, timeout: float) -> tuple[_Connection, bool]:
+    """Return an idle connection to the host, or a new one, and whether it was idle"""
+    with _POOL_LOCK:
+        if idle := _IDLE_CONNECTIONS.get(host_key):
+            connection = idle.pop()
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            return connection, True
+    scheme, netloc = host_key
+    if scheme == "https":
+        return http.client.HTTPSConnection(netloc, timeout=timeout), False
+    if scheme == "http":
+        return http.client.HTTPConnection(netloc, timeout=timeout), False
+    raise ValueError(f"Unsupported scheme {scheme} in url")
+
+
+def _release(host_key: _HostKey, connection: _Connection) -> None:
+    with _POOL_LOCK:
+        _IDLE_CONNECTIONS.setdefault(host_key, []).append(connection)
+
+
+def _load_metadata(path: Path) -> dict[str, Any]:
+    try:
+        return dict(json.loads(metadata_path(path).read_bytes()))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomically(path: Path, content: bytes) -> None:
+    """Write content to path such that readers see either the old or the new content"""
+    temporary_path = path.with_name(f"{path.name}.{os.getpid()}.{get_ident()}.tmp")
+    _write(temporary_path, content)
+    os.replace(temporary_path, path)
+
+
+def _write(path: Path, content: bytes) -> None:
+    """Write content to path, creating its folder if needed"""
+    try:
+        path.write_bytes(content)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+
+_IDLE_CONNECTIONS: dict[_HostKey, list[_Connection]] = {}
+_POOL_LOCK = Lock()
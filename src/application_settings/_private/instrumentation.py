@@ -0,0 +1,202 @@
+"""Collection of timings and I/O counts per load or update, reported to observers."""
+
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum, unique
+from threading import Lock
+from time import perf_counter
+from typing import Optional
+
+from loguru import logger
+
+
+@unique
+class Phase(Enum):
+    """The phases of loading and updating a container that are measured"""
+
+    PARSE = "parse"
+    MERGE = "merge"
+    VALIDATE = "validate"
+    REGISTER = "register"
+    SAVE = "save"
+
+
+@dataclass
+class OperationReport:  # pylint: disable=too-many-instance-attributes
+    """Measurements of a single load or update of a container"""
+
+    container: str
+    """Name of the container class"""
+    operation: str
+    """Either 'load' or 'update'"""
+    seconds: float = 0.0
+    """Total duration of the operation"""
+    durations: dict[Phase, float] = field(default_factory=dict)
+    """Accumulated duration per phase"""
+    files_read: int = 0
+    bytes_read: int = 0
+    files_written: int = 0
+    bytes_written: int = 0
+    writes_skipped: int = 0
+    """Number of files not written because they already hold the parameter values"""
+    cache_hits: int = 0
+    """Number of files for which a parse could be skipped"""
+    succeeded: bool = False
+    changed: bool = False
+    """Whether the parameters differ from those before the operation; always True for the
+    first load"""
+
+
+@dataclass(frozen=True)
+class WriteCounts:
+    """Number of parameter files written and skipped since the start of the process"""
+
+    performed: int
+    skipped: int
+
+
+Observer = Callable[[OperationReport], None]
+
+_OBSERVERS: list[Observer] = []
+_ACTIVE_REPORT: ContextVar[
+    Optional[OperationReport]  # pylint: disable=consider-alternative-union-syntax
+] = ContextVar("_ACTIVE_REPORT", default=None)
+_NO_MEASUREMENT: AbstractContextManager[None] = nullcontext()
+_WRITE_COUNTS = {"performed": 0, "skipped": 0}
+_COUNTS_LOCK = Lock()
+"""Guards the counts, as files are read and written by several threads, also within
+one operation"""
+
+
+def add_observer(observer: Observer) -> None:
+    """Register a callable that receives an OperationReport after every load and update"""
+    if observer not in _OBSERVERS:
+        _OBSERVERS.append(observer)
+
+
+def remove_observer(observer: Observer) -> None:
+    """Unregister an observer that was added with add_observer"""
+    if observer in _OBSERVERS:
+        _OBSERVERS.remove(observer)
+
+
+def log_report(report: OperationReport) -> None:
+    """Observer that logs the report on level DEBUG"""
+    logger.opt(lazy=True).debug(
+        "{} of {} took {:.3f} ms ({}); read {} bytes from {} file(s), "
+        "wrote {} bytes to {} file(s), {} cache hit(s)",
+        report.operation.capitalize,
+        lambda: report.container,
+        lambda: report.seconds * 1e3,
+        lambda: ", ".join(
+            f"{phase.value} {secs * 1e3:.3f} ms"
+            for phase, secs in report.durations.items()
+        ),
+        lambda: report.bytes_read,
+        lambda: report.files_read,
+        lambda: report.bytes_written,
+        lambda: report.files_written,
+        lambda: report.cache_hits,
+    )
+
+
+def operation(container: str, name: str) -> AbstractContextManager[None]:
+    """Return a context manager that collects a report for the operation and hands it
+    to the observers; does nothing if there are no observers"""
+    if not _OBSERVERS:
+        return _NO_MEASUREMENT
+    return _report_operation(container, name)
+
+
+@contextmanager
+def _report_operation(container: str, name: str) -> Iterator[None]:
+    report = OperationReport(container, name)
+    token = _ACTIVE_REPORT.set(report)
+    start = perf_counter()
+    try:
+        yield
+        report.succeeded = True
+    finally:
+        report.seconds = perf_counter() - start
+        _ACTIVE_REPORT.reset(token)
+        for observer in list(_OBSERVERS):
+            try:
+                observer(report)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Observer {} failed", observer)
+
+
+def measure(phase: Phase) -> AbstractContextManager[None]:
+    """Return a context manager that adds its duration to the phase of the active
+    report; does nothing if no report is being collected"""
+    if (report := _ACTIVE_REPORT.get()) is None:
+        return _NO_MEASUREMENT
+    return _Measurement(report, phase)
+
+
+def count_read(nr_of_bytes: int) -> None:
+    """Add a file that has been read to the active report"""
+    if (report := _ACTIVE_REPORT.get()) is not None:
+        with _COUNTS_LOCK:
+            report.files_read += 1
+            report.bytes_read += nr_of_bytes
+
+
+def write_counts() -> WriteCounts:
+    """Return the number of parameter files written and skipped since the start of the
+    process; a write is skipped if the file already holds the parameter values"""
+    with _COUNTS_LOCK:
+        return WriteCounts(**_WRITE_COUNTS)
+
+
+def count_written(nr_of_bytes: int) -> None:
+    """Add a file that has been written to the write counts and the active report"""
+    with _COUNTS_LOCK:
+        _WRITE_COUNTS["performed"] += 1
+        if (report := _ACTIVE_REPORT.get()) is not None:
+            report.files_written += 1
+            report.bytes_written += nr_of_bytes
+
+
+def note_change(is_changed: Callable[[], bool]) -> None:
+    """Set in the active report whether the operation changed the parameters;
+    is_changed is only called if a report is being collected"""
+    if (report := _ACTIVE_REPORT.get()) is not None:
+        report.changed = is_changed()
+
+
+def count_skipped_write() -> None:
+    """Add a write that has been skipped to the write counts and the active report"""
+    with _COUNTS_LOCK:
+        _WRITE_COUNTS["skipped"] += 1
+        if (report := _ACTIVE_REPORT.get()) is not None:
+            report.writes_skipped += 1
+
+
+def count_cache_hit() -> None:
+    """Add a cache hit to the active report"""
+    if (report := _ACTIVE_REPORT.get()) is not None:
+        with _COUNTS_LOCK:
+            report.cache_hits += 1
+
+
+class _Measurement:
+    """Context manager that measures the duration of a phase"""
+
+    __slots__ = ("_report", "_phase", "_start")
+
+    def __init__(self, report: OperationReport, phase: Phase) -> None:
+        self._report = report
+        self._phase = phase
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = perf_counter()
+
+    def __exit__(self, *_: object) -> None:
+        seconds = perf_counter() - self._start
+        durations = self._report.durations
+        with _COUNTS_LOCK:
+            durations[self._phase] = durations.get(self._phase, 0.0) + seconds
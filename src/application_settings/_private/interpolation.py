@@ -0,0 +1,197 @@
+"""Resolution of references in parameter values: ${section.parameter} and ${env:VAR}.
+
+A string that consists of a single reference gets the referenced value, with its type; in
+other strings, references are replaced by the text of their value. $${ stands for ${.
+
+The strings with references and the order in which they have to be resolved, which is
+derived from their dependencies, are kept until the strings change. The value of a
+string is only evaluated again when the values that it references changed.
+"""
+
+import os
+import re
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Union
+
+_Key = Union[str, int]  # pylint: disable=consider-alternative-union-syntax
+_Path = tuple[_Key, ...]
+_Part = Union[str, tuple[str, ...]]  # pylint: disable=consider-alternative-union-syntax
+"""A literal text, or the dotted path of a reference split in names"""
+
+_ENV_PREFIX = "env:"
+_REFERENCE = re.compile(r"\$(\$?)\{([^{}]*)\}")
+_MISSING = object()
+
+
+class Interpolator:  # pylint: disable=too-few-public-methods
+    """Resolves the references in the data of a container, remembering what it resolved
+    in the previous call"""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._templates: dict[_Path, str] = {}
+        self._order: list[_Path] = []
+        self._values: dict[_Path, tuple[tuple[Any, ...], Any]] = {}
+
+    def resolve(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Return data with the references resolved; data itself is not changed
+
+        Raises:
+            ValueError: if a reference cannot be resolved or references are cyclic
+        """
+        # the data of the previous call is shared by threads that load the same config
+        with self._lock:
+            return self._resolve(data)
+
+    def _resolve(self, data: dict[str, Any]) -> dict[str, Any]:
+        templates: dict[_Path, str] = {}
+        _collect_templates(data, (), templates)
+        if templates != self._templates:
+            self._order = _resolution_order(templates)
+            self._templates = templates
+            self._values = {
+                path: value for path, value in self._values.items() if path in templates
+            }
+        if not templates:
+            return data
+        resolved: dict[str, Any] = dict(data)
+        copied: set[_Path] = {()}
+        for path in self._order:
+            parts = _parse(templates[path])
+            inputs = tuple(
+                part if isinstance(part, str) else _input(resolved, part, path)
+                for part in parts
+            )
+            if (known := self._values.get(path)) is not None and known[0] == inputs:
+                value = known[1]
+            else:
+                value = _evaluate(inputs, parts)
+                self._values[path] = (inputs, value)
+            _assign(resolved, path, value, copied)
+        return resolved
+
+
+def _collect_templates(value: Any, path: _Path, templates: dict[_Path, str]) -> None:
+    """Add the strings with references in value to templates, with their paths"""
+    if isinstance(value, str):
+        if "${" in value:
+            templates[path] = value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            _collect_templates(item, (*path, key), templates)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            _collect_templates(item, (*path, index), templates)
+
+
+@lru_cache(maxsize=1024)
+def _parse(template: str) -> tuple[_Part, ...]:
+    """Split template into literal texts and references"""
+    parts: list[_Part] = []
+    position = 0
+    for match in _REFERENCE.finditer(template):
+        if match.start() > position:
+            parts.append(template[position : match.start()])
+        if match.group(1):
+            parts.append("${" + match.group(2) + "}")
+        else:
+            parts.append(tuple(match.group(2).strip().split(".")))
+        position = match.end()
+    if position < len(template):
+        parts.append(template[position:])
+    return tuple(parts)
+
+
+def _resolution_order(templates: dict[_Path, str]) -> list[_Path]:
+    """Return the paths of the templates such that each comes after the templates it
+    references, directly or via a section
+
+    Raises:
+        ValueError: if the references are cyclic
+    """
+    dependencies = {
+        path: [
+            other
+            for part in _parse(template)
+            if not isinstance(part, str) and not _is_env(part)
+            for other in templates
+            if other[: len(part)] == part
+        ]
+        for path, template in templates.items()
+    }
+    order: list[_Path] = []
+    done: set[_Path] = set()
+    for start in templates:
+        if start in done:
+            continue
+        # depth-first, with the chain of templates being resolved on a stack
+        chain = [start]
+        pending = [iter(dependencies[start])]
+        while pending:
+            if (dependency := next(pending[-1], None)) is None:
+                done.add(path := chain.pop())
+                order.append(path)
+                pending.pop()
+            elif dependency in chain:
+                cycle = chain[chain.index(dependency) :] + [dependency]
+                raise ValueError(
+                    "Cyclic references: " + " -> ".join(_dotted(path) for path in cycle)
+                )
+            elif dependency not in done:
+                chain.append(dependency)
+                pending.append(iter(dependencies[dependency]))
+    return order
+
+
+def _input(data: dict[str, Any], reference: tuple[str, ...], path: _Path) -> Any:
+    """Return the value referenced from path
+
+    Raises:
+        ValueError: if there is no such value
+    """
+    if _is_env(reference):
+        name = ".".join(reference)[len(_ENV_PREFIX) :]
+        if (env_value := os.environ.get(name)) is None:
+            raise ValueError(
+                f"Environment variable {name}, referenced in {_dotted(path)}, is not set"
+            )
+        return env_value
+    value: Any = data
+    for name in reference:
+        if (
+            not isinstance(value, dict)
+            or (value := value.get(name, _MISSING)) is _MISSING
+        ):
+            raise ValueError(
+                f"Reference ${{{'.'.join(reference)}}} in {_dotted(path)} cannot be resolved"
+            )
+    return value
+
+
+def _evaluate(inputs: tuple[Any, ...], parts: tuple[_Part, ...]) -> Any:
+    """Return the value of a template given the values of its parts"""
+    if len(parts) == 1 and not isinstance(parts[0], str):
+        return inputs[0]
+    return "".join(value if isinstance(value, str) else str(value) for value in inputs)
+
+
+def _assign(data: dict[str, Any], path: _Path, value: Any, copied: set[_Path]) -> None:
+    """Set the value at path in data, copying the dicts and lists on the way that are
+    shared with the original data"""
+    container: Any = data
+    for depth, key in enumerate(path[:-1], start=1):
+        child = container[key]
+        if path[:depth] not in copied:
+            child = container[key] = child.copy()
+            copied.add(path[:depth])
+        container = child
+    container[path[-1]] = value
+
+
+def _is_env(reference: tuple[str, ...]) -> bool:
+    return reference[0].startswith(_ENV_PREFIX)
+
+
+def _dotted(path: _Path) -> str:
+    return ".".join(str(key) for key in path)
@@ -0,0 +1,109 @@
+"""Journal of the updates of a parameter file, stored as json lines next to that file."""
+
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from application_settings._private.file_operations_utils import (
+    _BINARY,
+    deep_update,
+    forget_states,
+    read_file,
+)
+from application_settings._private.instrumentation import count_written
+
+_NR_OF_RECORDS: dict[Path, int] = {}
+"""Number of records in the journal per parameter file, known after replay or append"""
+
+
+def journal_path(path: Path) -> Path:
+    """Return the path of the journal of the parameter file path"""
+    return path.with_name(f"{path.name}.journal")
+
+
+def replay(path: Path, data: dict[str, Any]) -> dict[str, Any]:
+    """Return data updated with the records in the journal of the parameter file path,
+    preceded by those of a compaction that has not finished"""
+    records = _read_records(journal_path(path))
+    _NR_OF_RECORDS[path] = len(records)
+    return deep_update(data, *_read_records(_compacting_path(path)), *records)
+
+
+def append(path: Path, record: dict[str, Any]) -> tuple[int, int]:
+    """Append record to the journal of the parameter file path and flush it to disk.
+
+    The record is written with a single append, so a crash leaves at most an incomplete
+    last line, which is discarded when the journal is read.
+    Returns the number of records and the number of bytes in the journal.
+    """
+    line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+    the_journal_path = journal_path(path)
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | _BINARY
+    try:
+        fd = os.open(the_journal_path, flags, 0o666)
+    except FileNotFoundError:
+        the_journal_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(the_journal_path, flags, 0o666)
+    try:
+        view = memoryview(line)
+        while view:
+            view = view[os.write(fd, view) :]
+        os.fsync(fd)
+        size = os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+    count_written(len(line))
+    nr_of_records = _NR_OF_RECORDS[path] = _NR_OF_RECORDS.get(path, 0) + 1
+    return nr_of_records, size
+
+
+def forget(path: Path) -> None:
+    """Forget the number of records in the journal of the parameter file path"""
+    _NR_OF_RECORDS.pop(path, None)
+
+
+def compact(path: Path, save: Callable[[Path, dict[str, Any]], None]) -> None:
+    """Fold the records of the journal into the parameter file path and remove the journal.
+
+    The journal is first moved aside, so records that other processes append meanwhile
+    go to a new journal. If the process stops before the moved journal is removed, its
+    records are applied again on the next load and folded by the next compaction, which
+    does not change the result.
+    """
+    compacting_path = _compacting_path(path)
+    # the records of a compaction that has not finished precede those of the journal
+    records = _read_records(compacting_path)
+    try:
+        os.replace(journal_path(path), compacting_path)
+    except FileNotFoundError:
+        pass
+    else:
+        records += _read_records(compacting_path)
+    if records:
+        save(path, deep_update({}, *records))
+    compacting_path.unlink(missing_ok=True)
+    forget_states(compacting_path)
+    _NR_OF_RECORDS[path] = 0
+    logger.info("Journal of {} compacted.", path)
+
+
+def _compacting_path(path: Path) -> Path:
+    """Return the path to which the journal of path is moved to be compacted"""
+    return path.with_name(f"{path.name}.journal.compacting")
+
+
+def _read_records(the_journal_path: Path) -> list[dict[str, Any]]:
+    """Return the records in the_journal_path; remove an incomplete last record"""
+    try:
+        raw = read_file(the_journal_path)
+    except FileNotFoundError:
+        return []
+    complete, _, incomplete = raw.rpartition(b"\n")
+    if incomplete:
+        logger.warning("Incomplete last record of {} discarded.", the_journal_path)
+        os.truncate(the_journal_path, len(raw) - len(incomplete))
+    return [json.loads(line) for line in complete.split(b"\n") if line]
@@ -0,0 +1,141 @@
+"""Client of a settings server, which serves the settings of many processes.
+
+Requests and responses are json arrays, sent in frames that start with their length as
+4 byte unsigned big-endian integer. A request is either ["get", name, key] or
+["update", name, key, changes]; a response holds per request {"ok": value} or
+{"error": message}. Several requests can be sent in one frame.
+"""
+
+import json
+import os
+import socket
+import struct
+from pathlib import Path
+from threading import Lock
+from typing import Any, Optional
+
+_HEADER = struct.Struct(">I")
+
+_SERVED: set[int] = set()
+"""Ids of the containers that are served by a server in this process"""
+
+
+def send_frame(connection: socket.socket, payload: bytes) -> None:
+    """Send payload as a single frame"""
+    connection.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def receive_frame(
+    connection: socket.socket,
+) -> Optional[bytes]:  # pylint: disable=consider-alternative-union-syntax
+    """Receive a frame and return its payload; None if the connection has been closed"""
+    if (header := _receive_exactly(connection, _HEADER.size)) is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    if (payload := _receive_exactly(connection, length)) is None:
+        raise ConnectionError("Connection closed in the middle of a frame")
+    return payload
+
+
+def is_served_here(container_id: int) -> bool:
+    """Return whether the container with container_id is served by this process"""
+    return container_id in _SERVED
+
+
+def get_client(socket_path: Path) -> "SettingsClient":
+    """Return the client for the server listening at socket_path"""
+    with _CLIENTS_LOCK:
+        if (the_client := _CLIENTS.get(socket_path)) is None:
+            the_client = _CLIENTS[socket_path] = SettingsClient(socket_path)
+        return the_client
+
+
+class SettingsClient:
+    """Sends requests to a settings server over pooled connections"""
+
+    def __init__(self, socket_path: Path) -> None:
+        self._socket_path = socket_path
+        self._idle: list[socket.socket] = []
+        self._lock = Lock()
+
+    def request(self, requests: list[list[Any]]) -> list[Any]:
+        """Send requests in a single frame and return the value per request
+
+        Raises:
+            ConnectionError: if the server cannot be reached
+            RuntimeError: if the server could not handle one of the requests
+        """
+        payload = json.dumps(requests, separators=(",", ":")).encode("utf-8")
+        while True:
+            connection, pooled = self._acquire()
+            try:
+                send_frame(connection, payload)
+                response = receive_frame(connection)
+            except OSError:
+                connection.close()
+                if pooled:
+                    # the server may have closed an idle connection; try a new one
+                    continue
+                raise
+            if response is None:
+                connection.close()
+                if pooled:
+                    continue
+                raise ConnectionError(f"Settings server {self._socket_path} hung up")
+            self._release(connection)
+            break
+        results = json.loads(response)
+        for result in results:
+            if "error" in result:
+                raise RuntimeError(f"Settings server: {result['error']}")
+        return [result["ok"] for result in results]
+
+    def close(self) -> None:
+        """Close the idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def _acquire(self) -> tuple[socket.socket, bool]:
+        """Return an idle connection, or a new one, and whether it was idle"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(str(self._socket_path))
+        except OSError:
+            connection.close()
+            raise
+        return connection, False
+
+    def _release(self, connection: socket.socket) -> None:
+        with self._lock:
+            self._idle.append(connection)
+
+
+def _receive_exactly(
+    connection: socket.socket, length: int
+) -> Optional[bytes]:  # pylint: disable=consider-alternative-union-syntax
+    chunks = []
+    remaining = length
+    while remaining > 0:
+        if not (chunk := connection.recv(min(remaining, 1024 * 1024))):
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+_CLIENTS: dict[Path, SettingsClient] = {}
+_CLIENTS_LOCK = Lock()
+
+
+def _forget_connections() -> None:
+    """A forked process must not use the connections of its parent"""
+    _CLIENTS.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_connections)
@@ -0,0 +1,162 @@
+"""Server that owns settings containers and serves them to other processes.
+
+Gets are answered from memory by the thread of the connection. Updates are applied by a
+single thread, in batches: the updates of a container that arrive while a batch is
+being applied are merged and saved together in the next batch.
+"""
+
+import json
+import os
+import socket
+import socketserver
+from collections.abc import Iterable
+from concurrent.futures import Future
+from pathlib import Path
+from queue import SimpleQueue
+from threading import Thread
+from typing import TYPE_CHECKING, Any, Optional, cast
+
+from loguru import logger
+
+from application_settings._private.file_operations_utils import deep_update
+from application_settings._private.settings_client import (
+    _SERVED,
+    receive_frame,
+    send_frame,
+)
+from application_settings.type_notation_helper import PathOrStr, StrOpt
+
+if TYPE_CHECKING:
+    from application_settings.settings_base import SettingsBase
+
+_Update = tuple[str, StrOpt, dict[str, Any], "Future[None]"]
+_UpdateOpt = Optional[_Update]  # pylint: disable=consider-alternative-union-syntax
+
+
+class SettingsServer:
+    """Serves the gets and updates of settings containers to other processes over a Unix
+    socket; the containers should have been given their file paths."""
+
+    def __init__(
+        self, socket_path: PathOrStr, containers: Iterable[type["SettingsBase"]]
+    ) -> None:
+        self._socket_path = Path(socket_path)
+        self._containers = {container.__name__: container for container in containers}
+        self._updates: SimpleQueue[_UpdateOpt] = SimpleQueue()
+        self._socket_path.unlink(missing_ok=True)
+        self._server = socketserver.ThreadingUnixStreamServer(
+            str(self._socket_path), self._handler_class(), bind_and_activate=False
+        )
+        # only the owner may connect, i.e., read and update the settings
+        umask = os.umask(0o177)
+        try:
+            self._server.server_bind()
+        finally:
+            os.umask(umask)
+        self._server.server_activate()
+        self._server.daemon_threads = True
+        self._updater = Thread(target=self._apply_updates, daemon=True)
+        _SERVED.update(id(container) for container in self._containers.values())
+
+    def serve_forever(self) -> None:
+        """Handle requests until shutdown() is called"""
+        self._updater.start()
+        logger.info("Serving settings at {}", self._socket_path)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._updates.put(None)
+            self._updater.join()
+
+    def shutdown(self) -> None:
+        """Stop serve_forever(), from another thread, and remove the socket"""
+        self._server.shutdown()
+        self._server.server_close()
+        self._socket_path.unlink(missing_ok=True)
+        _SERVED.difference_update(
+            id(container) for container in self._containers.values()
+        )
+
+    def _handler_class(self) -> type[socketserver.BaseRequestHandler]:
+        respond = self._respond
+
+        class _Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                connection: socket.socket = self.request
+                while (payload := receive_frame(connection)) is not None:
+                    send_frame(connection, respond(json.loads(payload)))
+
+        return _Handler
+
+    def _respond(self, requests: list[list[Any]]) -> bytes:
+        """Return the response to requests"""
+        results: list[Any] = []
+        for request in requests:
+            try:
+                operation, name, key, *arguments = request
+                container = self._containers[name]
+                if operation == "get":
+                    results.append(container.get(key=key).to_json())
+                elif operation == "update":
+                    future: Future[None] = Future()
+                    self._updates.put((name, key, arguments[0], future))
+                    results.append(future)
+                else:
+                    raise ValueError(f"Unknown operation {operation}")
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                results.append(exc)
+        return b"[" + b",".join(_result(result) for result in results) + b"]"
+
+    def _apply_updates(self) -> None:
+        """Apply the queued updates in batches, until None is queued"""
+        while (update := self._updates.get()) is not None:
+            batch = [update]
+            while not self._updates.empty():
+                if (update := self._updates.get()) is None:
+                    self._apply_batch(batch)
+                    return
+                batch.append(update)
+            self._apply_batch(batch)
+
+    def _apply_batch(self, batch: list[_Update]) -> None:
+        per_container: dict[tuple[str, StrOpt], list[_Update]] = {}
+        for update in batch:
+            per_container.setdefault((update[0], update[1]), []).append(update)
+        for (name, key), updates in per_container.items():
+            container = self._containers[name]
+            try:
+                container.update(
+                    deep_update({}, *(update[2] for update in updates)), key
+                )
+            except Exception:  # pylint: disable=broad-exception-caught
+                # find out which of the updates failed
+                for update in updates:
+                    _apply(container, update)
+            else:
+                for update in updates:
+                    update[3].set_result(None)
+
+
+def _apply(container: type["SettingsBase"], update: _Update) -> None:
+    """Apply a single update and set its result"""
+    try:
+        container.update(update[2], update[1])
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        update[3].set_exception(exc)
+    else:
+        update[3].set_result(None)
+
+
+def _result(result: Any) -> bytes:
+    """Return the json of the result of a request"""
+    if isinstance(result, Future):
+        try:
+            result.result()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            result = exc
+        else:
+            return b'{"ok":null}'
+    if isinstance(result, Exception):
+        logger.warning("Settings request failed: {}", result)
+        return json.dumps({"error": f"{type(result).__name__}: {result}"}).encode()
+    return b'{"ok":' + cast(bytes, result) + b"}"
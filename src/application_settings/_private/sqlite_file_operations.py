@@ -0,0 +1,125 @@
+"""Functions for storing dicts to and loading dicts from sqlite databases.
+
+Each parameter is a row, with as key its dotted path and as value its json
+representation; a parameter that holds a dict is a single row. An update only writes
+the rows of the parameters that are in the data, so processes that update different
+parameters do not overwrite each other.
+"""
+
+import json
+import sqlite3
+from collections.abc import Iterator
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Optional
+
+from loguru import logger
+
+from application_settings._private.instrumentation import (
+    Phase,
+    count_read,
+    count_written,
+    measure,
+)
+
+_TIMEOUT = 30.0
+"""Seconds to wait for a lock held by another connection"""
+_CREATE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS parameters "
+    "(key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+)
+_SELECT = "SELECT key, value FROM parameters"
+_DELETE_BELOW = "DELETE FROM parameters WHERE key > ? AND key < ?"
+_UPSERT = (
+    "INSERT INTO parameters (key, value) VALUES (?, ?) "
+    "ON CONFLICT (key) DO UPDATE SET value = excluded.value"
+)
+
+
+def load_sqlite(path: Path) -> dict[str, Any]:
+    """Load the parameters in the sqlite database given by path and return as dict
+
+    Raises:
+        FileNotFoundError: if path does not exist
+    """
+    data_stored: dict[str, Any] = {}
+    try:
+        with closing(_connect(path, "ro")) as connection:
+            rows = connection.execute(_SELECT).fetchall()
+    except sqlite3.OperationalError:
+        if _is_empty(path):
+            logger.warning("File {} does not exist or is empty.", path)
+            return data_stored
+        raise
+    with measure(Phase.PARSE):
+        for key, value in rows:
+            *section_names, name = key.split(".")
+            section = data_stored
+            for section_name in section_names:
+                section = section.setdefault(section_name, {})
+            section[name] = json.loads(value)
+    count_read(sum(len(key) + len(value) for key, value in rows))
+    return data_stored
+
+
+def save_sqlite(
+    path: Path,
+    data: dict[str, Any],
+    sections: Optional[  # pylint: disable=consider-alternative-union-syntax
+        dict[str, Any]
+    ] = None,
+) -> None:
+    """Update the sqlite database given by path with data, in a single transaction
+
+    sections holds the names of the sections in data, each with the names of its own
+    sections; the values of other names are stored as a single row. If sections is not
+    given, every non-empty dict in data is taken as a section.
+
+    Raises:
+        FileNotFoundError: if path does not exist
+    """
+    rows = [(key, json.dumps(value)) for key, value in _leaves(data, "", sections)]
+    with closing(_connect(path, "rw")) as connection:
+        with connection:
+            connection.execute(_CREATE_TABLE)
+            # rows below a parameter are left from when it was stored in parts
+            connection.executemany(
+                _DELETE_BELOW, [(f"{key}.", f"{key}/") for key, _ in rows]
+            )
+            connection.executemany(_UPSERT, rows)
+    count_written(sum(len(key) + len(value) for key, value in rows))
+
+
+def _connect(path: Path, mode: str) -> sqlite3.Connection:
+    if not path.is_file():
+        raise FileNotFoundError(f"Path {str(path)} is not a file.")
+    connection = sqlite3.connect(
+        f"{path.resolve().as_uri()}?mode={mode}", timeout=_TIMEOUT, uri=True
+    )
+    if mode == "rw":
+        # lets readers proceed while a process writes; a property of the database file
+        connection.execute("PRAGMA journal_mode=WAL")
+        # in WAL mode, this is safe against corruption and needs fewer syncs to disk
+        connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+def _is_empty(path: Path) -> bool:
+    return path.is_file() and path.stat().st_size == 0
+
+
+def _leaves(
+    data: dict[str, Any],
+    prefix: str,
+    sections: Optional[  # pylint: disable=consider-alternative-union-syntax
+        dict[str, Any]
+    ],
+) -> Iterator[tuple[str, Any]]:
+    """Yield the dotted path and value of each parameter in data"""
+    for key, value in data.items():
+        if sections is None and isinstance(value, dict) and value:
+            yield from _leaves(value, f"{prefix}{key}.", None)
+        elif sections is not None and key in sections and isinstance(value, dict):
+            yield from _leaves(value, f"{prefix}{key}.", sections[key])
+        else:
+            yield f"{prefix}{key}", value
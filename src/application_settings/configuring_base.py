@@ -1,13 +1,23 @@
 """Module for handling configuration."""
 
 import sys
-from typing import TypeVar
+from typing import Any, Optional, TypeVar
 
 from application_settings.container_base import ContainerBase
 from application_settings.container_section_base import ContainerSectionBase
 from application_settings.parameter_kind import ParameterKind
+from application_settings.type_notation_helper import PathOpt, StrOpt
 
 from ._private.file_operations import FileFormat
+from ._private.file_operations import load_fragments as _do_load_fragments
+from ._private.file_operations_utils import deep_update
+from ._private.instrumentation import Phase, measure
+from ._private.interpolation import Interpolator
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
 
 if sys.version_info >= (3, 12):
     from typing import override
@@ -41,3 +51,72 @@ class ConfigBase(ContainerBase):
     def default_file_format(cls) -> FileFormat:
         """Return the default file format"""
         return FileFormat.TOML
+
+    @classmethod
+    def fragments_folderpath(cls) -> PathOpt:
+        """Return the folder with fragment files, which are merged into the config file in
+        lexical order of their names; overwrite to return e.g. the folder config.d."""
+        return None
+
+    @classmethod
+    def interpolate(cls) -> bool:
+        """Return whether references to other parameters and to environment variables,
+        such as ${section.parameter} and ${env:VAR}, are resolved; overwrite to return
+        True to use them."""
+        return False
+
+    @override
+    @classmethod
+    def _resolves_references(cls) -> bool:
+        """References are resolved if interpolate() returns True"""
+        return cls.interpolate()
+
+    @override
+    @classmethod
+    def _forget_keyed(cls, key: str) -> None:
+        """Also drop the interpolator of the instance with key"""
+        super()._forget_keyed(key)
+        _INTERPOLATORS.pop((id(cls), key), None)
+
+    @override
+    @classmethod
+    def _validate_stored_json(
+        cls, throw_if_file_not_found: bool, key: StrOpt = None
+    ) -> Optional[Self]:  # pylint: disable=consider-alternative-union-syntax
+        """The fragments have to be merged before validation"""
+        if cls.fragments_folderpath() is not None:
+            return None
+        return super()._validate_stored_json(throw_if_file_not_found, key)
+
+    @override
+    @classmethod
+    def _get_saved_data(
+        cls, throw_if_file_not_found: bool = False, key: StrOpt = None
+    ) -> dict[str, Any]:
+        """Get the data stored in the config file, completed by _complete_data()"""
+        return cls._complete_data(
+            super()._get_saved_data(throw_if_file_not_found, key), key
+        )
+
+    @override
+    @classmethod
+    def _complete_data(
+        cls, data_stored: dict[str, Any], key: StrOpt = None
+    ) -> dict[str, Any]:
+        """Merge the fragments into the data, and resolve the references to other
+        parameters and to environment variables if interpolate() returns True"""
+        if (folder := cls.fragments_folderpath()) is not None:
+            data_stored = deep_update(data_stored, _do_load_fragments(folder))
+        if not cls.interpolate():
+            return data_stored
+        if (
+            interpolator := _INTERPOLATORS.get(interpolator_key := (id(cls), key))
+        ) is None:
+            interpolator = _INTERPOLATORS.setdefault(interpolator_key, Interpolator())
+        with measure(Phase.MERGE):
+            return interpolator.resolve(data_stored)
+
+
+_INTERPOLATORS: dict[tuple[int, StrOpt], Interpolator] = {}
+"""Per config class and key: the interpolator that resolves the references in its data;
+dropped together with the keyed instance"""
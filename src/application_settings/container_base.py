@@ -2,20 +2,46 @@
 
 import sys
 from abc import ABC, abstractmethod
-from dataclasses import asdict
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from difflib import get_close_matches
 from pathlib import Path
 from re import sub
-from typing import Any
+from threading import Event, Lock
+from time import perf_counter
+from typing import Any, Optional, TypeVar, cast
 
 from loguru import logger
-from pathvalidate import is_valid_filepath
+from pathvalidate import is_valid_filename, is_valid_filepath
+from pydantic import ValidationError
 
-from application_settings.container_section_base import ContainerSectionBase
-from application_settings.type_notation_helper import PathOpt, PathOrStr
+from application_settings.container_section_base import (
+    _ALL_CONTAINER_SECTION_SINGLETONS,
+    _OVERRIDES,
+    ContainerSectionBase,
+    _check_dataclass_decorator,
+    _differs,
+    _lookup_index,
+    _section_tree,
+    _update_section,
+)
+from application_settings.type_notation_helper import PathOpt, PathOrStr, StrOpt
 
-from ._private.file_operations import FileFormat
+from ._private.file_operations import (
+    FileFormat,
+)
+from ._private.file_operations import forget as _do_forget
 from ._private.file_operations import load as _do_load
+from ._private.file_operations import load_unparsed_json as _do_load_unparsed_json
 from ._private.file_operations import save as _do_save
+from ._private.file_operations import (
+    stores_parameters_separately as _stores_parameters_separately,
+)
+from ._private.http_source import FETCH_ERRORS
+from ._private.http_source import fetch as _do_fetch
+from ._private.instrumentation import Phase, measure, note_change, operation
 
 if sys.version_info >= (3, 11):
     from typing import Self
@@ -23,6 +49,14 @@ else:
     from typing_extensions import Self
 
 
+_JsonValidatorOpt = Optional[  # pylint: disable=consider-alternative-union-syntax
+    Callable[[bytes], Any]
+]
+
+
+ContainerBaseT = TypeVar("ContainerBaseT", bound="ContainerBase")
+
+
 class ContainerBase(ContainerSectionBase, ABC):
     """Base class for Config and Settings container classes"""
 
@@ -84,50 +118,338 @@ class ContainerBase(ContainerSectionBase, ABC):
         else:
             if cls._get() is not None:
                 logger.info(
-                    f"Filepath has been set the but file is not loaded into the {cls.kind_string()}."
+                    "Filepath has been set the but file is not loaded into the {}.",
+                    cls.kind_string(),
                 )
 
     @classmethod
-    def filepath(cls) -> PathOpt:
-        """Return the path for the file that holds the config / settings."""
-        return _ALL_PATHS.get(id(cls), cls.default_filepath())
+    def url(cls) -> StrOpt:
+        """Return the url to fetch the parameter file from, None to only use filepath().
+
+        The fetched file is stored in filepath(), which then serves as cache, e.g. when
+        the url cannot be reached at startup. Overwrite to load from a url.
+        """
+        return None
 
     @classmethod
-    def load(cls, throw_if_file_not_found: bool = False) -> Self:
-        """Create a new singleton, try to load parameter values from file.
+    def reload_from_url(cls, wait: float = 0.0) -> bool:
+        """Fetch the parameter file from url() and reload if it has changed; return whether
+        it has been reloaded.
+
+        If wait > 0, the server may hold the response until the file changes, for at
+        most wait seconds (long poll).
+
+        Raises:
+            OSError, HTTPException: if the file cannot be fetched
+            ValueError, ValidationError: if the fetched file cannot be loaded; the file
+                fetched before is then kept
+        """
+        if (url := cls.url()) is None or not (path := cls.filepath()):
+            return False
+        if not _do_fetch(url, path, wait, check=cls._check_fetched):
+            return False
+        token = _FETCHED.set(True)
+        try:
+            cls.load()
+        finally:
+            _FETCHED.reset(token)
+        return True
+
+    @classmethod
+    def watch_url(
+        cls, stop: Event, wait: float = 60.0, min_interval: float = 1.0
+    ) -> None:
+        """Reload whenever the parameter file at url() changes, until stop is set.
+
+        Each request is a long poll of at most wait seconds, and requests are sent at
+        most once per min_interval seconds. Failed requests and fetched files that cannot
+        be loaded are logged and retried.
+        """
+        while not stop.is_set():
+            start = perf_counter()
+            try:
+                cls.reload_from_url(wait)
+            except _URL_ERRORS as exc:
+                logger.warning("Could not reload from {}: {}", cls.url(), exc)
+            stop.wait(min_interval - (perf_counter() - start))
+
+    @classmethod
+    def filepath(cls, key: StrOpt = None) -> PathOpt:
+        """Return the path for the file that holds the config / settings, or the one that
+        holds those of the instance with the given key."""
+        if key is not None:
+            # "." and ".." are valid names, but not of a folder of its own
+            if key in (".", "..") or not is_valid_filename(key, platform="auto"):
+                raise ValueError(
+                    f"Given key: '{key}' is not valid in a path for this OS"
+                )
+            return cls.keyed_filepath(key)
+        if (cls_id := id(cls)) in _ALL_PATHS:
+            return _ALL_PATHS[cls_id]
+        return cls.default_filepath()
+
+    @classmethod
+    def keyed_filepath(cls, key: str) -> PathOpt:
+        """Return the path for the file of the instance with the given key.
+
+        E.g. ~/.example/tenant1/config.toml for key 'tenant1': the filename of filepath()
+        in a subfolder named key. Overwrite this method for another layout.
+        """
+        if path := cls.filepath():
+            return path.parent / key / path.name
+        return None
+
+    @classmethod
+    def max_keyed_instances(cls) -> int:
+        """Return the maximum number of keyed instances that are kept in memory; when more
+        are loaded, the least recently used one is dropped."""
+        return 1000
+
+    @classmethod
+    def get(cls, key: StrOpt = None) -> Self:
+        """Get the singleton, or the instance with the given key; if not existing, load it.
+
+        Within an override() context, the overridden singleton is returned.
+
+        Raises:
+            ValueError: if key cannot be used as the name of a folder
+        """
+        if key is not None:
+            return cls._get_loaded(key)
+        if (overrides := _OVERRIDES.get()) is not None and id(cls) in overrides:
+            return cast(Self, overrides[id(cls)])
+        # inlined cls._get(), this is the hot path
+        if (the_container := _ALL_CONTAINER_SECTION_SINGLETONS.get(id(cls))) is None:
+            return cls._get_with_implicit_load()
+        return cast(Self, the_container)
+
+    @classmethod
+    @contextmanager
+    def override(cls, changes: dict[str, Any]) -> Iterator[Self]:
+        """Context in which get() of the container and its sections return the parameters
+        with changes applied; yields the overridden container.
+
+        Nothing is stored or saved: other threads and contexts (e.g. asyncio tasks that
+        were started before) keep getting the singleton. Overrides can be nested.
+
+        Raises:
+            ValidationError: if a value in changes cannot be coerced into the parameter type
+        """
+        overridden = _update_section(cls.get(), changes)
+        overrides = dict(_OVERRIDES.get() or {})
+        overridden._register(overrides)  # pylint: disable=protected-access
+        token = _OVERRIDES.set(overrides)
+        try:
+            yield overridden
+        finally:
+            _OVERRIDES.reset(token)
+
+    @classmethod
+    def lookup(cls, path: str, key: StrOpt = None) -> Any:
+        """Return the value of the parameter or section with the dotted path, e.g.
+        'section1.field2', in get(key).
+
+        Paths are looked up in an index of all paths of the instance, which is built when
+        it is first needed.
+
+        Raises:
+            KeyError: if there is no parameter or section with that path
+        """
+        index = _lookup_index(cls.get(key))
+        try:
+            return index[path]
+        except KeyError:
+            raise _unknown_path(cls, path, index) from None
+
+    @classmethod
+    def lookup_many(cls, paths: Iterable[str], key: StrOpt = None) -> list[Any]:
+        """Return the values of the parameters or sections with the dotted paths, all from
+        the same instance get(key)
+
+        Raises:
+            KeyError: if there is no parameter or section with one of the paths
+        """
+        index = _lookup_index(cls.get(key))
+        try:
+            return [index[path] for path in paths]
+        except KeyError as exc:
+            raise _unknown_path(cls, exc.args[0], index) from None
+
+    @classmethod
+    def _get_loaded(cls, key: StrOpt = None) -> Self:
+        """Get the singleton, or the instance with key, regardless of overrides; if not
+        existing, load it."""
+        if key is None:
+            if (the_container := cls._get()) is None:
+                return cls._get_with_implicit_load()
+            return the_container
+        if (the_instance := _get_keyed(cls, key)) is None:
+            return cls._create_instance(key=key)
+        return the_instance
+
+    @classmethod
+    def load(cls, throw_if_file_not_found: bool = False, key: StrOpt = None) -> Self:
+        """Create a new singleton, or instance with the given key, try to load parameter values from file.
 
         Raises:
             FileNotFoundError: if throw_if_file_not_found == True and filepath() cannot be resolved
             TOMLDecodeError: if FileFormat == TOML and the file is not a valid toml document
             JSONDecodeError: if FileFormat == JSON and the file is not a valid json document
             ValidationError: if a parameter value in the file cannot be coerced into the specified parameter type
+            ValueError: if key cannot be used as the name of a folder
         """
-        return cls._create_instance(throw_if_file_not_found)
+        return cls._create_instance(throw_if_file_not_found, key)
 
     @classmethod
     def get_without_load(cls) -> None:
         """Get has been called on a section before a load was done; handle this."""
-        logger.warning(
-            f"{cls.kind_string()} {cls.__name__} accessed before data has been loaded; "
-            f"will try implicit loading with {cls.filepath()}."
+        logger.opt(lazy=True).warning(
+            "{} {} accessed before data has been loaded; "
+            "will try implicit loading with {}.",
+            cls.kind_string,
+            lambda: cls.__name__,
+            cls.filepath,
         )
 
     @classmethod
-    def _create_instance(cls, throw_if_file_not_found: bool = False) -> Self:
-        """Load stored data, instantiate the Container with it, store it in the singleton and return it."""
+    def _create_instance(
+        cls, throw_if_file_not_found: bool = False, key: StrOpt = None
+    ) -> Self:
+        """Load stored data, instantiate the Container with it, store it in the singleton (or
+        with key) and return it."""
+
+        with operation(cls.__name__, "load"):
+            return cls._register_instance(
+                cls._read_instance(throw_if_file_not_found, key), key
+            )
+
+    @classmethod
+    def _read_instance(
+        cls, throw_if_file_not_found: bool = False, key: StrOpt = None
+    ) -> Self:
+        """Load stored data and instantiate the Container with it, without storing it;
+        the first step of _create_instance()."""
+        if key is None and not _FETCHED.get():
+            cls._fetch_from_url()
+        previous = cls._get() if key is None else _get_keyed(cls, key)
+        if (
+            instance := cls._validate_stored_json(throw_if_file_not_found, key)
+        ) is None:
+            # get whatever is stored in the config/settings file
+            data_stored = cls._get_saved_data(throw_if_file_not_found, key)
+            # instantiate the Container with the stored data
+            with measure(Phase.VALIDATE):
+                instance = cls(**data_stored)
+        note_change(lambda: _differs(previous, instance))
+        return instance
+
+    @classmethod
+    def _register_instance(cls, instance: Self, key: StrOpt = None) -> Self:
+        """Store the instance that _read_instance() returned in the singleton (or with
+        key); the second step of _create_instance()."""
+        with measure(Phase.REGISTER):
+            if key is None:
+                instance._set()  # pylint: disable=protected-access
+            else:
+                instance._set_keyed(key)  # pylint: disable=protected-access
+        return instance
+
+    @classmethod
+    def _resolves_references(cls) -> bool:
+        """Return whether references in the parameter values are resolved when loading"""
+        return False
 
-        # get whatever is stored in the config/settings file
-        data_stored = cls._get_saved_data(throw_if_file_not_found)
-        # instantiate and store the Container with the stored data
-        return cls.set(data_stored)
+    @classmethod
+    def _fetch_from_url(cls) -> None:
+        """Update the parameter file with the one at url(), if any; if that fails, the
+        file serves as cache."""
+        if (url := cls.url()) is None or not (path := cls.filepath()):
+            return
+        try:
+            with measure(Phase.PARSE):
+                _do_fetch(url, path, check=cls._check_fetched)
+        except _URL_ERRORS as exc:
+            logger.warning("Could not fetch {}, using {}: {}", url, path, exc)
+
+    @classmethod
+    def _check_fetched(cls, path: Path) -> None:
+        """Raise if the parameter file path, fetched from url(), cannot be loaded"""
+        cls(**cls._complete_data(_do_load(cls.kind(), path, True)))
+
+    @classmethod
+    def _complete_data(  # pylint: disable=unused-argument
+        cls, data_stored: dict[str, Any], key: StrOpt = None
+    ) -> dict[str, Any]:
+        """Return the data stored in the parameter file of the singleton (or the instance
+        with key), completed for validation; overwrite to add e.g. data from other
+        sources."""
+        return data_stored
+
+    def _set_keyed(self, key: str) -> Self:
+        """Store the instance with key, dropping the least recently used if needed."""
+        _check_dataclass_decorator(self)
+        with _KEYED_INSTANCES_LOCK:
+            instances = _KEYED_INSTANCES.setdefault(id(self.__class__), OrderedDict())
+            instances[key] = self
+            instances.move_to_end(key)
+            dropped = [
+                instances.popitem(last=False)[0]
+                for _ in range(len(instances) - self.max_keyed_instances())
+            ]
+        for dropped_key in dropped:
+            self._forget_keyed(dropped_key)
+        return self
+
+    @classmethod
+    def _forget_keyed(cls, key: str) -> None:
+        """Drop what is kept for the instance with key, which is no longer kept in memory;
+        overwrite to drop more, calling super()."""
+        if path := cls.filepath(key):
+            _do_forget(path)
+
+    @classmethod
+    def _validate_stored_json(
+        cls, throw_if_file_not_found: bool, key: StrOpt = None
+    ) -> Optional[Self]:  # pylint: disable=consider-alternative-union-syntax
+        """Instantiate the Container straight from the json document in the parameter file,
+        without building an intermediate dict; return None if that is not possible."""
+        if (validate_json := _json_validator(cls)) is None or (
+            raw := _do_load_unparsed_json(
+                cls.kind(),
+                cls.filepath(key),
+                throw_if_file_not_found,
+                cls._resolves_references(),
+            )
+        ) is None:
+            return None
+        try:
+            with measure(Phase.VALIDATE):
+                return cast(Self, validate_json(raw))
+        except ValidationError as exc:
+            if any(error["type"] == "json_invalid" for error in exc.errors()):
+                # let the json parser raise the error that load() documents
+                return None
+            raise
 
-    def _save(self) -> Self:
-        """Private method to save the singleton to file."""
-        if path := self.filepath():
-            path.parent.mkdir(parents=True, exist_ok=True)
-            # in self._set(), which normally is always executed, we ensured that
-            # self is a dataclass instance
-            _do_save(path, asdict(self))  # type: ignore[call-overload]
+    def _save(
+        self,
+        changes: Optional[  # pylint: disable=consider-alternative-union-syntax
+            dict[str, Any]
+        ] = None,
+        key: StrOpt = None,
+    ) -> Self:
+        """Private method to save the singleton, or the instance with key, to file; changes,
+        if given, holds the values that differ from what is stored."""
+        if path := self.filepath(key):
+            with measure(Phase.SAVE):
+                if _stores_parameters_separately(path):
+                    _do_save(
+                        path,
+                        self.to_dict() if changes is None else changes,
+                        _section_tree(type(self)),
+                    )
+                else:
+                    _do_save(path, self.to_dict())
         else:
             # This situation can occur if no valid path was given as an argument, and
             # the default path is set to None.
@@ -137,9 +459,56 @@ class ContainerBase(ContainerSectionBase, ABC):
         return self
 
     @classmethod
-    def _get_saved_data(cls, throw_if_file_not_found: bool = False) -> dict[str, Any]:
+    def _get_saved_data(
+        cls, throw_if_file_not_found: bool = False, key: StrOpt = None
+    ) -> dict[str, Any]:
         """Get the data stored in the parameter file"""
-        return _do_load(cls.kind(), cls.filepath(), throw_if_file_not_found)
+        return _do_load(cls.kind(), cls.filepath(key), throw_if_file_not_found)
+
+
+def _unknown_path(
+    container: type[ContainerBase], path: str, index: dict[str, Any]
+) -> KeyError:
+    """Return the error for a path that is not in the index of container"""
+    message = f"{container.__name__} has no parameter or section '{path}'"
+    if close_matches := get_close_matches(path, index, n=3):
+        message += (
+            f"; did you mean {', '.join(repr(match) for match in close_matches)}?"
+        )
+    return KeyError(message)
+
+
+def _get_keyed(
+    cls: type[ContainerBaseT], key: str
+) -> Optional[ContainerBaseT]:  # pylint: disable=consider-alternative-union-syntax
+    """Return the instance of cls with key, if in memory, and mark it as recently used."""
+    with _KEYED_INSTANCES_LOCK:
+        if (instances := _KEYED_INSTANCES.get(id(cls))) is None or (
+            the_instance := instances.get(key)
+        ) is None:
+            return None
+        instances.move_to_end(key)
+        return cast(ContainerBaseT, the_instance)
+
+
+def _json_validator(cls: type[ContainerBase]) -> _JsonValidatorOpt:
+    """Return the function that validates a json document into an instance of cls, if cls
+    is a pydantic dataclass (a subclass of one is not, unless decorated itself)"""
+    if (cls_id := id(cls)) not in _JSON_VALIDATORS:
+        validator = cls.__dict__.get("__pydantic_validator__")
+        _JSON_VALIDATORS[cls_id] = (
+            validator.validate_json if validator is not None else None
+        )
+    return _JSON_VALIDATORS[cls_id]
 
 
 _ALL_PATHS: dict[int, PathOpt] = {}
+_FETCHED: ContextVar[bool] = ContextVar("_FETCHED", default=False)
+"""Whether the parameter file has just been fetched from its url"""
+_URL_ERRORS = (*FETCH_ERRORS, ValueError)
+"""Exceptions if the parameter file cannot be fetched, or the fetched file cannot be
+loaded (ValidationError and the errors of the parsers are ValueErrors)"""
+_KEYED_INSTANCES: dict[int, OrderedDict[str, ContainerBase]] = {}
+"""Per class: the instances with a key, from least to most recently used"""
+_KEYED_INSTANCES_LOCK = Lock()
+_JSON_VALIDATORS: dict[int, _JsonValidatorOpt] = {}
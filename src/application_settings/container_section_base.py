@@ -2,11 +2,26 @@
 
 import sys
 from abc import ABC, abstractmethod
-from dataclasses import is_dataclass
-from typing import Any, Optional, cast
+from collections.abc import Callable
+from concurrent.futures import Future
+from contextvars import ContextVar
+from copy import deepcopy
+from dataclasses import asdict, fields, is_dataclass, replace
+from hashlib import blake2b
+from threading import Lock, get_ident
+from typing import Any, Optional, TypeVar, cast
 
 from loguru import logger
+from pydantic_core import to_json
 
+from application_settings._private.field_validation import (
+    copy_with,
+    is_field,
+    validate_field,
+    validates_per_field,
+)
+from application_settings._private.file_operations_utils import deep_update
+from application_settings._private.instrumentation import Phase, measure
 from application_settings.parameter_kind import ParameterKind, ParameterKindStr
 
 if sys.version_info >= (3, 11):
@@ -15,6 +30,9 @@ else:
     from typing_extensions import Self
 
 
+ContainerSectionT = TypeVar("ContainerSectionT", bound="ContainerSectionBase")
+
+
 class ContainerSectionBase(ABC):
     """Base class for all ContainerSection classes"""
 
@@ -30,14 +48,50 @@ class ContainerSectionBase(ABC):
 
     @classmethod
     def get(cls) -> Self:
-        """Get the singleton; if not existing, create it. Loading from file only done for a container."""
+        """Get the singleton; if not existing, create it. Loading from file only done for a container.
 
-        if (_the_container_or_none := cls._get()) is None:
+        Within an override() context of the container, the overridden section is returned.
+        """
+
+        if (overrides := _OVERRIDES.get()) is not None and id(cls) in overrides:
+            return cast(Self, overrides[id(cls)])
+        # inlined cls._get(), this is the hot path
+        if (
+            _the_container_or_none := _ALL_CONTAINER_SECTION_SINGLETONS.get(id(cls))
+        ) is None:
             # no config section has been made yet
+            return cls._get_with_implicit_load()
+        return cast(Self, _the_container_or_none)
+
+    @classmethod
+    def _get_with_implicit_load(cls) -> Self:
+        """Instantiate the singleton; threads that call get() meanwhile wait for and
+        receive the result (or the exception) of this single instantiation."""
+        with _IMPLICIT_LOADS_LOCK:
+            if (the_container := cls._get()) is not None:
+                return the_container
+            if (in_flight := _IMPLICIT_LOADS.get(id(cls))) is None:
+                future: Future[ContainerSectionBase] = Future()
+                _IMPLICIT_LOADS[id(cls)] = (future, get_ident())
+        if in_flight is not None:
+            if in_flight[1] != get_ident():
+                return cast(Self, in_flight[0].result())
+            # a reentrant call from the thread that is instantiating, cannot wait
             cls.get_without_load()
-            # so let's instantiate one and keep it in the global store
             return cls._create_instance()
-        return _the_container_or_none
+        try:
+            cls.get_without_load()
+            # so let's instantiate one and keep it in the global store
+            the_container = cls._create_instance()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(the_container)
+            return the_container
+        finally:
+            with _IMPLICIT_LOADS_LOCK:
+                del _IMPLICIT_LOADS[id(cls)]
 
     @classmethod
     def get_without_load(cls) -> None:
@@ -45,14 +99,19 @@ class ContainerSectionBase(ABC):
         # get() is called on a Section but the application
         # has not yet created or loaded a config.
         logger.warning(
-            f"{cls.kind_string()} section {cls.__name__} accessed before data has been loaded; "
-            f"will try to load via command line parameter '--{cls.__name__}_file'"
+            "{kind} section {name} accessed before data has been loaded; "
+            "will try to load via command line parameter '--{name}_file'",
+            kind=cls.kind_string(),
+            name=cls.__name__,
         )
 
     @classmethod
     def set(cls, data: dict[str, Any]) -> Self:
         """Create a new dataclass instance using data and set the singleton."""
-        return cls(**data)._set()
+        with measure(Phase.VALIDATE):
+            instance = cls(**data)
+        with measure(Phase.REGISTER):
+            return instance._set()
 
     @classmethod
     def _get(
@@ -70,20 +129,292 @@ class ContainerSectionBase(ABC):
         """Create a new ContainerSection with default values. Likely that this is wrong."""
         return cls.set({})
 
+    def to_dict(self) -> dict[str, Any]:
+        """Return the parameters as a nested dict, like dataclasses.asdict() does.
+
+        The dict is computed once per instance and subsections contribute their own
+        cached dict, so after an update only the changed sections are exported again.
+        The dict is shared between the calls; do not modify it.
+        """
+        if (exported := self.__dict__.get(_DICT_CACHE)) is None:
+            exported = self.__dict__[_DICT_CACHE] = {
+                field.name: _export_value(getattr(self, field.name))
+                for field in fields(self)  # type: ignore[arg-type]
+            }
+        return cast(dict[str, Any], exported)
+
+    def to_json(self) -> bytes:
+        """Return the parameters as compact json, computed once per instance.
+
+        Like to_dict(), subsections contribute their own cached json.
+        """
+        if (exported := self.__dict__.get(_JSON_CACHE)) is None:
+            members = [
+                to_json(field.name)
+                + b":"
+                + (
+                    value.to_json()
+                    if isinstance(
+                        value := getattr(self, field.name), ContainerSectionBase
+                    )
+                    else to_json(value)
+                )
+                for field in fields(self)  # type: ignore[arg-type]
+            ]
+            exported = self.__dict__[_JSON_CACHE] = b"{" + b",".join(members) + b"}"
+        return cast(bytes, exported)
+
+    def fingerprint(self) -> str:
+        """Return a hash of the parameter values, as hexadecimal string.
+
+        Instances with equal parameter values have the same fingerprint, also in other
+        processes: the members of sets are sorted, as their order differs between
+        processes, and so are the items of dicts, as dicts that only differ in their
+        order are equal. It is computed once per instance, from the fingerprints of the
+        subsections, so after an update only those of the changed sections are computed.
+        """
+        if (digest := self.__dict__.get(_FINGERPRINT_CACHE)) is None:
+            hasher = blake2b(digest_size=16)
+            for field in fields(self):  # type: ignore[arg-type]
+                hasher.update(to_json(field.name))
+                if isinstance(value := getattr(self, field.name), ContainerSectionBase):
+                    hasher.update(b"=" + value.fingerprint().encode() + b";")
+                else:
+                    hasher.update(b":" + _fingerprint_json(value) + b";")
+            digest = self.__dict__[_FINGERPRINT_CACHE] = hasher.hexdigest()
+        return cast(str, digest)
+
+    @classmethod
+    def subscribe(cls, callback: Callable[[Self], None]) -> None:
+        """Register callback, to be called with the new singleton of this class when a
+        reload or update has changed its parameter values."""
+        subscribers = _SUBSCRIBERS.setdefault(id(cls), [])
+        if callback not in subscribers:
+            subscribers.append(callback)
+
+    @classmethod
+    def unsubscribe(cls, callback: Callable[[Self], None]) -> None:
+        """Unregister a callback that was registered with subscribe"""
+        if callback in (subscribers := _SUBSCRIBERS.get(id(cls), [])):
+            subscribers.remove(callback)
+
     def _set(self) -> Self:
-        """Store the singleton."""
+        """Store the singleton; notify the subscribers of the sections that changed."""
+        previous = (
+            _ALL_CONTAINER_SECTION_SINGLETONS.get(id(self.__class__))
+            if _SUBSCRIBERS
+            else None
+        )
+        self._register(_ALL_CONTAINER_SECTION_SINGLETONS)
+        if previous is not None:
+            _notify_subscribers(previous, self)
+        return self
+
+    def _register(self, registry: dict[int, "ContainerSectionBase"]) -> Self:
+        """Store self and its subsections in registry."""
         _check_dataclass_decorator(self)
-        _ALL_CONTAINER_SECTION_SINGLETONS[id(self.__class__)] = self
+        registry[id(self.__class__)] = self
         subsections = [
             attr
             for attr in vars(self).values()
             if isinstance(attr, ContainerSectionBase)
         ]
         for subsec in subsections:
-            subsec._set()  # pylint: disable=protected-access
+            subsec._register(registry)  # pylint: disable=protected-access
         return self
 
 
+def _update_section(
+    the_section: ContainerSectionT, changes: dict[str, Any]
+) -> ContainerSectionT:
+    """Update parameters and sections with data specified in changes
+
+    Only the changed fields are validated; the values of the other fields, including
+    unchanged subsections, are taken over from the_section. A change of a subsection
+    is merged with the current values of that subsection.
+    """
+    if not validates_per_field(section_class := type(the_section)):
+        # the whole section is validated; the changes of a subsection are merged with
+        # its current values first, as they are when validating per field.
+        # in the_section._set(), which normally is always executed, we ensured that
+        # the_section is a dataclass instance and hence we can ignore type errors
+        return replace(  # type: ignore[type-var]
+            the_section,
+            **{
+                name: (
+                    deep_update(current.to_dict(), value)
+                    if isinstance(value, dict)
+                    and isinstance(
+                        current := getattr(the_section, name, None),
+                        ContainerSectionBase,
+                    )
+                    else value
+                )
+                for name, value in changes.items()
+            },
+        )
+    values: dict[str, Any] = {}
+    for name, value in changes.items():
+        if not is_field(section_class, name):
+            continue  # ignored, like by the dataclass initialization
+        if isinstance(value, dict) and isinstance(
+            current := getattr(the_section, name), ContainerSectionBase
+        ):
+            values[name] = _update_section(current, value)
+        else:
+            values[name] = validate_field(section_class, name, value)
+    updated = copy_with(the_section, values)
+    # the exports of the_section do not hold for the copy
+    updated.__dict__.pop(_DICT_CACHE, None)
+    updated.__dict__.pop(_JSON_CACHE, None)
+    updated.__dict__.pop(_FINGERPRINT_CACHE, None)
+    updated.__dict__.pop(_INDEX_CACHE, None)
+    return cast(ContainerSectionT, updated)
+
+
+def changed_paths(
+    previous: ContainerSectionBase, current: ContainerSectionBase
+) -> list[str]:
+    """Return the dotted paths of the parameters of which the value differs between
+    previous and current, e.g. ['section1.field2'].
+
+    Subsections that previous and current share, as after an update, are skipped.
+    """
+    paths: list[str] = []
+    _compare(previous, current, "", paths, [])
+    return paths
+
+
+def _compare(
+    previous: Any,
+    current: ContainerSectionBase,
+    prefix: str,
+    paths: list[str],
+    sections: list[ContainerSectionBase],
+) -> bool:
+    """Return whether current differs from previous; add the dotted paths of the changed
+    parameters to paths and the changed (sub)sections of current to sections"""
+    if previous is current or (
+        (fingerprint := previous.__dict__.get(_FINGERPRINT_CACHE)) is not None
+        and fingerprint == current.__dict__.get(_FINGERPRINT_CACHE)
+    ):
+        return False
+    changed = False
+    for field in fields(current):  # type: ignore[arg-type]
+        value = getattr(current, field.name)
+        previous_value = getattr(previous, field.name, _MISSING)
+        if value is previous_value:
+            continue
+        if isinstance(value, ContainerSectionBase) and type(previous_value) is type(
+            value
+        ):
+            if _compare(
+                previous_value, value, f"{prefix}{field.name}.", paths, sections
+            ):
+                changed = True
+        elif value != previous_value:
+            paths.append(f"{prefix}{field.name}")
+            changed = True
+    if changed:
+        sections.append(current)
+    return changed
+
+
+def _notify_subscribers(
+    previous: ContainerSectionBase, current: ContainerSectionBase
+) -> None:
+    """Call the subscribers of the sections in current that differ from previous"""
+    changed_sections: list[ContainerSectionBase] = []
+    _compare(previous, current, "", [], changed_sections)
+    for section in changed_sections:
+        for callback in list(_SUBSCRIBERS.get(id(section.__class__), ())):
+            try:
+                callback(section)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception(
+                    "Subscriber {} of {} failed", callback, section.__class__.__name__
+                )
+
+
+def _differs(
+    previous: Optional[  # pylint: disable=consider-alternative-union-syntax
+        ContainerSectionBase
+    ],
+    current: ContainerSectionBase,
+) -> bool:
+    """Return whether the parameter values of current differ from those of previous"""
+    return previous is not current and (
+        previous is None or previous.fingerprint() != current.fingerprint()
+    )
+
+
+def _section_tree(cls: type[ContainerSectionBase]) -> dict[str, Any]:
+    """Return the names of the subsections of cls, each with those of its own
+    subsections"""
+    return {
+        name: _section_tree(annotation)
+        for name, field_info in cls.__pydantic_fields__.items()  # type: ignore[attr-defined]
+        if isinstance(annotation := field_info.annotation, type)
+        and issubclass(annotation, ContainerSectionBase)
+    }
+
+
+def _lookup_index(the_section: ContainerSectionBase) -> dict[str, Any]:
+    """Return the values of the parameters and subsections of the_section by dotted path;
+    computed once per instance. The index is shared, do not modify it."""
+    if (index := the_section.__dict__.get(_INDEX_CACHE)) is None:
+        index = the_section.__dict__[_INDEX_CACHE] = {}
+        _add_to_index(the_section, "", index)
+    return cast(dict[str, Any], index)
+
+
+def _add_to_index(
+    the_section: ContainerSectionBase, prefix: str, index: dict[str, Any]
+) -> None:
+    for field in fields(the_section):  # type: ignore[arg-type]
+        index[path := f"{prefix}{field.name}"] = value = getattr(
+            the_section, field.name
+        )
+        if isinstance(value, ContainerSectionBase):
+            _add_to_index(value, f"{path}.", index)
+
+
+def _fingerprint_json(value: Any) -> bytes:
+    """Return the json of value, with the members of its sets and the items of its dicts
+    in sorted order"""
+    if isinstance(value, (set, frozenset)):
+        return (
+            b"["
+            + b",".join(sorted(_fingerprint_json(member) for member in value))
+            + b"]"
+        )
+    if isinstance(value, (list, tuple)) and any(
+        isinstance(item, _CONTAINER_TYPES) for item in value
+    ):
+        return b"[" + b",".join(_fingerprint_json(item) for item in value) + b"]"
+    if isinstance(value, dict):
+        return (
+            b"{"
+            + b",".join(
+                sorted(
+                    to_json(str(key)) + b":" + _fingerprint_json(item)
+                    for key, item in value.items()
+                )
+            )
+            + b"}"
+        )
+    return to_json(value)
+
+
+def _export_value(value: Any) -> Any:
+    """Return value as it is included in to_dict()"""
+    if isinstance(value, ContainerSectionBase):
+        return value.to_dict()
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    return deepcopy(value)
+
+
 def _check_dataclass_decorator(obj: Any) -> None:
     if not (is_dataclass(obj)):
         raise TypeError(
@@ -102,3 +433,22 @@ def _check_dataclass_decorator(obj: Any) -> None:
 
 
 _ALL_CONTAINER_SECTION_SINGLETONS: dict[int, ContainerSectionBase] = {}
+_SUBSCRIBERS: dict[int, list[Callable[[Any], None]]] = {}
+"""Per class: the callbacks to call when its singleton has changed"""
+_MISSING = object()
+_DICT_CACHE = "_to_dict_cache"
+_JSON_CACHE = "_to_json_cache"
+_FINGERPRINT_CACHE = "_fingerprint_cache"
+_INDEX_CACHE = "_lookup_index_cache"
+"""Keys in the __dict__ of an instance that hold what is computed from its fields"""
+_CONTAINER_TYPES = (set, frozenset, list, tuple, dict)
+"""Types of values that may hold a set or a dict"""
+_OVERRIDES: ContextVar[
+    Optional[  # pylint: disable=consider-alternative-union-syntax
+        dict[int, ContainerSectionBase]
+    ]
+] = ContextVar("_OVERRIDES", default=None)
+"""Per class: the section that get() returns instead of the singleton in this context"""
+_IMPLICIT_LOADS: dict[int, tuple[Future[ContainerSectionBase], int]] = {}
+"""Per class: the result of the implicit load in progress and the id of its thread"""
+_IMPLICIT_LOADS_LOCK = Lock()
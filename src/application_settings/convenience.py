@@ -4,16 +4,33 @@ import importlib
 import importlib.util
 import sys
 from argparse import ArgumentParser
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import is_dataclass
+from inspect import isabstract
 from logging import Formatter, Handler, LogRecord, getLogger
 from pathlib import Path
-from typing import Union, cast
+from time import perf_counter
+from typing import Any, Optional, Union, cast
 
 from loguru import logger
 
-from application_settings._private.file_operations import get_container_from_file
+from application_settings._private.file_operations import (
+    get_container_from_file,
+    parse_files_once,
+)
+from application_settings._private.instrumentation import operation
+from application_settings._private.settings_client import SettingsClient
 from application_settings.configuring_base import ConfigBase, ConfigT
+from application_settings.container_base import ContainerBase
 from application_settings.parameter_kind import ParameterKind
-from application_settings.settings_base import SettingsBase, SettingsT
+from application_settings.settings_base import (
+    SettingsBase,
+    SettingsT,
+    _changed_values,
+    _client,
+)
 from application_settings.type_notation_helper import ModuleTypeOpt
 
 
@@ -22,9 +39,11 @@ def _get_module_from_file(qualified_classname: str) -> ModuleTypeOpt:
     module_name = components[-2]
     filename = "/".join(components[:-1])
     file_path = Path.cwd() / f"{filename}.py"
-    logger.debug(f"Trying to load {qualified_classname} from {file_path}")
+    logger.debug("Trying to load {} from {}", qualified_classname, file_path)
     if not (spec := importlib.util.spec_from_file_location(module_name, file_path)):
-        logger.error(f"Unable to find module spec {module_name} with path {file_path}.")
+        logger.error(
+            "Unable to find module spec {} with path {}.", module_name, file_path
+        )
         return None
     module = importlib.util.module_from_spec(spec)
     sys.modules[module_name] = module
@@ -37,13 +56,15 @@ def _get_module(qualified_classname: str) -> ModuleTypeOpt:
     components = qualified_classname.split(".")
     if len(components) < 2:
         logger.error(
-            f"Unable to import {qualified_classname}: no package / module name provided."
+            "Unable to import {}: no package / module name provided.",
+            qualified_classname,
         )
         return None
     if components[0] == "":
         # relative import, no package
         logger.warning(
-            f"{qualified_classname}: attempted relative import with no known parent package. Will try to load file, but this may fail."
+            "{}: attempted relative import with no known parent package. Will try to load file, but this may fail.",
+            qualified_classname,
         )
         if not (module := _get_module_from_file(".".join(components[1:]))):
             return None
@@ -51,45 +72,54 @@ def _get_module(qualified_classname: str) -> ModuleTypeOpt:
         try:
             module = importlib.import_module(".".join(components[:-1]))
         except ModuleNotFoundError:
-            logger.error(f"Module {'.'.join(components[:-1])} not found.")
+            logger.error("Module {} not found.", ".".join(components[:-1]))
             return None
     return module
 
 
-def _get_config_class(
-    qualified_classname: str,
-) -> Union[type[ConfigT], None]:  # pylint: disable=consider-alternative-union-syntax
-    if not (module := _get_module(qualified_classname)):
-        return None
-    components = qualified_classname.split(".")
-    if not (the_class := getattr(module, components[-1], None)):
+def _get_container_class(  # pylint: disable=consider-alternative-union-syntax
+    qualified_classname: str, base_class: type[ContainerBase]
+) -> Union[type[ContainerBase], None]:
+    if not (the_class := _RESOLVED_CLASSES.get(qualified_classname)):
+        if not (module := _get_module(qualified_classname)):
+            return None
+        components = qualified_classname.split(".")
+        if not (the_class := getattr(module, components[-1], None)):
+            logger.error(
+                "No class {} found in module {}",
+                components[-1],
+                ".".join(components[:-1]),
+            )
+            return None
+        logger.debug("Class {} found", components[-1])
+    if not issubclass(the_class, base_class):
         logger.error(
-            f"No class {components[-1]} found in module {'.'.join(components[:-1])}"
+            "Class {} is not a subclass of {}",
+            qualified_classname.split(".")[-1],
+            base_class.__name__,
         )
         return None
-    if not issubclass(the_class, ConfigBase):
-        logger.error(f"Class {components[-1]} is not a subclass of ConfigBase")
-        return None
-    logger.debug(f"Class {components[-1]} found")
-    return cast(type[ConfigT], the_class)
+    _RESOLVED_CLASSES[qualified_classname] = the_class
+    return the_class
+
+
+def _get_config_class(
+    qualified_classname: str,
+) -> Union[type[ConfigT], None]:  # pylint: disable=consider-alternative-union-syntax
+    if the_class := _get_container_class(qualified_classname, ConfigBase):
+        return cast(type[ConfigT], the_class)
+    return None
 
 
 def _get_settings_class(
     qualified_classname: str,
 ) -> Union[type[SettingsT], None]:  # pylint: disable=consider-alternative-union-syntax
-    if not (module := _get_module(qualified_classname)):
-        return None
-    components = qualified_classname.split(".")
-    if not (the_class := getattr(module, components[-1], None)):
-        logger.error(
-            f"No class {components[-1]} found in module {'.'.join(components[:-1])}"
-        )
-        return None
-    if not issubclass(the_class, SettingsBase):
-        logger.error(f"Class {components[-1]} is not a subclass of SettingsBase")
-        return None
-    logger.debug(f"Class {components[-1]} found")
-    return cast(type[SettingsT], the_class)
+    if the_class := _get_container_class(qualified_classname, SettingsBase):
+        return cast(type[SettingsT], the_class)
+    return None
+
+
+_RESOLVED_CLASSES: dict[str, type[ContainerBase]] = {}
 
 
 def config_filepath_from_cli(
@@ -186,31 +216,166 @@ def _parameters_filepath_from_cli(  # pylint: disable=too-many-arguments,too-man
     )
     args, _ = parser.parse_known_args()
     if cmdline_path := getattr(args, long_option[2:], None):
-        universal_cmdline_path = Path(cmdline_path[0])
-        if config_class == ConfigBase:
-            config_classname = get_container_from_file(
-                ParameterKind.CONFIG, universal_cmdline_path, True
+        # the file that is read to find the container class is loaded without parsing it
+        # again; resolved, as set_filepath() does, so both use the same path
+        with parse_files_once():
+            _set_filepaths_from_cli(
+                config_class, settings_class, Path(cmdline_path[0]).resolve(), load
             )
-            if not (config_class := _get_config_class(config_classname)):
-                raise ValueError(f"Unable to import {config_classname}")
-        if settings_class == SettingsBase:
-            settings_classname = get_container_from_file(
-                ParameterKind.SETTINGS, universal_cmdline_path, True
-            )
-            if not (settings_class := _get_settings_class(settings_classname)):
-                raise ValueError(f"Unable to import {settings_classname}")
-        if config_class and settings_class:
-            config_class.set_filepath(
-                universal_cmdline_path / config_class.default_filename(), load=load
+    return parser
+
+
+def _set_filepaths_from_cli(
+    config_class: Union[  # pylint: disable=consider-alternative-union-syntax
+        type[ConfigT], type[ConfigBase], None
+    ],
+    settings_class: Union[  # pylint: disable=consider-alternative-union-syntax
+        type[SettingsT], type[SettingsBase], None
+    ],
+    universal_cmdline_path: Path,
+    load: bool,
+) -> None:
+    if config_class == ConfigBase:
+        config_classname = get_container_from_file(
+            ParameterKind.CONFIG, universal_cmdline_path, True
+        )
+        if not (config_class := _get_config_class(config_classname)):
+            raise ValueError(f"Unable to import {config_classname}")
+    if settings_class == SettingsBase:
+        settings_classname = get_container_from_file(
+            ParameterKind.SETTINGS, universal_cmdline_path, True
+        )
+        if not (settings_class := _get_settings_class(settings_classname)):
+            raise ValueError(f"Unable to import {settings_classname}")
+    if config_class and settings_class:
+        config_class.set_filepath(
+            universal_cmdline_path / config_class.default_filename()
+        )
+        settings_class.set_filepath(
+            universal_cmdline_path / settings_class.default_filename()
+        )
+        if load:
+            # load both files concurrently
+            load_all([config_class, settings_class])
+    elif config_class:
+        config_class.set_filepath(universal_cmdline_path, load=load)
+    elif settings_class:
+        settings_class.set_filepath(universal_cmdline_path, load=load)
+
+
+def load_all(  # pylint: disable=consider-alternative-union-syntax
+    containers: Optional[Iterable[type[ContainerBase]]] = None,
+    max_workers: Optional[int] = None,
+    throw_if_file_not_found: bool = False,
+) -> dict[type[ContainerBase], float]:
+    """Load the given containers, or all defined Config and Settings classes, in one go.
+
+    The files are read, parsed and validated concurrently on a thread pool, files that
+    are included by several containers are parsed only once. The containers are stored
+    in their singletons in the given order. Returns the duration of loading per
+    container in seconds.
+
+    Raises:
+        the first exception that load() raised for one of the containers; the
+        containers before that one have been loaded
+    """
+    the_containers = (
+        list(containers) if containers is not None else _all_container_classes()
+    )
+    durations: dict[type[ContainerBase], float] = {}
+    with parse_files_once(), ThreadPoolExecutor(max_workers) as executor:
+        # each task runs in a copy of this context, so the tasks share the parsed files
+        futures = [
+            executor.submit(
+                copy_context().run, _read_container, container, throw_if_file_not_found
             )
-            settings_class.set_filepath(
-                universal_cmdline_path / settings_class.default_filename(), load=load
+            for container in the_containers
+        ]
+        for container, future in zip(the_containers, futures):
+            instance, seconds = future.result()
+            start = perf_counter()
+            container._register_instance(instance)  # pylint: disable=protected-access
+            durations[container] = seconds + perf_counter() - start
+    return durations
+
+
+def get_many(containers: Iterable[type[SettingsT]]) -> list[SettingsT]:
+    """Return the singletons of the settings containers.
+
+    Containers that are served by a settings server are loaded from it anew, with a
+    single request per server; for the other containers, this is the same as get().
+    """
+    the_containers = list(containers)
+    per_client: dict[SettingsClient, list[int]] = {}
+    for index, container in enumerate(the_containers):
+        if (client := _client(container)) is not None:
+            per_client.setdefault(client, []).append(index)
+    instances: dict[int, SettingsT] = {}
+    for client, indices in per_client.items():
+        all_data = client.request(
+            [["get", the_containers[index].__name__, None] for index in indices]
+        )
+        for index, data in zip(indices, all_data):
+            instances[index] = the_containers[index].set(data)
+    return [
+        instances[index] if index in instances else container.get()
+        for index, container in enumerate(the_containers)
+    ]
+
+
+def update_many(updates: dict[type[SettingsBase], dict[str, Any]]) -> None:
+    """Update each settings container with its changes, like update().
+
+    The updates of containers that are served by a settings server are sent with a
+    single request per server.
+    """
+    per_client: dict[
+        SettingsClient, list[tuple[type[SettingsBase], SettingsBase, SettingsBase]]
+    ] = {}
+    changed_values: dict[type[SettingsBase], dict[str, Any]] = {}
+    for container, changes in updates.items():
+        if (client := _client(container)) is None:
+            container.update(changes)
+            continue
+        # pylint: disable-next=protected-access
+        previous, updated = container._validate_update(changes)
+        per_client.setdefault(client, []).append((container, previous, updated))
+        changed_values[container] = _changed_values(updated, changes)
+    for client, validated in per_client.items():
+        client.request(
+            [
+                ["update", container.__name__, None, changed_values[container]]
+                for container, _, _ in validated
+            ]
+        )
+        # applied here only once the server has accepted the updates
+        for container, previous, updated in validated:
+            container._register_update(  # pylint: disable=protected-access
+                previous, updated
             )
-        elif config_class:
-            config_class.set_filepath(universal_cmdline_path, load=load)
-        elif settings_class:
-            settings_class.set_filepath(universal_cmdline_path, load=load)
-    return parser
+
+
+def _read_container(
+    container: type[ContainerBase], throw_if_file_not_found: bool
+) -> tuple[ContainerBase, float]:
+    """Return an instance of the container with the stored data and the time it took"""
+    start = perf_counter()
+    with operation(container.__name__, "load"):
+        # pylint: disable-next=protected-access
+        instance = container._read_instance(throw_if_file_not_found)
+    return instance, perf_counter() - start
+
+
+def _all_container_classes() -> list[type[ContainerBase]]:
+    """Return the concrete dataclass subclasses of ConfigBase and SettingsBase"""
+    found: list[type[ContainerBase]] = []
+    to_visit: list[type[ContainerBase]] = [ConfigBase, SettingsBase]
+    while to_visit:
+        for subclass in to_visit.pop(0).__subclasses__():
+            if subclass not in found:
+                found.append(subclass)
+                to_visit.append(subclass)
+    return [cls for cls in found if is_dataclass(cls) and not isabstract(cls)]
 
 
 def use_standard_logging(  # pylint: disable=consider-alternative-union-syntax
@@ -1,14 +1,50 @@
 """Module for handling settings."""
 
 import sys
-from dataclasses import replace
-from typing import Any, TypeVar
+from collections.abc import Collection
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from time import monotonic
+from typing import Any, Optional, TypeVar, cast
+from weakref import ReferenceType, ref
 
 from application_settings.container_base import ContainerBase
-from application_settings.container_section_base import ContainerSectionBase
+from application_settings.container_section_base import (
+    ContainerSectionBase,
+    _differs,
+    _section_tree,
+    _update_section,
+    changed_paths,
+)
 from application_settings.parameter_kind import ParameterKind
+from application_settings.type_notation_helper import PathOpt, StrOpt
 
-from ._private.file_operations import FileFormat
+from ._private import change_notification
+from ._private.file_operations import (
+    FileFormat,
+    StorageMode,
+)
+from ._private.file_operations import append_to_journal as _do_append_to_journal
+from ._private.file_operations import forget as _do_forget
+from ._private.file_operations import load_shards as _do_load_shards
+from ._private.file_operations import replay_journal as _do_replay_journal
+from ._private.file_operations import save_shards as _do_save_shards
+from ._private.file_operations import (
+    stores_parameters_separately as _stores_parameters_separately,
+)
+from ._private.file_operations_utils import (
+    FileState,
+    current_state,
+    last_known_state,
+)
+from ._private.instrumentation import (
+    Phase,
+    count_skipped_write,
+    measure,
+    note_change,
+    operation,
+)
+from ._private.settings_client import SettingsClient, get_client, is_served_here
 
 if sys.version_info >= (3, 11):
     from typing import Self
@@ -43,25 +79,304 @@ class SettingsBase(ContainerBase):
         return FileFormat.JSON
 
     @classmethod
-    def update(cls, changes: dict[str, Any]) -> Self:
-        """Update the settings with data specified in changes and save.
+    def storage_mode(cls) -> StorageMode:
+        """Return how updates are stored; overwrite to return StorageMode.JOURNAL for
+        settings that are updated often, or StorageMode.SHARDED for settings with many
+        sections of which few change per update."""
+        return StorageMode.FILE
+
+    @classmethod
+    def journal_compaction_limits(cls) -> tuple[int, int]:
+        """Return the maximum number of records and of bytes of the journal; when one of
+        them is exceeded, the journal is folded into the settings file."""
+        return 1000, 1024 * 1024
+
+    @classmethod
+    def notify_other_processes(cls) -> bool:
+        """Return whether other processes are notified of updates; overwrite to return True
+        for settings that are shared by several processes, see reload_if_changed()."""
+        return False
+
+    @classmethod
+    def change_check_interval(cls) -> float:
+        """Return the minimum number of seconds between two checks of reload_if_changed()"""
+        return 1.0
+
+    @classmethod
+    def reload_if_changed(cls, key: StrOpt = None) -> bool:
+        """Reload the settings, or those with the given key, if another process updated them
+        since they were loaded; return whether they were reloaded.
+
+        Requires notify_other_processes() to return True. The check costs a single stat and
+        is done at most once per change_check_interval(); calls in between return False.
+        """
+        if (now := monotonic()) < _NEXT_CHECKS.get(check_key := (id(cls), key), 0.0):
+            return False
+        _NEXT_CHECKS[check_key] = now + cls.change_check_interval()
+        if not (path := cls.filepath(key)) or not change_notification.is_behind(path):
+            return False
+        cls.load(key=key)
+        return True
+
+    @classmethod
+    def settings_server(cls) -> PathOpt:
+        """Return the path of the Unix socket of the SettingsServer that serves these
+        settings; overwrite to load and update via the server instead of the file."""
+        return None
+
+    @classmethod
+    def update(cls, changes: dict[str, Any], key: StrOpt = None) -> Self:
+        """Update the settings, or those with the given key, with data specified in changes and save.
 
         Raises:
             RuntimeError: if filepath() == None
         """
-        return (
-            _update_settings_section(  # pylint: disable=protected-access
-                cls.get(), changes
+        with operation(cls.__name__, "update"):
+            previous, updated = cls._validate_update(changes, key)
+            if (client := _client(cls)) is not None:
+                # the server may reject the update, so it is applied here afterwards
+                cls._store_via_server(client, updated, changes, key)
+                return cls._register_update(previous, updated, key)
+            cls._register_update(previous, updated, key)
+            if cls.storage_mode() == StorageMode.JOURNAL:
+                stored = cls._store_in_journal(updated, changes, key)
+            elif cls.storage_mode() == StorageMode.SHARDED:
+                stored = cls._store_in_shards(previous, updated, changes, key)
+            else:
+                stored = cls._store_in_file(updated, changes, key)
+            if stored and cls.notify_other_processes() and (path := cls.filepath(key)):
+                change_notification.publish(path, changed_paths(previous, updated))
+            return updated
+
+    @classmethod
+    def _validate_update(
+        cls, changes: dict[str, Any], key: StrOpt = None
+    ) -> tuple[Self, Self]:
+        """Return the settings, or those with key, and an instance updated with changes"""
+        with measure(Phase.VALIDATE):
+            updated = _update_section(previous := cls._get_loaded(key), changes)
+        return previous, updated
+
+    @classmethod
+    def _register_update(
+        cls, previous: Self, updated: Self, key: StrOpt = None
+    ) -> Self:
+        """Replace the settings, or those with key, by the updated instance"""
+        note_change(lambda: _differs(previous, updated))
+        with measure(Phase.REGISTER):
+            if key is None:
+                updated._set()  # pylint: disable=protected-access
+            else:
+                updated._set_keyed(key)  # pylint: disable=protected-access
+        return updated
+
+    @classmethod
+    def _store_via_server(
+        cls,
+        client: SettingsClient,
+        updated: Self,
+        changes: dict[str, Any],
+        key: StrOpt = None,
+    ) -> None:
+        """Send the changed values to the settings server, which stores them"""
+        with measure(Phase.SAVE):
+            client.request(
+                [["update", cls.__name__, key, _changed_values(updated, changes)]]
             )
-            ._set()
-            ._save()
+
+    @classmethod
+    def _store_in_journal(
+        cls, updated: Self, changes: dict[str, Any], key: StrOpt = None
+    ) -> bool:
+        """Append the changed values to the journal; return True, as it is written"""
+        updated._append_to_journal(changes, key)  # pylint: disable=protected-access
+        return True
+
+    @classmethod
+    def _store_in_shards(
+        cls, previous: Self, updated: Self, changes: dict[str, Any], key: StrOpt = None
+    ) -> bool:
+        """Save the shards of the sections that changed; return whether any changed"""
+        if not (paths := changed_paths(previous, updated)):
+            count_skipped_write()
+            return False
+        updated._save_shards(  # pylint: disable=protected-access
+            _changed_values(updated, changes),
+            {path.split(".", 1)[0] for path in paths},
+            key,
         )
+        return True
+
+    @classmethod
+    def _store_in_file(
+        cls, updated: Self, changes: dict[str, Any], key: StrOpt = None
+    ) -> bool:
+        """Save the changed values to the settings file, unless it already holds them;
+        return whether it has been written"""
+        path = cls.filepath(key)
+        if path and _holds(path, updated):
+            count_skipped_write()
+            return False
+        changed = _changed_values(updated, changes)
+        updated._save(changed, key)  # pylint: disable=protected-access
+        if path:
+            _remember_stored(path, updated)
+        return True
+
+    def _append_to_journal(self, changes: dict[str, Any], key: StrOpt = None) -> Self:
+        """Private method to append the changed values of the singleton, or the instance
+        with key, to the journal."""
+        if path := self.filepath(key):
+            with measure(Phase.SAVE):
+                _do_append_to_journal(
+                    path,
+                    _changed_values(self, changes),
+                    *self.journal_compaction_limits(),
+                    _section_tree(type(self)),
+                )
+        else:
+            raise RuntimeError(
+                f"No path specified for {self.kind_string().lower()} file, cannot be saved."
+            )
+        return self
+
+    def _save_shards(
+        self, changes: dict[str, Any], changed: Collection[str], key: StrOpt = None
+    ) -> Self:
+        """Private method to save the values of the singleton, or the instance with key,
+        in the shards of the changed top-level names; changes holds the values that
+        differ from what is stored."""
+        if path := self.filepath(key):
+            with measure(Phase.SAVE):
+                _do_save_shards(
+                    path,
+                    (
+                        changes
+                        if _stores_parameters_separately(path)
+                        else self.to_dict()
+                    ),
+                    _section_tree(type(self)),
+                    changed,
+                )
+        else:
+            raise RuntimeError(
+                f"No path specified for {self.kind_string().lower()} file, cannot be saved."
+            )
+        return self
+
+    @classmethod
+    def _read_instance(
+        cls, throw_if_file_not_found: bool = False, key: StrOpt = None
+    ) -> Self:
+        """Remember the version of the file that is loaded, for reload_if_changed()"""
+        if (
+            _client(cls) is None
+            and cls.notify_other_processes()
+            and (path := cls.filepath(key))
+        ):
+            change_notification.mark_loading(path)
+        return super()._read_instance(throw_if_file_not_found, key)
+
+    @classmethod
+    def _register_instance(cls, instance: Self, key: StrOpt = None) -> Self:
+        """Remember which instance holds the parameters stored in the file"""
+        super()._register_instance(instance, key)
+        if _client(cls) is None and (path := cls.filepath(key)):
+            _remember_stored(path, instance)
+        return instance
+
+    @classmethod
+    def _forget_keyed(cls, key: str) -> None:
+        """Also drop what is kept about the file, the shards and the other processes"""
+        super()._forget_keyed(key)
+        _NEXT_CHECKS.pop((id(cls), key), None)
+        if path := cls.filepath(key):
+            _STORED_SETTINGS.pop(path, None)
+            change_notification.forget(path)
+            if cls.storage_mode() == StorageMode.SHARDED:
+                _do_forget(path, list(_section_tree(cls)))
+
+    @classmethod
+    def _validate_stored_json(
+        cls, throw_if_file_not_found: bool, key: StrOpt = None
+    ) -> Optional[Self]:  # pylint: disable=consider-alternative-union-syntax
+        """The journal or the shards have to be applied before validation"""
+        if cls.storage_mode() != StorageMode.FILE or _client(cls) is not None:
+            return None
+        return super()._validate_stored_json(throw_if_file_not_found, key)
+
+    @classmethod
+    def _get_saved_data(
+        cls, throw_if_file_not_found: bool = False, key: StrOpt = None
+    ) -> dict[str, Any]:
+        """Get the data stored in the settings file, updated with its journal or its
+        shards, or get the data from the settings server"""
+        if (client := _client(cls)) is not None:
+            return cast(dict[str, Any], client.request([["get", cls.__name__, key]])[0])
+        data_stored = super()._get_saved_data(throw_if_file_not_found, key)
+        if cls.storage_mode() == StorageMode.JOURNAL:
+            return _do_replay_journal(cls.filepath(key), data_stored)
+        if cls.storage_mode() == StorageMode.SHARDED and (path := cls.filepath(key)):
+            return data_stored | _do_load_shards(path, list(_section_tree(cls)))
+        return data_stored
+
+
+def _client(
+    cls: type[SettingsBase],
+) -> Optional[SettingsClient]:  # pylint: disable=consider-alternative-union-syntax
+    """Return the client of the server of cls, if it has one in another process"""
+    if (socket_path := cls.settings_server()) is None or is_served_here(id(cls)):
+        return None
+    return get_client(socket_path)
+
+
+def _remember_stored(path: Path, the_settings: SettingsBase) -> None:
+    """Remember that the file path, as last read or written, holds the parameters of
+    the_settings"""
+    if (
+        the_settings.storage_mode() == StorageMode.FILE
+        and not _stores_parameters_separately(path)
+        and (state := last_known_state(path)) is not None
+    ):
+        _STORED_SETTINGS[path] = (ref(the_settings), state)
+    else:
+        # not stored as a whole in path, or not read from it
+        _STORED_SETTINGS.pop(path, None)
+
+
+def _holds(path: Path, the_settings: SettingsBase) -> bool:
+    """Return whether the file path holds the parameter values of the_settings, i.e.,
+    whether it has not changed since it was remembered to hold equal values"""
+    if (stored := _STORED_SETTINGS.get(path)) is None or (
+        stored_settings := stored[0]()
+    ) is None:
+        return False
+    return current_state(path) == stored[1] and not _differs(
+        stored_settings, the_settings
+    )
+
+
+def _changed_values(the_section: Any, changes: dict[str, Any]) -> dict[str, Any]:
+    """Return the validated values in the_section of the parameters in changes"""
+    values: dict[str, Any] = {}
+    for name, value in changes.items():
+        if not hasattr(the_section, name):
+            continue
+        current = getattr(the_section, name)
+        if isinstance(current, ContainerSectionBase):
+            values[name] = (
+                _changed_values(current, value)
+                if isinstance(value, dict)
+                else current.to_dict()
+            )
+        elif is_dataclass(current) and not isinstance(current, type):
+            values[name] = asdict(current)
+        else:
+            values[name] = current
+    return values
 
 
-def _update_settings_section(
-    the_section: SettingsT, changes: dict[str, Any]
-) -> SettingsT:
-    "Update parameters and sections with data specified in changes"
-    # in the_section._set(), which normally is always executed, we ensured that
-    # the_section is a dataclass instance and hence we can ignore type errors
-    return replace(the_section, **changes)  # type: ignore[type-var]
+_STORED_SETTINGS: dict[Path, tuple[ReferenceType[SettingsBase], FileState]] = {}
+"""Per settings file: the settings it held and its state when last loaded or saved"""
+_NEXT_CHECKS: dict[tuple[int, StrOpt], float] = {}
+"""Per settings class and key: the time of the next check of reload_if_changed()"""
@@ -11,6 +11,7 @@ if sys.version_info >= (3, 10):
 
     PathOrStr: TypeAlias = Path | str
     PathOpt: TypeAlias = Path | None
+    StrOpt: TypeAlias = str | None
     LoaderOpt: TypeAlias = Callable[[Path], dict[str, Any]] | None
     SaverOpt: TypeAlias = Callable[[Path, dict[str, Any]], None] | None
     ModuleTypeOpt: TypeAlias = ModuleType | None
@@ -21,6 +22,7 @@ else:
 
     PathOrStr: TypeAlias = Union[Path, str]
     PathOpt: TypeAlias = Union[Path, None]
+    StrOpt: TypeAlias = Union[str, None]
     LoaderOpt: TypeAlias = Union[Callable[[Path], dict[str, Any]], None]
     SaverOpt: TypeAlias = Union[Callable[[Path, dict[str, Any]], None], None]
     ModuleTypeOpt: TypeAlias = Union[ModuleType, None]
@@ -0,0 +1,88 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from application_settings import SettingsBase, SettingsSectionBase, dataclass
+
+
+@dataclass(frozen=True)
+class SharedSettingsSection(SettingsSectionBase):
+    """Settings section"""
+
+    counter: int = 0
+
+
+@dataclass(frozen=True)
+class SharedSettings(SettingsBase):
+    """Settings that are shared by several processes"""
+
+    name: str = "name"
+    section1: SharedSettingsSection = SharedSettingsSection()
+
+    @classmethod
+    def notify_other_processes(cls) -> bool:
+        return True
+
+    @classmethod
+    def change_check_interval(cls) -> float:
+        return 0.0
+
+
+_OTHER_PROCESS = """
+import sys
+from application_settings import SettingsBase, SettingsSectionBase, dataclass
+
+@dataclass(frozen=True)
+class SharedSettingsSection(SettingsSectionBase):
+    counter: int = 0
+
+@dataclass(frozen=True)
+class SharedSettings(SettingsBase):
+    name: str = "name"
+    section1: SharedSettingsSection = SharedSettingsSection()
+
+    @classmethod
+    def notify_other_processes(cls) -> bool:
+        return True
+
+SharedSettings.set_filepath(sys.argv[1], load=True)
+SharedSettings.update({"section1": {"counter": 5}})
+"""
+
+
+def test_reload_if_changed(tmp_path: Path) -> None:
+    settings_path = tmp_path / "settings.json"
+    SharedSettings.set_filepath(settings_path, load=True)
+    SharedSettings.update({"name": "this process"})
+    assert json.loads((tmp_path / "settings.json.changes").read_text()) == ["name"]
+    # the change of this process does not need a reload
+    assert not SharedSettings.reload_if_changed()
+
+    subprocess.run(
+        [sys.executable, "-c", _OTHER_PROCESS, str(settings_path)], check=True
+    )
+    assert SharedSettings.get().section1.counter == 0
+    assert SharedSettings.reload_if_changed()
+    assert SharedSettings.get().section1.counter == 5
+    assert SharedSettings.get().name == "this process"
+    assert not SharedSettings.reload_if_changed()
+
+
+def test_reload_throttled(tmp_path: Path) -> None:
+    class ThrottledSettings(SharedSettings):
+        """Settings that are checked at most once per hour"""
+
+        @classmethod
+        def change_check_interval(cls) -> float:
+            return 3600.0
+
+    settings_path = tmp_path / "settings.json"
+    ThrottledSettings.set_filepath(settings_path, load=True)
+    assert not ThrottledSettings.reload_if_changed()
+    settings_path.write_text(json.dumps({"name": "other"}))
+    with (tmp_path / "settings.json.changes").open("a", encoding="utf-8") as sentinel:
+        sentinel.write('["name"]\n')
+    assert not ThrottledSettings.reload_if_changed()
@@ -0,0 +1,110 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import json
+from pathlib import Path
+
+from application_settings import (
+    ConfigBase,
+    ConfigSectionBase,
+    SettingsBase,
+    SettingsSectionBase,
+    changed_paths,
+    dataclass,
+)
+
+
+@dataclass(frozen=True)
+class ChangedSettingsSubSection(SettingsSectionBase):
+    """Settings subsection"""
+
+    ratio: float = 0.5
+
+
+@dataclass(frozen=True)
+class ChangedSettingsSection(SettingsSectionBase):
+    """Settings section"""
+
+    counter: int = 0
+    subsec: ChangedSettingsSubSection = ChangedSettingsSubSection()
+
+
+@dataclass(frozen=True)
+class UnchangedSettingsSection(SettingsSectionBase):
+    """Settings section"""
+
+    name: str = "name"
+
+
+@dataclass(frozen=True)
+class ChangedSettings(SettingsBase):
+    """Settings"""
+
+    field0: int = 0
+    section1: ChangedSettingsSection = ChangedSettingsSection()
+    section2: UnchangedSettingsSection = UnchangedSettingsSection()
+
+
+@dataclass(frozen=True)
+class ChangedConfigSection(ConfigSectionBase):
+    """Config section"""
+
+    field1: str = "field1"
+
+
+@dataclass(frozen=True)
+class ChangedConfig(ConfigBase):
+    """Config"""
+
+    section1: ChangedConfigSection = ChangedConfigSection()
+
+
+def test_changed_paths(tmp_path: Path) -> None:
+    ChangedSettings.set_filepath(tmp_path / "settings.json", load=True)
+    previous = ChangedSettings.get()
+    current = ChangedSettings.update(
+        {"field0": 1, "section1": {"subsec": {"ratio": 0.75}}}
+    )
+    assert changed_paths(previous, current) == ["field0", "section1.subsec.ratio"]
+    assert not changed_paths(current, ChangedSettings.load())
+
+
+def test_subscribers(tmp_path: Path) -> None:
+    ChangedSettings.set_filepath(tmp_path / "settings.json", load=True)
+    notified: list[object] = []
+    ChangedSettingsSection.subscribe(notified.append)
+    UnchangedSettingsSection.subscribe(notified.append)
+    try:
+        ChangedSettings.update({"section1": {"counter": 1}})
+        assert notified == [ChangedSettingsSection.get()]
+        assert ChangedSettingsSection.get().counter == 1
+        ChangedSettings.update({"section1": {"counter": 1}, "field0": 2})
+        assert len(notified) == 1
+    finally:
+        ChangedSettingsSection.unsubscribe(notified.append)
+        UnchangedSettingsSection.unsubscribe(notified.append)
+    ChangedSettings.update({"section1": {"counter": 2}})
+    assert len(notified) == 1
+
+
+def test_subscribers_on_reload(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.json"
+    ChangedConfig.set_filepath(config_path, load=True)
+    notified: list[ConfigSectionBase] = []
+
+    def failing(_: ChangedConfigSection) -> None:
+        raise RuntimeError("failing subscriber")
+
+    ChangedConfigSection.subscribe(failing)
+    ChangedConfigSection.subscribe(notified.append)
+    ChangedConfig.subscribe(notified.append)
+    try:
+        ChangedConfig.load()
+        assert not notified
+        config_path.write_text(json.dumps({"section1": {"field1": "other"}}))
+        ChangedConfig.load()
+        # a failing subscriber does not stop the others
+        assert notified == [ChangedConfigSection.get(), ChangedConfig.get()]
+    finally:
+        ChangedConfigSection.unsubscribe(failing)
+        ChangedConfigSection.unsubscribe(notified.append)
+        ChangedConfig.unsubscribe(notified.append)
@@ -1,9 +1,13 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-function-docstring
 # pylint: disable=redefined-outer-name
+import importlib
 import json
+import os
 import sys
+from argparse import ArgumentParser
 from pathlib import Path
+from types import ModuleType
 from typing import Any
 
 import pytest
@@ -506,3 +510,92 @@ def test_include_6(json_file_inc2: Path) -> None:
     AnExample1Config.set_filepath(json_file_inc2, load=True)
     assert AnExample1Config.get().field0 == 99.99
     assert AnExample1Config.get().section1.subsec.field3[0] == -99
+
+
+def test_include_syscalls(
+    monkeypatch: pytest.MonkeyPatch, toml_file_inc3: Path
+) -> None:
+    opened: list[str] = []
+    os_open = os.open
+
+    def mock_open(path: Any, *args: Any, **kwargs: Any) -> int:
+        opened.append(Path(path).name)
+        return os_open(path, *args, **kwargs)
+
+    def mock_stat(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("stat should not be needed for loading")
+
+    AnExample1Config.set_filepath(toml_file_inc3)
+    monkeypatch.setattr(os, "open", mock_open)
+    monkeypatch.setattr(os, "stat", mock_stat)
+    AnExample1Config.load()
+    assert opened == ["conf_main.toml", "conf_inc2.toml", "conf_inc1.toml"]
+    assert AnExample1Config.get().section1.subsec.field3[0] == -333
+
+
+def test_cmdline_container_class_single_parse(
+    monkeypatch: pytest.MonkeyPatch, toml_file_inc1: Path
+) -> None:
+    # the container class is found in the file with the class key
+    the_module = ModuleType("bootstrap_example")
+    setattr(the_module, "BootstrapConfig", AnExample1Config)
+    monkeypatch.setitem(sys.modules, "bootstrap_example", the_module)
+    config_path = toml_file_inc1.parent / "bootstrap.toml"
+    config_path.write_text(
+        toml_file_inc1.read_text()
+        + '\n__Config_container_class__ = "bootstrap_example.BootstrapConfig"\n'
+    )
+    parsed: list[str] = []
+    tomlkit_load = tomlkit.load
+
+    def mock_tomlkit_load(fptr: Any) -> Any:
+        parsed.append("parse")
+        return tomlkit_load(fptr)
+
+    imports: list[str] = []
+    import_module = importlib.import_module
+
+    def mock_import_module(name: str) -> ModuleType:
+        imports.append(name)
+        return import_module(name)
+
+    monkeypatch.setattr(tomlkit, "load", mock_tomlkit_load)
+    monkeypatch.setattr(importlib, "import_module", mock_import_module)
+    monkeypatch.setattr(sys, "argv", ["bla", "-b", str(config_path)])
+    config_filepath_from_cli(parser=ArgumentParser(), short_option="-b", load=True)
+    # the main file and the included file
+    assert len(parsed) == 2
+    assert imports == ["bootstrap_example"]
+    assert AnExample1Config.filepath() == config_path.resolve()
+    assert AnExample1Config.get().section1.subsec.field3[1] == "no"
+
+    # the class is not imported again
+    config_filepath_from_cli(parser=ArgumentParser(), short_option="-b", load=True)
+    assert imports == ["bootstrap_example"]
+
+
+def test_cmdline_relative_path_single_parse(
+    monkeypatch: pytest.MonkeyPatch, toml_file_inc1: Path
+) -> None:
+    the_module = ModuleType("bootstrap_relative_example")
+    setattr(the_module, "BootstrapConfig", AnExample1Config)
+    monkeypatch.setitem(sys.modules, "bootstrap_relative_example", the_module)
+    config_path = toml_file_inc1.parent / "bootstrap.toml"
+    config_path.write_text(
+        '__Config_container_class__ = "bootstrap_relative_example.BootstrapConfig"\n'
+        '[section1]\nfield1 = "relative"\n'
+    )
+    parsed: list[str] = []
+    tomlkit_load = tomlkit.load
+
+    def mock_tomlkit_load(fptr: Any) -> Any:
+        parsed.append("parse")
+        return tomlkit_load(fptr)
+
+    monkeypatch.setattr(tomlkit, "load", mock_tomlkit_load)
+    monkeypatch.chdir(config_path.parent)
+    monkeypatch.setattr(sys, "argv", ["bla", "-b", "bootstrap.toml"])
+    config_filepath_from_cli(parser=ArgumentParser(), short_option="-b", load=True)
+    assert len(parsed) == 1
+    assert AnExample1Config.filepath() == config_path.resolve()
+    assert AnExample1Config.get().section1.field1 == "relative"
@@ -0,0 +1,156 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict, field
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from application_settings import SettingsBase, SettingsSectionBase, dataclass
+
+
+@dataclass(frozen=True)
+class ExportedSettingsSubSection(SettingsSectionBase):
+    """Settings subsection"""
+
+    ratio: float = 0.5
+    tags: tuple[str, ...] = ("a", "b")
+
+
+@dataclass(frozen=True)
+class ExportedSettingsSection(SettingsSectionBase):
+    """Settings section"""
+
+    counter: int = 0
+    subsec: ExportedSettingsSubSection = ExportedSettingsSubSection()
+
+
+@dataclass(frozen=True)
+class ExportedSettings(SettingsBase):
+    """Settings"""
+
+    name: str = "name"
+    section1: ExportedSettingsSection = ExportedSettingsSection()
+    section2: ExportedSettingsSection = ExportedSettingsSection()
+
+
+def test_to_dict(tmp_path: Path) -> None:
+    ExportedSettings.set_filepath(tmp_path / "settings.json", load=True)
+    settings = ExportedSettings.get()
+    assert settings.to_dict() == asdict(settings)  # type: ignore[call-overload]
+    assert settings.to_dict() is settings.to_dict()
+    assert settings.to_dict()["section1"] is settings.section1.to_dict()
+
+    updated = ExportedSettings.update({"section1": {"counter": 1}})
+    assert updated.to_dict()["section1"]["counter"] == 1
+    assert updated.to_dict()["section2"] is settings.section2.to_dict()
+    assert (
+        updated.to_dict()["section1"]["subsec"]
+        is settings.to_dict()["section1"]["subsec"]
+    )
+    assert settings.to_dict()["section1"]["counter"] == 0
+
+
+def test_to_json(tmp_path: Path) -> None:
+    ExportedSettings.set_filepath(tmp_path / "settings.json", load=True)
+    settings = ExportedSettings.get()
+    assert json.loads(settings.to_json()) == {
+        "name": "name",
+        "section1": {"counter": 0, "subsec": {"ratio": 0.5, "tags": ["a", "b"]}},
+        "section2": {"counter": 0, "subsec": {"ratio": 0.5, "tags": ["a", "b"]}},
+    }
+    assert settings.to_json() is settings.to_json()
+    updated = ExportedSettings.update({"name": "other"})
+    assert json.loads(updated.to_json())["name"] == "other"
+    assert json.loads(settings.to_json())["name"] == "name"
+
+
+def test_fingerprint(tmp_path: Path) -> None:
+    ExportedSettings.set_filepath(tmp_path / "settings.json", load=True)
+    settings = ExportedSettings.get()
+    assert settings.fingerprint() == ExportedSettings.load().fingerprint()
+    assert settings.section1.fingerprint() == settings.section2.fingerprint()
+    assert settings.fingerprint() is settings.fingerprint()
+
+    updated = ExportedSettings.update({"section1": {"subsec": {"ratio": 0.75}}})
+    assert updated.fingerprint() != settings.fingerprint()
+    assert updated.section1.fingerprint() != updated.section2.fingerprint()
+    assert (
+        updated.section1.subsec.fingerprint() != settings.section1.subsec.fingerprint()
+    )
+    reverted = ExportedSettings.update({"section1": {"subsec": {"ratio": "0.5"}}})
+    assert reverted.fingerprint() == settings.fingerprint()
+
+
+_FINGERPRINT_OF_SET = """
+from application_settings import SettingsSectionBase, dataclass
+
+@dataclass(frozen=True)
+class TaggedSection(SettingsSectionBase):
+    tags: frozenset[str] = frozenset(f"tag{index}" for index in range(20))
+    nested: tuple[frozenset[str], ...] = (frozenset({"x", "y", "z"}),)
+
+print(TaggedSection().fingerprint())
+"""
+
+
+def test_fingerprint_of_set_in_other_processes() -> None:
+    fingerprints = {
+        subprocess.run(
+            [sys.executable, "-c", _FINGERPRINT_OF_SET],
+            check=True,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout
+        for seed in ("1", "2", "3")
+    }
+    assert len(fingerprints) == 1
+
+
+@dataclass(frozen=True)
+class MappingSection(SettingsSectionBase):
+    """Settings section with a dict"""
+
+    limits: dict[str, Any] = field(default_factory=dict)
+
+
+def test_fingerprint_of_dict_in_other_order() -> None:
+    first = MappingSection(limits={"a": 1, "b": {"c": 2, "d": [3]}})
+    second = MappingSection(limits={"b": {"d": [3], "c": 2}, "a": 1})
+    assert first == second
+    assert first.fingerprint() == second.fingerprint()
+    assert first.fingerprint() != MappingSection(limits={"a": 1}).fingerprint()
+
+
+def test_lookup(tmp_path: Path) -> None:
+    ExportedSettings.set_filepath(tmp_path / "settings.json", load=True)
+    assert ExportedSettings.lookup("name") == "name"
+    assert ExportedSettings.lookup("section1.subsec.ratio") == 0.5
+    assert ExportedSettings.lookup("section2.subsec") is (
+        ExportedSettings.get().section2.subsec
+    )
+    assert ExportedSettings.lookup_many(
+        ["section1.counter", "section2.subsec.tags"]
+    ) == [
+        0,
+        ("a", "b"),
+    ]
+
+    ExportedSettings.update({"section1": {"counter": 1}})
+    assert ExportedSettings.lookup("section1.counter") == 1
+    with ExportedSettings.override({"section1": {"counter": 2}}):
+        assert ExportedSettings.lookup("section1.counter") == 2
+    assert ExportedSettings.lookup("section1.counter") == 1
+
+
+def test_lookup_unknown_path(tmp_path: Path) -> None:
+    ExportedSettings.set_filepath(tmp_path / "settings.json", load=True)
+    with pytest.raises(KeyError, match="did you mean 'section1.counter'"):
+        ExportedSettings.lookup("section1.countr")
+    with pytest.raises(KeyError, match="has no parameter or section 'section3'"):
+        ExportedSettings.lookup_many(["name", "section3"])
@@ -0,0 +1,106 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import os
+from pathlib import Path
+
+from application_settings import (
+    ConfigBase,
+    ConfigSectionBase,
+    OperationReport,
+    add_observer,
+    dataclass,
+    remove_observer,
+)
+from application_settings._private.file_operations import _PARSED_FRAGMENTS
+from application_settings.type_notation_helper import PathOpt
+
+
+@dataclass(frozen=True)
+class FragmentedConfigSection(ConfigSectionBase):
+    """Config section"""
+
+    field1: str = "field1"
+    field2: int = 2
+
+
+@dataclass(frozen=True)
+class FragmentedConfig(ConfigBase):
+    """Config with a folder of fragments next to the config file"""
+
+    field0: float = 0.5
+    section1: FragmentedConfigSection = FragmentedConfigSection()
+
+    @classmethod
+    def fragments_folderpath(cls) -> PathOpt:
+        if path := cls.filepath():
+            return path.with_suffix(".d")
+        return None
+
+
+def _write_fragments(folder: Path, fragments: dict[str, str]) -> None:
+    folder.mkdir(exist_ok=True)
+    for name, content in fragments.items():
+        (folder / name).write_text(content)
+
+
+def test_fragments(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.toml"
+    config_path.write_text('field0 = 1.5\n[section1]\nfield1 = "main"\n')
+    _write_fragments(
+        tmp_path / "config.d",
+        {
+            "20-second.toml": "[section1]\nfield2 = 20\n",
+            "10-first.json": '{"section1": {"field1": "first", "field2": 10}}',
+            "README.txt": "not a fragment",
+        },
+    )
+    FragmentedConfig.set_filepath(config_path, load=True)
+    assert FragmentedConfig.get().field0 == 1.5
+    assert FragmentedConfigSection.get().field1 == "first"
+    assert FragmentedConfigSection.get().field2 == 20
+
+
+def test_only_changed_fragments_parsed(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.toml"
+    config_path.write_text("field0 = 1.5\n")
+    fragments = {f"{index:03}.toml": f"field0 = {index}\n" for index in range(10)}
+    _write_fragments(tmp_path / "config.d", fragments)
+    FragmentedConfig.set_filepath(config_path, load=True)
+    assert FragmentedConfig.get().field0 == 9
+
+    reports: list[OperationReport] = []
+    add_observer(reports.append)
+    try:
+        changed = tmp_path / "config.d" / "009.toml"
+        changed.write_text("field0 = 99\n")
+        os.utime(changed, ns=(1, 1))
+        FragmentedConfig.load()
+        assert FragmentedConfig.get().field0 == 99
+        # the config file and the changed fragment
+        assert reports[-1].files_read == 2
+
+        (tmp_path / "config.d" / "009.toml").unlink()
+        FragmentedConfig.load()
+        assert FragmentedConfig.get().field0 == 8
+        assert reports[-1].files_read == 1
+    finally:
+        remove_observer(reports.append)
+
+
+def test_deleted_fragments_forgotten(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.toml"
+    config_path.write_text("field0 = 1.5\n")
+    folder = tmp_path / "config.d"
+    _write_fragments(folder, {"001.toml": "field0 = 1\n", "002.toml": "field0 = 2\n"})
+    FragmentedConfig.set_filepath(config_path, load=True)
+    assert {folder / "001.toml", folder / "002.toml"} <= set(_PARSED_FRAGMENTS)
+
+    (folder / "002.toml").unlink()
+    FragmentedConfig.load()
+    assert folder / "001.toml" in _PARSED_FRAGMENTS
+    assert folder / "002.toml" not in _PARSED_FRAGMENTS
+
+    (folder / "001.toml").unlink()
+    folder.rmdir()
+    FragmentedConfig.load()
+    assert not any(path.parent == folder for path in _PARSED_FRAGMENTS)
@@ -0,0 +1,170 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+import json
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Event, Thread
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from application_settings import ConfigBase, ConfigSectionBase, dataclass
+from application_settings.type_notation_helper import StrOpt
+
+
+@dataclass(frozen=True)
+class FetchedConfigSection(ConfigSectionBase):
+    """Config section"""
+
+    field1: str = "field1"
+
+
+class _ConfigService(ThreadingHTTPServer):
+    """Serves a json document with an ETag; holds long polls until it changes"""
+
+    document: dict[str, Any] = {}
+    version = 1
+    requests: list[dict[str, str]] = []
+    changed = Event()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _ConfigService
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        self.server.requests.append(dict(self.headers))
+        etag = f'"{self.server.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            if wait := self.headers.get("Prefer", "").removeprefix("wait="):
+                self.server.changed.wait(float(wait))
+                etag = f'"{self.server.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(self.server.document).encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def service() -> Iterator[_ConfigService]:
+    server = _ConfigService(("127.0.0.1", 0), _Handler)
+    server.document = {"field0": 1.5, "section1": {"field1": "fetched"}}
+    server.requests = []
+    server.changed = Event()
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _config_class(url: str) -> type[ConfigBase]:
+    @dataclass(frozen=True)
+    class FetchedConfig(ConfigBase):
+        """Config that is fetched from a url"""
+
+        field0: float = 0.5
+        section1: FetchedConfigSection = FetchedConfigSection()
+
+        @classmethod
+        def url(cls) -> StrOpt:
+            return url
+
+    return FetchedConfig
+
+
+def _change(service: _ConfigService, document: dict[str, Any]) -> None:
+    service.document = document
+    service.version += 1
+    service.changed.set()
+
+
+def test_load_from_url(service: _ConfigService, tmp_path: Path) -> None:
+    config = _config_class(f"http://127.0.0.1:{service.server_port}/config")
+    config.set_filepath(tmp_path / "config.json", load=True)
+    assert FetchedConfigSection.get().field1 == "fetched"
+    assert json.loads((tmp_path / "config.json").read_text())["field0"] == 1.5
+
+    assert not config.reload_from_url()
+    assert service.requests[-1]["If-None-Match"] == '"1"'
+    _change(service, {"field0": 2.5})
+    assert config.reload_from_url()
+    assert config.get().field0 == 2.5  # type: ignore[attr-defined]
+    # the connection is reused
+    assert len({request["Host"] for request in service.requests}) == 1
+
+
+def test_offline_start(service: _ConfigService, tmp_path: Path) -> None:
+    url = f"http://127.0.0.1:{service.server_port}/config"
+    _config_class(url).set_filepath(tmp_path / "config.json", load=True)
+    service.shutdown()
+    service.server_close()
+
+    config = _config_class(url.replace(str(service.server_port), "1"))
+    config.set_filepath(tmp_path / "config.json", load=True)
+    assert config.get().field0 == 1.5  # type: ignore[attr-defined]
+    with pytest.raises(OSError):
+        config.reload_from_url()
+
+
+def test_watch_url(service: _ConfigService, tmp_path: Path) -> None:
+    config = _config_class(f"http://127.0.0.1:{service.server_port}/config")
+    config.set_filepath(tmp_path / "config.json", load=True)
+    reloaded = Event()
+    config.subscribe(lambda _: reloaded.set())
+    stop = Event()
+    watcher = Thread(target=config.watch_url, args=(stop, 10.0, 0.0))
+    watcher.start()
+    try:
+        _change(service, {"field0": 3.5})
+        assert reloaded.wait(10.0)
+        assert config.get().field0 == 3.5  # type: ignore[attr-defined]
+    finally:
+        stop.set()
+        watcher.join()
+
+
+def test_invalid_document(service: _ConfigService, tmp_path: Path) -> None:
+    config = _config_class(f"http://127.0.0.1:{service.server_port}/config")
+    config.set_filepath(tmp_path / "config.json", load=True)
+    _change(service, {"field0": "not a float"})
+    with pytest.raises(ValidationError):
+        config.reload_from_url()
+    # the file and the validators fetched before are kept, so the file can be loaded
+    assert json.loads((tmp_path / "config.json").read_text())["field0"] == 1.5
+    assert config.load().field0 == 1.5  # type: ignore[attr-defined]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "config.json",
+        "config.json.http",
+    ]
+    # the invalid document is fetched again, not skipped as unchanged
+    with pytest.raises(ValidationError):
+        config.reload_from_url()
+
+    reloaded = Event()
+    config.subscribe(lambda _: reloaded.set())
+    stop = Event()
+    watcher = Thread(target=config.watch_url, args=(stop, 10.0, 0.01))
+    watcher.start()
+    try:
+        # the watcher survives the invalid document
+        assert not reloaded.wait(0.2)
+        _change(service, {"field0": 4.5})
+        assert reloaded.wait(10.0)
+        assert config.get().field0 == 4.5  # type: ignore[attr-defined]
+    finally:
+        stop.set()
+        watcher.join()
@@ -0,0 +1,151 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+import tomlkit
+from loguru import logger
+
+from application_settings import (
+    ConfigBase,
+    ConfigSectionBase,
+    OperationReport,
+    Phase,
+    SettingsBase,
+    add_observer,
+    dataclass,
+    log_report,
+    remove_observer,
+    use_standard_logging,
+    write_counts,
+)
+
+
+@dataclass(frozen=True)
+class InstrumentedConfigSection(ConfigSectionBase):
+    """Config section"""
+
+    field1: str = "field1"
+
+
+@dataclass(frozen=True)
+class InstrumentedConfig(ConfigBase):
+    """Config"""
+
+    field0: float = 2.2
+    section1: InstrumentedConfigSection = InstrumentedConfigSection()
+
+
+@dataclass(frozen=True)
+class InstrumentedSettings(SettingsBase):
+    """Settings"""
+
+    setting1: int = 1
+
+
+@pytest.fixture
+def reports() -> Iterator[list[OperationReport]]:
+    collected: list[OperationReport] = []
+    add_observer(collected.append)
+    yield collected
+    remove_observer(collected.append)
+
+
+def test_load_report(tmp_path: Path, reports: list[OperationReport]) -> None:
+    (tmp_path / "included.toml").write_text(
+        tomlkit.dumps({"section1": {"field1": "included"}})
+    )
+    config_path = tmp_path / "config.toml"
+    config_path.write_text(
+        tomlkit.dumps({"field0": 3.3, "__include__": "./included.toml"})
+    )
+    InstrumentedConfig.set_filepath(config_path, load=True)
+
+    assert len(reports) == 1
+    report = reports[0]
+    assert report.container == "InstrumentedConfig"
+    assert report.operation == "load"
+    assert report.succeeded
+    assert set(report.durations) == {
+        Phase.PARSE,
+        Phase.MERGE,
+        Phase.VALIDATE,
+        Phase.REGISTER,
+    }
+    assert report.files_read == 2
+    assert report.bytes_read == sum(path.stat().st_size for path in tmp_path.iterdir())
+    assert report.seconds >= sum(report.durations.values())
+
+
+def test_update_report(tmp_path: Path, reports: list[OperationReport]) -> None:
+    InstrumentedSettings.set_filepath(tmp_path / "settings.json", load=True)
+    InstrumentedSettings.update({"setting1": 11})
+
+    report = reports[-1]
+    assert report.operation == "update"
+    assert Phase.SAVE in report.durations
+    assert report.files_written == 1
+    assert report.bytes_written == (tmp_path / "settings.json").stat().st_size
+
+
+def test_change_report(tmp_path: Path, reports: list[OperationReport]) -> None:
+    InstrumentedSettings.set_filepath(tmp_path / "settings.json", load=True)
+    InstrumentedSettings.update({"setting1": 11})
+    assert reports[-1].changed
+    InstrumentedSettings.update({"setting1": "11"})
+    assert not reports[-1].changed
+    InstrumentedSettings.load()
+    assert not reports[-1].changed
+    (tmp_path / "settings.json").write_text('{"setting1": 12}')
+    InstrumentedSettings.load()
+    assert reports[-1].changed
+
+
+def test_skipped_write(tmp_path: Path, reports: list[OperationReport]) -> None:
+    settings_path = tmp_path / "settings.json"
+    InstrumentedSettings.set_filepath(settings_path, load=True)
+    InstrumentedSettings.update({"setting1": 11})
+    mtime = settings_path.stat().st_mtime_ns
+    before = write_counts()
+    InstrumentedSettings.update({"setting1": "11"})
+    assert reports[-1].files_written == 0
+    assert reports[-1].writes_skipped == 1
+    assert write_counts().skipped == before.skipped + 1
+    assert write_counts().performed == before.performed
+    assert settings_path.stat().st_mtime_ns == mtime
+
+    # another process changed the file, so it has to be written
+    settings_path.write_text('{"setting1": 12}')
+    InstrumentedSettings.update({"setting1": 11})
+    assert reports[-1].files_written == 1
+    assert write_counts().performed == before.performed + 1
+    assert json.loads(settings_path.read_text()) == {"setting1": 11}
+
+
+def test_failed_load_is_reported(reports: list[OperationReport]) -> None:
+    InstrumentedSettings.set_filepath("")
+    with pytest.raises(FileNotFoundError):
+        InstrumentedSettings.load(throw_if_file_not_found=True)
+    assert not reports[-1].succeeded
+
+
+def test_no_report_without_observer(tmp_path: Path) -> None:
+    collected: list[OperationReport] = []
+    add_observer(collected.append)
+    remove_observer(collected.append)
+    InstrumentedSettings.set_filepath(tmp_path / "settings.json", load=True)
+    assert not collected
+
+
+def test_log_report(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    use_standard_logging(enable=True)
+    add_observer(log_report)
+    try:
+        InstrumentedSettings.set_filepath(tmp_path / "settings.json", load=True)
+    finally:
+        remove_observer(log_report)
+        logger.disable("application_settings")
+    assert "Load of InstrumentedSettings took" in caplog.records[-1].msg
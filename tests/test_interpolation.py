@@ -0,0 +1,136 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import json
+from pathlib import Path
+
+import pytest
+
+from application_settings import ConfigBase, ConfigSectionBase, dataclass
+from application_settings._private.interpolation import Interpolator
+from application_settings.configuring_base import _INTERPOLATORS
+from application_settings.type_notation_helper import PathOpt, StrOpt
+
+
+@dataclass(frozen=True)
+class InterpolatedConfigSection(ConfigSectionBase):
+    """Config section"""
+
+    name: str = "name"
+    port: int = 0
+    url: str = ""
+
+
+@dataclass(frozen=True)
+class InterpolatedConfig(ConfigBase):
+    """Config with references between parameters"""
+
+    home: str = ""
+    section1: InterpolatedConfigSection = InterpolatedConfigSection()
+
+    @classmethod
+    def interpolate(cls) -> bool:
+        return True
+
+
+@dataclass(frozen=True)
+class LiteralConfig(ConfigBase):
+    """Config without references: its values are taken literally"""
+
+    home: str = ""
+
+    @classmethod
+    def max_keyed_instances(cls) -> int:
+        return 2
+
+
+def test_references(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("INTERPOLATION_HOME", "/home/user")
+    config_path = tmp_path / "config.json"
+    config_path.write_text(
+        json.dumps(
+            {
+                "home": "${env:INTERPOLATION_HOME}",
+                "section1": {
+                    "name": "server",
+                    "port": "${section1.base_port}",
+                    "base_port": 8080,
+                    "url": "http://${section1.name}:${section1.port}${home}/$${x}",
+                },
+            }
+        )
+    )
+    InterpolatedConfig.set_filepath(config_path, load=True)
+    assert InterpolatedConfig.get().home == "/home/user"
+    assert InterpolatedConfigSection.get().port == 8080
+    assert InterpolatedConfigSection.get().url == "http://server:8080/home/user/${x}"
+
+
+def test_included_references(tmp_path: Path) -> None:
+    (tmp_path / "included.toml").write_text('[section1]\nname = "included"\n')
+    config_path = tmp_path / "config.toml"
+    config_path.write_text(
+        '__include__ = "./included.toml"\nhome = "${section1.name}"\n'
+    )
+    InterpolatedConfig.set_filepath(config_path, load=True)
+    assert InterpolatedConfig.get().home == "included"
+
+
+def test_section_reference() -> None:
+    data = {"a": {"b": "${c}", "d": [1, "${c}"]}, "c": 1, "e": "${a}"}
+    resolved = Interpolator().resolve(data)
+    assert resolved == {"a": {"b": 1, "d": [1, 1]}, "c": 1, "e": {"b": 1, "d": [1, 1]}}
+    # the data is not changed
+    assert data["a"] == {"b": "${c}", "d": [1, "${c}"]}
+
+
+def test_errors() -> None:
+    with pytest.raises(ValueError, match="Cyclic references: a -> b -> a"):
+        Interpolator().resolve({"a": "${b}", "b": "x${a}"})
+    with pytest.raises(ValueError, match="Cyclic references"):
+        Interpolator().resolve({"a": {"b": "${a}"}})
+    with pytest.raises(ValueError, match=r"\$\{c.d\} in a cannot be resolved"):
+        Interpolator().resolve({"a": "${c.d}", "c": 1})
+    with pytest.raises(ValueError, match="INTERPOLATION_UNSET, referenced in a"):
+        Interpolator().resolve({"a": "${env:INTERPOLATION_UNSET}"})
+
+
+def test_reevaluation() -> None:
+    interpolator = Interpolator()
+    first = interpolator.resolve({"a": "${b}", "b": {"c": 1}, "d": "${e}", "e": 2})
+    second = interpolator.resolve({"a": "${b}", "b": {"c": 1}, "d": "${e}", "e": 3})
+    # unchanged inputs give the value evaluated before
+    assert second["a"] is first["a"]
+    assert second["d"] == 3
+
+
+def test_no_interpolation_by_default(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"home": "${env:HOME}"}))
+    LiteralConfig.set_filepath(config_path, load=True)
+    assert LiteralConfig.get().home == "${env:HOME}"
+    assert not any(key[0] == id(LiteralConfig) for key in _INTERPOLATORS)
+
+
+def test_interpolators_dropped_with_keyed_instances(tmp_path: Path) -> None:
+    @dataclass(frozen=True)
+    class KeyedInterpolatedConfig(LiteralConfig):
+        """Keyed config with references"""
+
+        @classmethod
+        def interpolate(cls) -> bool:
+            return True
+
+        @classmethod
+        def filepath(cls, key: StrOpt = None) -> PathOpt:
+            return tmp_path / f"{key}.json"
+
+    for index in range(5):
+        (tmp_path / f"{index}.json").write_text(
+            json.dumps({"home": f"${{env:X{index}}}"})
+        )
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setenv(f"X{index}", str(index))
+            assert KeyedInterpolatedConfig.get(key=str(index)).home == str(index)
+    assert sorted(
+        key[1] for key in _INTERPOLATORS if key[0] == id(KeyedInterpolatedConfig)
+    ) == ["3", "4"]
@@ -0,0 +1,144 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import json
+from pathlib import Path
+from typing import Any
+
+from application_settings import (
+    SettingsBase,
+    SettingsSectionBase,
+    StorageMode,
+    dataclass,
+)
+from application_settings._private import journal
+
+
+@dataclass(frozen=True)
+class JournaledSettingsSection(SettingsSectionBase):
+    """Settings section"""
+
+    counter: int = 0
+    name: str = "name"
+
+
+@dataclass(frozen=True)
+class JournaledSettings(SettingsBase):
+    """Settings that are stored with a journal"""
+
+    field0: float = 0.5
+    section1: JournaledSettingsSection = JournaledSettingsSection()
+
+    @classmethod
+    def storage_mode(cls) -> StorageMode:
+        return StorageMode.JOURNAL
+
+    @classmethod
+    def journal_compaction_limits(cls) -> tuple[int, int]:
+        return 3, 1024
+
+
+def _journal(tmp_path: Path) -> Path:
+    return tmp_path / "settings.json.journal"
+
+
+def test_update_appends(tmp_path: Path) -> None:
+    settings_path = tmp_path / "settings.json"
+    settings_path.write_text(json.dumps({"section1": {"name": "base"}}))
+    JournaledSettings.set_filepath(settings_path, load=True)
+    JournaledSettings.update({"section1": {"counter": "1"}})
+    JournaledSettings.update({"field0": 1.5})
+
+    assert json.loads(settings_path.read_text()) == {"section1": {"name": "base"}}
+    records = _journal(tmp_path).read_text().splitlines()
+    # validated values are stored
+    assert [json.loads(record) for record in records] == [
+        {"section1": {"counter": 1}},
+        {"field0": 1.5},
+    ]
+
+    JournaledSettings.load()
+    assert JournaledSettings.get().field0 == 1.5
+    assert JournaledSettings.get().section1.counter == 1
+    assert JournaledSettings.get().section1.name == "base"
+
+
+def test_compaction(tmp_path: Path) -> None:
+    settings_path = tmp_path / "settings.json"
+    JournaledSettings.set_filepath(settings_path, load=True)
+    for counter in range(1, 4):
+        JournaledSettings.update({"section1": {"counter": counter}})
+    assert len(_journal(tmp_path).read_text().splitlines()) == 3
+    assert not settings_path.exists()
+
+    # the fourth record exceeds the limit
+    JournaledSettings.update({"section1": {"name": "compacted"}})
+    assert not _journal(tmp_path).exists()
+    assert json.loads(settings_path.read_text()) == {
+        "section1": {"counter": 3, "name": "compacted"}
+    }
+    JournaledSettings.update({"field0": 2.5})
+    JournaledSettings.load()
+    assert JournaledSettings.get().field0 == 2.5
+    assert JournaledSettings.get().section1.counter == 3
+    assert JournaledSettings.get().section1.name == "compacted"
+
+
+def test_append_during_compaction(tmp_path: Path) -> None:
+    settings_path = tmp_path / "settings.json"
+    journal.append(settings_path, {"section1": {"counter": 1}})
+
+    def save_while_other_process_appends(path: Path, data: dict[str, Any]) -> None:
+        journal.append(settings_path, {"section1": {"counter": 2}})
+        path.write_text(json.dumps(data))
+
+    journal.compact(settings_path, save_while_other_process_appends)
+    assert json.loads(settings_path.read_text()) == {"section1": {"counter": 1}}
+    # the record appended meanwhile is in a new journal
+    assert len(_journal(tmp_path).read_text().splitlines()) == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "settings.json",
+        "settings.json.journal",
+    ]
+    JournaledSettings.set_filepath(settings_path, load=True)
+    assert JournaledSettings.get().section1.counter == 2
+
+
+def test_unfinished_compaction(tmp_path: Path) -> None:
+    settings_path = tmp_path / "settings.json"
+    journal.append(settings_path, {"section1": {"counter": 1, "name": "moved"}})
+    # a compaction that stopped after moving the journal aside
+    _journal(tmp_path).rename(tmp_path / "settings.json.journal.compacting")
+    journal.append(settings_path, {"section1": {"counter": 2}})
+    JournaledSettings.set_filepath(settings_path, load=True)
+    assert JournaledSettings.get().section1.counter == 2
+    assert JournaledSettings.get().section1.name == "moved"
+
+    journal.compact(settings_path, lambda path, data: path.write_text(json.dumps(data)))
+    assert json.loads(settings_path.read_text()) == {
+        "section1": {"counter": 2, "name": "moved"}
+    }
+    assert [path.name for path in tmp_path.iterdir()] == ["settings.json"]
+
+
+def test_compaction_size(tmp_path: Path) -> None:
+    JournaledSettings.set_filepath(tmp_path / "settings.json", load=True)
+    JournaledSettings.update({"section1": {"name": 2000 * "n"}})
+    assert not _journal(tmp_path).exists()
+    JournaledSettings.load()
+    assert JournaledSettings.get().section1.name == 2000 * "n"
+
+
+def test_incomplete_record(tmp_path: Path) -> None:
+    settings_path = tmp_path / "settings.json"
+    JournaledSettings.set_filepath(settings_path, load=True)
+    JournaledSettings.update({"section1": {"counter": 5}})
+    with _journal(tmp_path).open("a", encoding="utf-8") as journal:
+        journal.write('{"section1":{"coun')
+
+    JournaledSettings.load()
+    assert JournaledSettings.get().section1.counter == 5
+    # the incomplete record has been removed, so appending continues after it
+    JournaledSettings.update({"section1": {"counter": 6}})
+    JournaledSettings.load()
+    assert JournaledSettings.get().section1.counter == 6
+    assert len(_journal(tmp_path).read_text().splitlines()) == 2
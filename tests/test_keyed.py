@@ -0,0 +1,129 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import json
+from pathlib import Path
+
+import pytest
+
+from application_settings import SettingsBase, SettingsSectionBase, dataclass
+from application_settings._private import change_notification, journal
+from application_settings._private.file_operations import StorageMode
+from application_settings._private.file_operations_utils import _FILE_STATES
+from application_settings.settings_base import _NEXT_CHECKS, _STORED_SETTINGS
+
+
+@dataclass(frozen=True)
+class TenantSettingsSection(SettingsSectionBase):
+    """Settings section"""
+
+    limit: int = 10
+
+
+@dataclass(frozen=True)
+class TenantSettings(SettingsBase):
+    """Settings per tenant"""
+
+    name: str = "default"
+    section1: TenantSettingsSection = TenantSettingsSection()
+
+    @classmethod
+    def max_keyed_instances(cls) -> int:
+        return 2
+
+
+def _write(path: Path, data: dict[str, object]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+
+
+def test_keyed_get_update(tmp_path: Path) -> None:
+    TenantSettings.set_filepath(tmp_path / "settings.json")
+    _write(tmp_path / "tenant1" / "settings.json", {"name": "tenant one"})
+    assert TenantSettings.filepath("tenant2") == tmp_path / "tenant2" / "settings.json"
+
+    assert TenantSettings.get(key="tenant1").name == "tenant one"
+    assert TenantSettings.get(key="tenant2").name == "default"
+    assert TenantSettings.get(key="tenant1") is TenantSettings.get(key="tenant1")
+
+    TenantSettings.update({"section1": {"limit": 20}}, key="tenant2")
+    assert TenantSettings.get(key="tenant2").section1.limit == 20
+    assert TenantSettings.get(key="tenant1").section1.limit == 10
+    assert json.loads((tmp_path / "tenant2" / "settings.json").read_text()) == {
+        "section1": {"limit": 20},
+        "name": "default",
+    }
+    # the singleton is neither loaded nor changed
+    assert TenantSettings.get().section1.limit == 10
+    assert not (tmp_path / "settings.json").exists()
+
+    _write(tmp_path / "tenant2" / "settings.json", {"name": "reloaded"})
+    assert TenantSettings.load(key="tenant2").name == "reloaded"
+    assert TenantSettings.get(key="tenant2").name == "reloaded"
+
+
+def test_keyed_lru(tmp_path: Path) -> None:
+    TenantSettings.set_filepath(tmp_path / "settings.json")
+    for tenant in ("tenant1", "tenant2", "tenant3"):
+        _write(tmp_path / tenant / "settings.json", {"name": tenant})
+    tenant1 = TenantSettings.get(key="tenant1")
+    TenantSettings.get(key="tenant2")
+    assert TenantSettings.get(key="tenant1") is tenant1
+    # tenant2 is the least recently used and is dropped
+    TenantSettings.get(key="tenant3")
+    assert TenantSettings.get(key="tenant1") is tenant1
+
+    _write(tmp_path / "tenant2" / "settings.json", {"name": "changed"})
+    assert TenantSettings.get(key="tenant2").name == "changed"
+
+
+def test_keyed_invalid_key(tmp_path: Path) -> None:
+    TenantSettings.set_filepath(tmp_path / "settings.json")
+    with pytest.raises(ValueError):
+        TenantSettings.get(key="../tenant1")
+    with pytest.raises(ValueError):
+        TenantSettings.update({"name": "x"}, key="a/b")
+    with pytest.raises(ValueError):
+        TenantSettings.update({"name": "x"}, key="..")
+    with pytest.raises(ValueError):
+        TenantSettings.update({"name": "x"}, key=".")
+    assert not (tmp_path / "settings.json").exists()
+    assert not (tmp_path.parent / "settings.json").exists()
+
+
+@dataclass(frozen=True)
+class SharedTenantSettings(TenantSettings):
+    """Settings per tenant, journaled and shared with other processes"""
+
+    @classmethod
+    def storage_mode(cls) -> StorageMode:
+        return StorageMode.JOURNAL
+
+    @classmethod
+    def notify_other_processes(cls) -> bool:
+        return True
+
+
+def test_keyed_state_bounded(tmp_path: Path) -> None:
+    SharedTenantSettings.set_filepath(tmp_path / "settings.json")
+    tenants = [f"tenant{index}" for index in range(5)]
+    for tenant in tenants:
+        _write(tmp_path / tenant / "settings.json", {"name": tenant})
+        SharedTenantSettings.get(key=tenant)
+        SharedTenantSettings.update({"section1": {"limit": 1}}, key=tenant)
+        SharedTenantSettings.reload_if_changed(key=tenant)
+    kept = tenants[-SharedTenantSettings.max_keyed_instances() :]
+
+    def tenants_in(paths: object) -> set[str]:
+        return {
+            path.relative_to(tmp_path).parts[0]
+            for path in paths  # type: ignore[attr-defined]
+            if tmp_path in path.parents
+        }
+
+    assert tenants_in(_FILE_STATES) == set(kept)
+    assert tenants_in(journal._NR_OF_RECORDS) == set(kept)
+    assert tenants_in(change_notification._SEEN) == set(kept)
+    assert tenants_in(_STORED_SETTINGS) <= set(kept)
+    assert {
+        key for cls_id, key in _NEXT_CHECKS if cls_id == id(SharedTenantSettings)
+    } == set(kept)
@@ -0,0 +1,90 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Barrier
+
+import pytest
+
+from application_settings import (
+    ConfigBase,
+    ConfigSectionBase,
+    SettingsBase,
+    ValidationError,
+    dataclass,
+)
+
+
+@dataclass(frozen=True)
+class OverriddenConfigSection(ConfigSectionBase):
+    """Config section"""
+
+    field1: str = "field1"
+    field2: int = 2
+
+
+@dataclass(frozen=True)
+class OverriddenConfig(ConfigBase):
+    """Config"""
+
+    field0: float = 0.5
+    section1: OverriddenConfigSection = OverriddenConfigSection()
+
+
+@dataclass(frozen=True)
+class OverriddenSettings(SettingsBase):
+    """Settings"""
+
+    setting1: str = "setting1"
+    setting2: int = 2
+
+
+def test_override(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.toml"
+    config_path.write_text("field0 = 1.5\n")
+    OverriddenConfig.set_filepath(config_path, load=True)
+    original = OverriddenConfig.get()
+    with OverriddenConfig.override({"section1": {"field2": "3"}}) as overridden:
+        assert OverriddenConfig.get() is overridden
+        assert OverriddenConfigSection.get().field2 == 3
+        assert OverriddenConfigSection.get().field1 == "field1"
+        assert OverriddenConfig.get().field0 == 1.5
+        with OverriddenConfig.override({"field0": 2.5}):
+            assert OverriddenConfig.get().field0 == 2.5
+            assert OverriddenConfigSection.get().field2 == 3
+        assert OverriddenConfig.get().field0 == 1.5
+    assert OverriddenConfig.get() is original
+    assert OverriddenConfigSection.get().field2 == 2
+    assert config_path.read_text() == "field0 = 1.5\n"
+
+    with pytest.raises(ValidationError):
+        with OverriddenConfig.override({"section1": {"field2": "three"}}):
+            pass
+
+
+def test_override_per_thread(tmp_path: Path) -> None:
+    OverriddenConfig.set_filepath(tmp_path / "config.toml", load=True)
+    barrier = Barrier(4)
+
+    def get_overridden(value: int) -> int:
+        with OverriddenConfig.override({"section1": {"field2": value}}):
+            # all threads are in their override context at the same time
+            barrier.wait()
+            return OverriddenConfigSection.get().field2
+
+    with ThreadPoolExecutor(4) as executor:
+        assert list(executor.map(get_overridden, range(4))) == [0, 1, 2, 3]
+    assert OverriddenConfigSection.get().field2 == 2
+
+
+def test_update_within_override(tmp_path: Path) -> None:
+    settings_path = tmp_path / "settings.json"
+    OverriddenSettings.set_filepath(settings_path, load=True)
+    with OverriddenSettings.override({"setting1": "overridden"}):
+        OverriddenSettings.update({"setting2": 22})
+        # the update is applied to the stored settings, not to the override
+        assert OverriddenSettings.get().setting1 == "overridden"
+    assert OverriddenSettings.get().setting1 == "setting1"
+    assert OverriddenSettings.get().setting2 == 22
+    assert json.loads(settings_path.read_text())["setting1"] == "setting1"
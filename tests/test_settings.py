@@ -1,26 +1,34 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-function-docstring
 # pylint: disable=consider-alternative-union-syntax
+import gzip
+import json
+import os
 import sys
+import time
+from argparse import ArgumentParser
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from threading import Barrier
+from typing import Any, Union
 
 import pytest
 from loguru import logger
+from pydantic import Field, model_validator
 
 from application_settings import (
     ConfigBase,
     SettingsBase,
     SettingsSectionBase,
+    ValidationError,
     dataclass,
+    load_all,
     parameters_folderpath_from_cli,
     settings_filepath_from_cli,
     use_standard_logging,
 )
 
-if sys.version_info < (3, 10):
-    from typing import Union
-
 
 @dataclass(frozen=True)
 class AnExample1SettingsSubSection(SettingsSectionBase):
@@ -45,11 +53,62 @@ class AnExample1Settings(SettingsBase):
     section1: AnExample1SettingsSection = AnExample1SettingsSection()
 
 
+@dataclass(frozen=True)
+class AnExample2Settings(SettingsBase):
+    """Example Settings that is only loaded implicitly"""
+
+    section1: AnExample1SettingsSection = AnExample1SettingsSection()
+
+
+@dataclass(frozen=True)
+class AnExample3SettingsSection(SettingsSectionBase):
+    """Settings section with a constrained field"""
+
+    positive: int = Field(default=1, gt=0)
+
+
+@dataclass(frozen=True)
+class AnExample3Settings(SettingsBase):
+    """Example Settings with two sections"""
+
+    section1: AnExample1SettingsSection = AnExample1SettingsSection()
+    section3: AnExample3SettingsSection = AnExample3SettingsSection()
+
+
+@dataclass(frozen=True)
+class AnExample4Settings(SettingsBase):
+    """Example Settings with a validator, so updates validate it completely"""
+
+    section1: AnExample1SettingsSection = AnExample1SettingsSection()
+    section3: AnExample3SettingsSection = AnExample3SettingsSection()
+
+    @model_validator(mode="after")
+    def check_positive(self) -> "AnExample4Settings":
+        if self.section3.positive > 100:
+            raise ValueError("positive should be at most 100")
+        return self
+
+
 @dataclass(frozen=True)
 class Config(ConfigBase):
     """Config class def"""
 
 
+@dataclass(frozen=True)
+class AnExample2Config(ConfigBase):
+    """Config class with a field that can be included"""
+
+    field1: int = 1
+    field2: str = "field2"
+
+
+@dataclass(frozen=True)
+class AnExample3Config(ConfigBase):
+    """Config class that includes the same file as AnExample2Config"""
+
+    field2: str = "field2"
+
+
 def test_kind_string() -> None:
     assert AnExample1SettingsSection.kind_string() == "Settings"
 
@@ -235,3 +294,266 @@ def test_update_create_file_failed(
     AnExample1Settings.set_filepath(some_path)
     AnExample1Settings.update({"section1": {"subsec": {"setting3": 5.55}}})
     assert f"Creation of file {str(some_path)} failed." in caplog.records[-1].msg
+
+
+@pytest.mark.parametrize("extension", ["json.gz", "json.zst", "json.lz4", "toml.gz"])
+def test_update_compressed(tmp_path: Path, extension: str) -> None:
+    if extension.endswith("zst"):
+        pytest.importorskip("zstandard")
+    if extension.endswith("lz4"):
+        pytest.importorskip("lz4")
+    tmp_filepath = tmp_path / f"settings.{extension}"
+    AnExample1Settings.set_filepath(tmp_filepath)
+    AnExample1Settings.update({"section1": {"setting1": "compressed", "setting2": 7}})
+
+    magic = {"gz": b"\x1f\x8b", "zst": b"\x28\xb5\x2f\xfd", "lz4": b"\x04\x22\x4d\x18"}
+    assert tmp_filepath.read_bytes().startswith(magic[extension.split(".")[-1]])
+    AnExample1Settings.load()
+    assert AnExample1Settings.get().section1.setting1 == "compressed"
+    assert AnExample1Settings.get().section1.setting2 == 7
+
+
+def test_load_compression_from_magic_bytes(tmp_path: Path) -> None:
+    tmp_filepath = tmp_path / "settings.json"
+    tmp_filepath.write_bytes(
+        gzip.compress(json.dumps({"section1": {"setting2": 42}}).encode("utf-8"))
+    )
+    AnExample1Settings.set_filepath(tmp_filepath, load=True)
+    assert AnExample1Settings.get().section1.setting2 == 42
+
+
+def _counting(name: str, func: Any, counts: Counter[str]) -> Any:
+    def counting(*args: Any, **kwargs: Any) -> Any:
+        counts[name] += 1
+        return func(*args, **kwargs)
+
+    return counting
+
+
+@pytest.fixture
+def syscalls(monkeypatch: pytest.MonkeyPatch) -> Counter[str]:
+    """Count calls of the os functions that access the file system"""
+    counts: Counter[str] = Counter()
+    for name in ("open", "stat", "lstat", "fstat", "mkdir"):
+        monkeypatch.setattr(os, name, _counting(name, getattr(os, name), counts))
+    return counts
+
+
+def test_syscalls_load_update(
+    tmp_path: Path, syscalls: Counter[str]  # pylint: disable=redefined-outer-name
+) -> None:
+    tmp_filepath = tmp_path / "settings.json"
+    tmp_filepath.write_text(json.dumps({"section1": {"setting2": 42}}))
+    AnExample1Settings.set_filepath(tmp_filepath)
+    syscalls.clear()
+    AnExample1Settings.load()
+    assert AnExample1Settings.get().section1.setting2 == 42
+    assert syscalls == {"open": 1, "fstat": 1}
+
+    syscalls.clear()
+    AnExample1Settings.update({"section1": {"setting2": 43}})
+    # the state of the file is checked, for skipping the write if nothing changed
+    assert syscalls == {"open": 1, "fstat": 2, "stat": 1}
+    syscalls.clear()
+    AnExample1Settings.update({"section1": {"setting2": 43}})
+    assert syscalls == {"stat": 1}
+    AnExample1Settings.load()
+    assert AnExample1Settings.get().section1.setting2 == 43
+
+
+def test_load_all(tmp_path: Path, syscalls: Counter[str]) -> None:
+    # pylint: disable=redefined-outer-name
+    (tmp_path / "common.json").write_text(json.dumps({"field2": "common"}))
+    config_filepath = tmp_path / "config.json"
+    config_filepath.write_text(
+        json.dumps({"field1": 11, "__include__": "./common.json"})
+    )
+    settings_filepath = tmp_path / "settings.json"
+    settings_filepath.write_text(json.dumps({"section1": {"setting2": 12}}))
+    AnExample2Config.set_filepath(config_filepath)
+    AnExample1Settings.set_filepath(settings_filepath)
+    syscalls.clear()
+    durations = load_all([AnExample2Config, AnExample1Settings], max_workers=2)
+    assert list(durations) == [AnExample2Config, AnExample1Settings]
+    assert all(seconds > 0.0 for seconds in durations.values())
+    assert AnExample2Config.get().field1 == 11
+    assert AnExample2Config.get().field2 == "common"
+    assert AnExample1Settings.get().section1.setting2 == 12
+    assert syscalls["open"] == 3
+
+
+def test_load_all_shares_parses(tmp_path: Path, syscalls: Counter[str]) -> None:
+    # pylint: disable=redefined-outer-name
+    (tmp_path / "common.json").write_text(json.dumps({"field2": "common"}))
+    (tmp_path / "config2.json").write_text(
+        json.dumps({"field1": 11, "__include__": "./common.json"})
+    )
+    (tmp_path / "config3.json").write_text(json.dumps({"__include__": "./common.json"}))
+    settings_filepath = tmp_path / "settings.json"
+    settings_filepath.write_text(json.dumps({"section1": {"setting2": 12}}))
+    AnExample2Config.set_filepath(tmp_path / "config2.json")
+    AnExample3Config.set_filepath(tmp_path / "config3.json")
+    AnExample1Settings.set_filepath(settings_filepath)
+    syscalls.clear()
+    load_all([AnExample2Config, AnExample3Config, AnExample1Settings], max_workers=3)
+    # the file that both configs include is read once, also when loaded concurrently
+    assert syscalls["open"] == 4
+    assert AnExample3Config.get().field2 == "common"
+
+    # load_all() registers the settings like load() does, so a no-op update is skipped
+    syscalls.clear()
+    AnExample1Settings.update({"section1": {"setting2": 12}})
+    assert syscalls == {"stat": 1}
+
+
+def test_load_all_raises(tmp_path: Path) -> None:
+    AnExample2Config.set_filepath(tmp_path / "config.json")
+    with pytest.raises(FileNotFoundError):
+        load_all([AnExample2Config], throw_if_file_not_found=True)
+
+
+def test_load_all_discovers_containers() -> None:
+    # pylint: disable-next=import-outside-toplevel
+    from application_settings.convenience import _all_container_classes
+
+    found = _all_container_classes()
+    assert AnExample1Settings in found
+    assert AnExample2Config in found
+    assert ConfigBase not in found
+    assert SettingsBase not in found
+
+
+def test_parameters_cmdline_load(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    (tmp_path / "config.toml").write_text("field1 = 21")
+    (tmp_path / "settings.json").write_text(json.dumps({"section1": {"setting2": 22}}))
+    monkeypatch.setattr(sys, "argv", ["bla", "-z", str(tmp_path)])
+    parameters_folderpath_from_cli(
+        AnExample2Config,
+        AnExample1Settings,
+        parser=ArgumentParser(),
+        short_option="-z",
+        load=True,
+    )
+    assert AnExample2Config.get().field1 == 21
+    assert AnExample1Settings.get().section1.setting2 == 22
+
+
+def _get_concurrently(
+    container: type[SettingsBase], nr_of_threads: int
+) -> list[Union[SettingsBase, Exception]]:
+    barrier = Barrier(nr_of_threads)
+
+    def get() -> Union[SettingsBase, Exception]:
+        barrier.wait()
+        try:
+            return container.get()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            return exc
+
+    with ThreadPoolExecutor(nr_of_threads) as executor:
+        futures = [executor.submit(get) for _ in range(nr_of_threads)]
+    return [future.result() for future in futures]
+
+
+def test_get_single_flight(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    syscalls: Counter[str],  # pylint: disable=redefined-outer-name
+) -> None:
+    def slow_open(*args: Any, **kwargs: Any) -> Any:
+        # give all threads the time to call get() while the file is being read
+        time.sleep(0.2)
+        return counting_open(*args, **kwargs)
+
+    counting_open = os.open
+    monkeypatch.setattr(os, "open", slow_open)
+    tmp_filepath = tmp_path / "settings.json"
+    tmp_filepath.write_text(json.dumps({"section1": {"setting2": "two"}}))
+    AnExample2Settings.set_filepath(tmp_filepath)
+    syscalls.clear()
+    results = _get_concurrently(AnExample2Settings, 16)
+    # the failure of the single load is propagated to all threads
+    assert syscalls["open"] == 1
+    assert all(isinstance(res, ValidationError) for res in results)
+
+    tmp_filepath.write_text(json.dumps({"section1": {"setting2": 16}}))
+    syscalls.clear()
+    results = _get_concurrently(AnExample2Settings, 16)
+    assert syscalls["open"] == 1
+    assert all(res is results[0] for res in results)
+    assert AnExample2Settings.get().section1.setting2 == 16
+
+
+def test_load_json_without_dict(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    def mock_json_load(*_: Any) -> Any:
+        raise AssertionError("json document should be validated without parsing")
+
+    tmp_filepath = tmp_path / "settings.json"
+    tmp_filepath.write_text(
+        json.dumps({"section1": {"setting1": "direct", "subsec": {"setting3": "4.4"}}})
+    )
+    AnExample1Settings.set_filepath(tmp_filepath)
+    monkeypatch.setattr(json, "load", mock_json_load)
+    AnExample1Settings.load()
+    assert AnExample1Settings.get().section1.setting1 == "direct"
+    assert AnExample1Settings.get().section1.subsec.setting3 == 4.4
+    assert AnExample1SettingsSubSection.get().setting3 == 4.4
+
+
+def test_load_json_invalid(tmp_path: Path) -> None:
+    tmp_filepath = tmp_path / "settings.json"
+    tmp_filepath.write_text('{"section1": ')
+    AnExample1Settings.set_filepath(tmp_filepath)
+    with pytest.raises(json.JSONDecodeError):
+        AnExample1Settings.load()
+    tmp_filepath.write_text(json.dumps({"section1": {"setting2": "two"}}))
+    with pytest.raises(ValidationError):
+        AnExample1Settings.load()
+
+
+def test_update_merges_with_validator(tmp_path: Path) -> None:
+    AnExample4Settings.set_filepath(tmp_path / "settings.json", load=True)
+    AnExample4Settings.update(
+        {"section1": {"setting1": "s1", "subsec": {"setting3": 4.4}}}
+    )
+    # a partial nested update keeps the values that are not mentioned
+    AnExample4Settings.update({"section1": {"setting2": 22}})
+    assert AnExample4Settings.get().section1.setting1 == "s1"
+    assert AnExample4Settings.get().section1.setting2 == 22
+    assert AnExample4Settings.get().section1.subsec.setting3 == 4.4
+    with AnExample4Settings.override({"section1": {"subsec": {"setting3": 5.5}}}):
+        assert AnExample4Settings.get().section1.setting1 == "s1"
+        assert AnExample4Settings.get().section1.subsec.setting3 == 5.5
+    with pytest.raises(ValidationError):
+        AnExample4Settings.update({"section3": {"positive": 101}})
+
+
+def test_update_changed_fields_only(tmp_path: Path) -> None:
+    AnExample3Settings.set_filepath(tmp_path / "settings.json", load=True)
+    section3 = AnExample3Settings.get().section3
+    AnExample3Settings.update({"section1": {"setting1": "s1", "setting2": "22"}})
+    # unchanged sections are taken over
+    assert AnExample3Settings.get().section3 is section3
+    assert AnExample3Settings.get().section1.setting2 == 22
+    subsec = AnExample3Settings.get().section1.subsec
+
+    # changes of a section are merged with its current values
+    AnExample3Settings.update({"section1": {"setting2": 23}})
+    assert AnExample3Settings.get().section1.setting1 == "s1"
+    assert AnExample3Settings.get().section1.setting2 == 23
+    assert AnExample3Settings.get().section1.subsec is subsec
+    assert AnExample1SettingsSection.get() is AnExample3Settings.get().section1
+
+    with pytest.raises(ValidationError):
+        AnExample3Settings.update({"section3": {"positive": 0}})
+    with pytest.raises(ValidationError):
+        AnExample3Settings.update({"section1": {"subsec": {"setting3": "no float"}}})
+    assert AnExample3Settings.get().section3 is section3
+
+    AnExample3Settings.load()
+    assert AnExample3Settings.get().section1.setting1 == "s1"
+    assert AnExample3Settings.get().section1.setting2 == 23
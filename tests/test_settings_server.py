@@ -0,0 +1,152 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+import json
+import os
+import socket
+import stat
+from collections.abc import Iterator
+from pathlib import Path
+from threading import Thread
+
+import pytest
+
+from application_settings import (
+    SettingsBase,
+    SettingsSectionBase,
+    SettingsServer,
+    dataclass,
+    get_many,
+    update_many,
+)
+from application_settings.type_notation_helper import PathOpt
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available"
+)
+
+
+@dataclass(frozen=True)
+class ServedSettingsSection(SettingsSectionBase):
+    """Settings section"""
+
+    counter: int = 0
+
+
+def _served_settings_classes(
+    socket_path: PathOpt,
+) -> tuple[type[SettingsBase], type[SettingsBase]]:
+    """Return two settings classes that use the server at socket_path"""
+
+    @dataclass(frozen=True)
+    class ServedSettings(SettingsBase):
+        """Settings"""
+
+        name: str = "name"
+        section1: ServedSettingsSection = ServedSettingsSection()
+
+        @classmethod
+        def settings_server(cls) -> PathOpt:
+            return socket_path
+
+    @dataclass(frozen=True)
+    class OtherServedSettings(SettingsBase):
+        """Other settings"""
+
+        value: float = 0.5
+
+        @classmethod
+        def settings_server(cls) -> PathOpt:
+            return socket_path
+
+    return ServedSettings, OtherServedSettings
+
+
+@pytest.fixture
+def served(tmp_path: Path) -> tuple[type[SettingsBase], type[SettingsBase]]:
+    # the server and the clients live in the same process, but use different classes
+    return _served_settings_classes(tmp_path / "settings.sock")
+
+
+@pytest.fixture
+def socket_path(
+    tmp_path: Path, served: tuple[type[SettingsBase], type[SettingsBase]]
+) -> Iterator[Path]:
+    the_socket_path = tmp_path / "settings.sock"
+    server = SettingsServer(the_socket_path, served)
+    for container in served:
+        container.set_filepath(tmp_path / f"{container.__name__}.json", load=True)
+    thread = Thread(target=server.serve_forever)
+    thread.start()
+    yield the_socket_path
+    server.shutdown()
+    thread.join()
+
+
+def test_get_update(socket_path: Path, tmp_path: Path) -> None:
+    settings, _ = _served_settings_classes(socket_path)
+    settings.set_filepath(tmp_path / "not_used.json")
+    assert settings.load().name == "name"
+    updated = settings.update({"section1": {"counter": "3"}})
+    assert updated.section1.counter == 3  # type: ignore[attr-defined]
+    assert json.loads((tmp_path / "ServedSettings.json").read_text()) == {
+        "name": "name",
+        "section1": {"counter": 3},
+    }
+    assert not (tmp_path / "not_used.json").exists()
+
+    # another client gets the update from the server
+    other_client, _ = _served_settings_classes(socket_path)
+    assert other_client.load().section1.counter == 3  # type: ignore[attr-defined]
+
+
+def test_get_update_many(socket_path: Path) -> None:
+    settings, other_settings = _served_settings_classes(socket_path)
+    update_many({settings: {"name": "new"}, other_settings: {"value": 1.5}})
+    assert settings.get().name == "new"  # type: ignore[attr-defined]
+
+    settings, other_settings = _served_settings_classes(socket_path)
+    fetched = get_many([settings, other_settings])
+    assert fetched[0].name == "new"  # type: ignore[attr-defined]
+    assert fetched[1].value == 1.5  # type: ignore[attr-defined]
+    assert other_settings.get() is fetched[1]
+
+
+def test_server_error(socket_path: Path) -> None:
+    settings, _ = _served_settings_classes(socket_path)
+
+    @dataclass(frozen=True)
+    class UnknownSettings(SettingsBase):
+        """Settings that are not served"""
+
+        @classmethod
+        def settings_server(cls) -> PathOpt:
+            return socket_path
+
+    with pytest.raises(RuntimeError, match="UnknownSettings"):
+        UnknownSettings.load()
+    # the connection can still be used
+    assert settings.load().name == "name"  # type: ignore[attr-defined]
+
+
+def test_socket_of_owner_only(socket_path: Path) -> None:
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+
+def test_rejected_update(
+    socket_path: Path,
+    tmp_path: Path,
+    served: tuple[type[SettingsBase], type[SettingsBase]],
+) -> None:
+    settings, _ = _served_settings_classes(socket_path)
+    settings.update({"section1": {"counter": 1}})
+    # the server cannot save the next update
+    (blocked_path := tmp_path / "blocked.json").mkdir()
+    served[0].set_filepath(blocked_path)
+    with pytest.raises(RuntimeError):
+        settings.update({"section1": {"counter": 2}})
+    # the update has not been applied here, as it has not been applied by the server
+    assert settings.get().section1.counter == 1  # type: ignore[attr-defined]
+    with pytest.raises(RuntimeError):
+        update_many({settings: {"name": "rejected"}})
+    assert settings.get().name == "name"  # type: ignore[attr-defined]
@@ -0,0 +1,97 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import json
+from pathlib import Path
+
+from application_settings import (
+    OperationReport,
+    SettingsBase,
+    SettingsSectionBase,
+    StorageMode,
+    add_observer,
+    dataclass,
+    remove_observer,
+)
+
+
+@dataclass(frozen=True)
+class ShardedSettingsSection1(SettingsSectionBase):
+    """Settings section"""
+
+    counter: int = 0
+    name: str = "name"
+
+
+@dataclass(frozen=True)
+class ShardedSettingsSection2(SettingsSectionBase):
+    """Settings section"""
+
+    flag: bool = False
+
+
+@dataclass(frozen=True)
+class ShardedSettings(SettingsBase):
+    """Settings that are stored with a shard per section"""
+
+    field0: float = 0.5
+    section1: ShardedSettingsSection1 = ShardedSettingsSection1()
+    section2: ShardedSettingsSection2 = ShardedSettingsSection2()
+
+    @classmethod
+    def storage_mode(cls) -> StorageMode:
+        return StorageMode.SHARDED
+
+
+def _shard(tmp_path: Path, name: str) -> Path:
+    return tmp_path / "settings.json.shards" / f"{name}.json"
+
+
+def test_update_writes_changed_shards(tmp_path: Path) -> None:
+    settings_path = tmp_path / "settings.json"
+    ShardedSettings.set_filepath(settings_path, load=True)
+    ShardedSettings.update({"section1": {"counter": "1"}})
+
+    assert json.loads(settings_path.read_text()) == {"field0": 0.5}
+    assert json.loads(_shard(tmp_path, "section1").read_text()) == {
+        "counter": 1,
+        "name": "name",
+    }
+    assert not _shard(tmp_path, "section2").exists()
+
+    main_mtime = settings_path.stat().st_mtime_ns
+    ShardedSettings.update({"section2": {"flag": True}})
+    assert settings_path.stat().st_mtime_ns == main_mtime
+    assert json.loads(_shard(tmp_path, "section2").read_text()) == {"flag": True}
+
+    ShardedSettings.update({"field0": 1.5})
+    assert json.loads(settings_path.read_text()) == {"field0": 1.5}
+
+    ShardedSettings.load()
+    assert ShardedSettings.get().field0 == 1.5
+    assert ShardedSettings.get().section1.counter == 1
+    assert ShardedSettings.get().section2.flag
+
+
+def test_unchanged_update_is_skipped(tmp_path: Path) -> None:
+    ShardedSettings.set_filepath(tmp_path / "settings.json", load=True)
+    ShardedSettings.update({"section1": {"counter": 2}})
+    reports: list[OperationReport] = []
+    add_observer(reports.append)
+    try:
+        ShardedSettings.update({"section1": {"counter": "2"}})
+    finally:
+        remove_observer(reports.append)
+    assert reports[-1].files_written == 0
+    assert reports[-1].writes_skipped == 1
+
+
+def test_load_merges_shards(tmp_path: Path) -> None:
+    settings_path = tmp_path / "settings.json"
+    settings_path.write_text(json.dumps({"field0": 2.5}))
+    _shard(tmp_path, "section1").parent.mkdir()
+    _shard(tmp_path, "section1").write_text(json.dumps({"name": "sharded"}))
+    ShardedSettings.set_filepath(settings_path, load=True)
+    assert ShardedSettings.get().field0 == 2.5
+    assert ShardedSettings.get().section1.name == "sharded"
+    assert ShardedSettings.get().section1.counter == 0
+    assert not ShardedSettings.get().section2.flag
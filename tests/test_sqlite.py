@@ -0,0 +1,146 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Union
+
+import pytest
+from pydantic import Field
+
+from application_settings import SettingsBase, SettingsSectionBase, dataclass
+
+
+@dataclass(frozen=True)
+class SqliteSettingsSubSection(SettingsSectionBase):
+    """Settings subsection"""
+
+    ratio: float = 0.5
+    tags: tuple[str, ...] = ("a", "b")
+
+
+@dataclass(frozen=True)
+class SqliteSettingsSection(SettingsSectionBase):
+    """Settings section"""
+
+    counter: int = 0
+    subsec: SqliteSettingsSubSection = SqliteSettingsSubSection()
+
+
+@dataclass(frozen=True)
+class SqliteSettings(SettingsBase):
+    """Settings stored in an sqlite database"""
+
+    name: str = "name"
+    section1: SqliteSettingsSection = SqliteSettingsSection()
+
+
+@dataclass(frozen=True)
+class SqliteMappingSettings(SettingsBase):
+    """Settings with parameters that hold a dict"""
+
+    mapping: dict[str, int] = Field(default_factory=dict)
+    option: Union[dict[str, int], int] = (
+        0  # pylint: disable=consider-alternative-union-syntax
+    )
+    section1: SqliteSettingsSection = SqliteSettingsSection()
+
+
+def _rows(path: Path) -> dict[str, str]:
+    with closing(sqlite3.connect(path)) as connection:
+        return dict(connection.execute("SELECT key, value FROM parameters"))
+
+
+def test_update_load(tmp_path: Path) -> None:
+    db_path = tmp_path / "settings.sqlite"
+    SqliteSettings.set_filepath(db_path, load=True)
+    SqliteSettings.update({"section1": {"counter": "3", "subsec": {"tags": ["c"]}}})
+    # a row per changed leaf, holding the validated value
+    assert _rows(db_path) == {
+        "section1.counter": "3",
+        "section1.subsec.tags": json.dumps(["c"]),
+    }
+    with closing(sqlite3.connect(db_path)) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    SqliteSettings.load()
+    assert SqliteSettings.get().section1.counter == 3
+    assert SqliteSettings.get().section1.subsec.tags == ("c",)
+    assert SqliteSettings.get().section1.subsec.ratio == 0.5
+
+
+def test_update_other_process(tmp_path: Path) -> None:
+    db_path = tmp_path / "settings.sqlite"
+    SqliteSettings.set_filepath(db_path, load=True)
+    SqliteSettings.update({"name": "first"})
+    # another process changes a parameter after this process loaded the settings
+    with closing(sqlite3.connect(db_path)) as connection, connection:
+        connection.execute(
+            "UPDATE parameters SET value = ? WHERE key = ?", ('"other"', "name")
+        )
+    SqliteSettings.update({"section1": {"subsec": {"ratio": 0.75}}})
+    SqliteSettings.load()
+    assert SqliteSettings.get().name == "other"
+    assert SqliteSettings.get().section1.subsec.ratio == 0.75
+
+
+def test_load_missing(tmp_path: Path) -> None:
+    db_path = tmp_path / "settings.sqlite"
+    SqliteSettings.set_filepath(db_path, load=True)
+    assert SqliteSettings.get().name == "name"
+    with pytest.raises(FileNotFoundError):
+        SqliteSettings.load(throw_if_file_not_found=True)
+    db_path.touch()
+    SqliteSettings.load(throw_if_file_not_found=True)
+    assert SqliteSettings.get().name == "name"
+
+
+def test_compressed_rejected(tmp_path: Path) -> None:
+    db_path = tmp_path / "settings.sqlite.gz"
+    with pytest.raises(ValueError, match="compression is not supported for sqlite"):
+        SqliteSettings.set_filepath(db_path, load=True)
+    with pytest.raises(ValueError, match="compression is not supported for sqlite"):
+        SqliteSettings.update({"name": "compressed"})
+    assert not db_path.exists()
+
+
+def test_dict_parameter_removed_key(tmp_path: Path) -> None:
+    db_path = tmp_path / "settings.sqlite"
+    SqliteMappingSettings.set_filepath(db_path, load=True)
+    SqliteMappingSettings.update({"mapping": {"a": 1, "b.c": 2}})
+    # a dict parameter is a single row, so keys with a dot are kept as they are
+    assert _rows(db_path) == {"mapping": json.dumps({"a": 1, "b.c": 2})}
+    SqliteMappingSettings.update({"mapping": {"a": 1}})
+    SqliteMappingSettings.load()
+    assert SqliteMappingSettings.get().mapping == {"a": 1}
+
+
+def test_dict_parameter_to_scalar(tmp_path: Path) -> None:
+    db_path = tmp_path / "settings.sqlite"
+    SqliteMappingSettings.set_filepath(db_path, load=True)
+    SqliteMappingSettings.update({"option": {"a": 1}, "section1": {"counter": 2}})
+    SqliteMappingSettings.update({"option": 3})
+    SqliteMappingSettings.load()
+    assert SqliteMappingSettings.get().option == 3
+    SqliteMappingSettings.update({"option": {"b": 4}})
+    SqliteMappingSettings.load()
+    assert SqliteMappingSettings.get().option == {"b": 4}
+    assert SqliteMappingSettings.get().section1.counter == 2
+
+
+def test_rows_of_parts_are_replaced(tmp_path: Path) -> None:
+    db_path = tmp_path / "settings.sqlite"
+    SqliteMappingSettings.set_filepath(db_path, load=True)
+    SqliteMappingSettings.update({"section1": {"counter": 1}})
+    # a dict parameter stored in parts, as earlier versions did
+    with closing(sqlite3.connect(db_path)) as connection, connection:
+        connection.executemany(
+            "INSERT INTO parameters (key, value) VALUES (?, ?)",
+            [("mapping.a", "1"), ("mapping.b", "2")],
+        )
+    SqliteMappingSettings.update({"mapping": {"a": 5}})
+    assert _rows(db_path) == {
+        "mapping": json.dumps({"a": 5}),
+        "section1.counter": "1",
+    }